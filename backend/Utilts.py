@@ -1,12 +1,84 @@
+import threading
+import time
+from collections import Counter
 from datetime import datetime, timedelta
-from models import db, PlatformStats, Item, User
+from models import db, PlatformStats, Item, ArchivedItem, User, StatsRollup, ROLLUP_PERIODS
+from facets import top_facets, invalidate_facets
+
+# Время жизни снимка статистики для главной страницы (секунды)
+STATS_CACHE_TTL = 30
+
+_stats_cache = {'snapshot': None, 'expires_at': 0.0}
+_stats_cache_lock = threading.Lock()
 
 def update_platform_stats():
     """Обновляет статистику платформы"""
     stats = PlatformStats.get_current_stats()
     stats.update_stats(db.session, Item, User)
+    invalidate_stats_cache()
+    invalidate_facets()
     return stats
 
+def item_stats_delta(item, sign=1):
+    """Изменения счетчиков PlatformStats при появлении (sign=1) или удалении (sign=-1) объявления"""
+    return {
+        'total_items': sign,
+        'active_items': sign if (item.status or 'active') == 'active' else 0,
+        'lost_items': sign if item.item_type == 'lost' else 0,
+        'found_items_reported': sign if item.item_type == 'found' else 0
+    }
+
+def get_cached_stats():
+    """Снимок статистики для главной страницы.
+
+    Читается из БД не чаще раза в STATS_CACHE_TTL секунд и никогда не пишет в БД.
+    """
+    now = time.monotonic()
+    snapshot = _stats_cache['snapshot']
+    if snapshot is not None and now < _stats_cache['expires_at']:
+        return snapshot
+    
+    with _stats_cache_lock:
+        # Другой поток мог уже обновить кэш, пока мы ждали блокировку
+        if _stats_cache['snapshot'] is not None and now < _stats_cache['expires_at']:
+            return _stats_cache['snapshot']
+        snapshot = _load_stats_snapshot()
+        _stats_cache['snapshot'] = snapshot
+        _stats_cache['expires_at'] = time.monotonic() + STATS_CACHE_TTL
+    return snapshot
+
+def invalidate_stats_cache():
+    """Сбрасывает снимок статистики в текущем процессе (после изменения данных)"""
+    _stats_cache['expires_at'] = 0.0
+
+def _load_stats_snapshot():
+    stats = PlatformStats.query.first()
+    
+    return {
+        'total_users': stats.total_users if stats else 0,
+        'active_items': stats.active_items if stats else 0,
+        'found_items': stats.found_items if stats else 0,
+        'total_items': stats.total_items if stats else 0,
+        'lost_items': stats.lost_items if stats else 0,
+        'found_items_reported': stats.found_items_reported if stats else 0,
+        'last_updated': (stats.last_updated if stats else None) or datetime.utcnow()
+    }
+
+def start_stats_reconciler(app, interval):
+    """Фоновая периодическая сверка счетчиков с данными (страховка от расхождений)"""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                with app.app_context():
+                    update_platform_stats()
+            except Exception as e:
+                print(f"Ошибка сверки статистики: {e}")
+    
+    thread = threading.Thread(target=run, name='stats-reconciler', daemon=True)
+    thread.start()
+    return thread
+
 def get_platform_stats():
     """Получает текущую статистику платформы"""
     return PlatformStats.get_current_stats()
@@ -42,58 +114,98 @@ def get_basic_stats():
         'time_ago': time_ago
     }
 
-def increment_found_counter():
-    """Увеличивает счетчик найденных вещей"""
-    stats = PlatformStats.get_current_stats()
-    stats.increment_found_items(db.session)
-    return stats.found_items
-
 def get_daily_stats():
-    """Получает статистику за последние 7 дней"""
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    """Статистика за последние 7 дней (сегодня и 6 предыдущих суток, из stats_rollups)"""
+    return {
+        'new_users_7days': sum(count for _, count in get_trend('new_users', 7)),
+        'new_items_7days': sum(count for _, count in get_trend('new_items', 7)),
+        'found_items_7days': sum(count for _, count in get_trend('found_items', 7))
+    }
+
+# ===== ВРЕМЕННЫЕ РЯДЫ (stats_rollups) =====
+#
+# Счетчики событий по часам и суткам пишутся через буфер counters.py
+# (count_events → StatsRollup.add_counts): регистрация — new_users, объявление —
+# new_items, отметка "найдено" — found_items (с измерениями item_type,
+# category, city). Запрос тренда за N дней читает N строк, а не все
+# объявления за период. Время — UTC.
+
+ROLLUP_DIMENSIONS = ('item_type', 'category', 'city')
+
+def _period_start(when, period):
+    if period == 'hour':
+        return when.replace(minute=0, second=0, microsecond=0)
+    return when.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def get_trend(metric, days=30, period='day', dimension='', value=''):
+    """Ряд [(начало периода, количество)] за последние days дней, пропуски — нули.
+
+    period — 'day' или 'hour'; dimension/value — срез (например category, 'Ключи').
+    """
+    fmt = ROLLUP_PERIODS[period]
+    step = timedelta(hours=1) if period == 'hour' else timedelta(days=1)
+    steps = days * 24 if period == 'hour' else days
+    start = _period_start(datetime.utcnow(), period) - step * (steps - 1)
+    
+    counts = dict(db.session.query(StatsRollup.bucket, StatsRollup.count)
+                            .filter(StatsRollup.metric == metric,
+                                    StatsRollup.dimension == dimension,
+                                    StatsRollup.value == value,
+                                    StatsRollup.period == period,
+                                    StatsRollup.bucket >= start.strftime(fmt)))
+    buckets = [start + step * i for i in range(steps)]
+    return [(bucket, counts.get(bucket.strftime(fmt), 0)) for bucket in buckets]
+
+def get_breakdown(metric, dimension, days=30, limit=None):
+    """[(значение измерения, количество)] за последние days дней, по убыванию"""
+    start = _period_start(datetime.utcnow(), 'day') - timedelta(days=days - 1)
+    total = db.func.sum(StatsRollup.count)
+    query = db.session.query(StatsRollup.value, total)\
+                      .filter(StatsRollup.metric == metric,
+                              StatsRollup.dimension == dimension,
+                              StatsRollup.period == 'day',
+                              StatsRollup.bucket >= start.strftime(ROLLUP_PERIODS['day']))\
+                      .group_by(StatsRollup.value)\
+                      .order_by(total.desc())
+    if limit:
+        query = query.limit(limit)
+    return [(value, count) for value, count in query]
+
+def rebuild_rollups():
+    """Полный пересчет stats_rollups по users, items и items_archive"""
+    counts = Counter()
     
-    # Новые пользователи за 7 дней
-    new_users = User.query.filter(User.created_at >= seven_days_ago).count()
+    def collect(metric, model, time_column, *conditions):
+        for period, fmt in ROLLUP_PERIODS.items():
+            bucket = db.func.strftime(fmt, time_column)
+            for dimension in ('',) + (ROLLUP_DIMENSIONS if model is not User else ()):
+                column = getattr(model, dimension) if dimension else db.literal('')
+                rows = db.session.query(bucket, column, db.func.count())\
+                                 .filter(time_column.isnot(None), *conditions)\
+                                 .group_by(bucket, column)
+                for bucket_value, value, count in rows:
+                    counts[(metric, dimension, value or '', period, bucket_value)] += count
     
-    # Новые объявления за 7 дней
-    new_items = Item.query.filter(Item.created_at >= seven_days_ago).count()
+    collect('new_users', User, User.created_at)
+    for model in (Item, ArchivedItem):
+        collect('new_items', model, model.created_at)
+        collect('found_items', model, model.closed_at, model.status == 'returned')
     
-    # Найденные вещи за 7 дней
-    found_items = Item.query.filter(
-        Item.status == 'returned',
-        Item.created_at >= seven_days_ago
-    ).count()
+    rows = [{'metric': metric, 'dimension': dimension, 'value': value,
+             'period': period, 'bucket': bucket, 'count': count}
+            for (metric, dimension, value, period, bucket), count in counts.items()
+            if dimension == '' or value]
     
-    return {
-        'new_users_7days': new_users,
-        'new_items_7days': new_items,
-        'found_items_7days': found_items
-    }
+    db.session.query(StatsRollup).delete()
+    if rows:
+        db.session.execute(db.insert(StatsRollup), rows)
+    db.session.commit()
+    return len(rows)
 
 def get_category_stats():
-    """Статистика по категориям"""
-    from sqlalchemy import func
-    
-    categories = db.session.query(
-        Item.category, 
-        func.count(Item.id).label('count')
-    ).filter_by(status='active')\
-     .group_by(Item.category)\
-     .order_by(func.count(Item.id).desc())\
-     .all()
-    
-    return categories
+    """Статистика по категориям (из кэша фасетов)"""
+    return top_facets('category')
 
 def get_city_stats():
-    """Статистика по городам"""
-    from sqlalchemy import func
-    
-    cities = db.session.query(
-        Item.city, 
-        func.count(Item.id).label('count')
-    ).filter_by(status='active')\
-     .group_by(Item.city)\
-     .order_by(func.count(Item.id).desc())\
-     .all()
-    
-    return cities
\ No newline at end of file
+    """Статистика по городам (из кэша фасетов)"""
+    return top_facets('city')
@@ -0,0 +1,107 @@
+import json
+from flask import Blueprint, Response, abort, jsonify, request, stream_with_context, url_for
+from models import db, Item
+from pagination import paginate, get_page_size
+from search_index import filter_items
+from facets import top_facets
+from page_cache import cache_page
+from rate_limits import rate_limit
+from Utilts import get_cached_stats
+from matching import get_matches
+
+# JSON API (версия 1) для страницы поиска и внешних клиентов.
+#
+#   GET /api/v1/items              — страница объявлений (фильтры как у /search),
+#                                    курсор следующей страницы в next_cursor
+#   GET /api/v1/items.ndjson       — все найденные объявления потоком NDJSON
+#   GET /api/v1/items/<item_id>    — активное объявление целиком (закрытые — 404)
+#   GET /api/v1/items/<item_id>/matches — возможные пары "потеряно — найдено"
+#   GET /api/v1/stats              — статистика платформы
+#
+# Выгрузка NDJSON читает БД пачками по EXPORT_BATCH_SIZE строк (keyset)
+# и отдает их из генератора, поэтому память не зависит от размера выборки.
+
+bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+EXPORT_BATCH_SIZE = 500
+
+CARD_FIELDS = ('item_id', 'item_type', 'category', 'title', 'description',
+               'city', 'location', 'date', 'created_at', 'status')
+
+ITEM_FIELDS = CARD_FIELDS + ('contact_name', 'contact_phone', 'contact_email', 'closed_at')
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+def serialize_item(item, fields=CARD_FIELDS):
+    """Объявление (объект или строка выборки) → словарь для JSON"""
+    data = {field: _json_value(getattr(item, field)) for field in fields}
+    data['url'] = url_for('main.view_item', item_id=item.item_id)
+    return data
+
+def _search_args():
+    return {
+        'search_query': request.args.get('search_query', '').strip(),
+        'item_type': request.args.get('item_type', ''),
+        'category': request.args.get('category', ''),
+        'city': request.args.get('city', ''),
+    }
+
+@bp.errorhandler(404)
+def not_found(e):
+    return jsonify(error='not_found'), 404
+
+@bp.errorhandler(429)
+def too_many_requests(e):
+    return jsonify(error='too_many_requests', retry_after=e.retry_after), 429, {'Retry-After': str(e.retry_after)}
+
+@bp.route('/items')
+@rate_limit('search', methods=(), param='search_query')
+@cache_page
+def items():
+    query, order = filter_items(Item.cards_query().filter_by(status='active'), **_search_args())
+    rows, next_cursor = paginate(query, order, request.args.get('cursor'),
+                                 get_page_size(request.args.get('page_size')))
+    return jsonify(items=[serialize_item(row) for row in rows], next_cursor=next_cursor)
+
+@bp.route('/items.ndjson')
+@rate_limit('search', methods=(), param='search_query')
+def items_ndjson():
+    columns = [getattr(Item, field) for field in ITEM_FIELDS]
+    query, order = filter_items(db.session.query(*columns).filter(Item.status == 'active'),
+                                **_search_args())
+
+    def generate():
+        cursor = None
+        while True:
+            rows, cursor = paginate(query, order, cursor, EXPORT_BATCH_SIZE)
+            for row in rows:
+                yield json.dumps(serialize_item(row, ITEM_FIELDS), ensure_ascii=False) + '\n'
+            if cursor is None:
+                break
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@bp.route('/items/<string:item_id>')
+@cache_page
+def item(item_id):
+    row = Item.query.filter_by(item_id=item_id, status='active').first_or_404()
+    return jsonify(serialize_item(row, ITEM_FIELDS))
+
+@bp.route('/items/<string:item_id>/matches')
+@cache_page
+def item_matches(item_id):
+    item_pk = db.session.query(Item.id).filter_by(item_id=item_id, status='active').scalar()
+    if item_pk is None:
+        abort(404)
+    return jsonify(matches=[dict(serialize_item(row, ('item_id', 'item_type', 'title', 'city', 'date')),
+                                 score=round(row.score, 3))
+                            for row in get_matches(item_pk)])
+
+@bp.route('/stats')
+@cache_page
+def stats():
+    snapshot = {key: _json_value(value) for key, value in get_cached_stats().items()}
+    snapshot['top_categories'] = top_facets('category', 10)
+    snapshot['top_cities'] = top_facets('city', 10)
+    return jsonify(snapshot)
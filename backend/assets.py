@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from flask import Blueprint, abort, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Статические файлы (CSS/JS страниц).
+#
+# Исходники лежат в front/assets, сборка (flask build-assets или при запуске,
+# если исходники новее сборки) пишет в front/static минифицированные копии
+# с хэшем содержимого в имени (css/search.3f2a9c1b0e.css) и рядом сжатые
+# .gz и .br (если установлен пакет brotli). manifest.json сопоставляет
+# исходное имя с собранным; шаблоны получают адрес через asset_url().
+# Раз имя меняется вместе с содержимым, файлы отдаются с Cache-Control
+# immutable на год, а сжатый вариант выбирается по Accept-Encoding.
+
+FRONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'front')
+ASSETS_SOURCE = os.path.join(FRONT_DIR, 'assets')
+ASSETS_BUILD = os.path.join(FRONT_DIR, 'static')
+MANIFEST_NAME = 'manifest.json'
+
+ASSET_TYPES = ('.css', '.js')
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+# (кодировка из Accept-Encoding, расширение сжатого файла), лучшая первой
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+bp = Blueprint('assets', __name__)
+
+_assets = {'manifest': None, 'files': frozenset()}
+
+def minify_css(text):
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    text = re.sub(r':\s+', ':', text)
+    return text.replace(';}', '}').strip()
+
+def minify_js(text):
+    """Без отступов, пустых строк и строк-комментариев; переводы строк
+    сохраняются, поэтому автоматическая расстановка ";" не ломается"""
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+def _write(path, data):
+    # Через временный файл: процессы, читающие сборку, не увидят половину файла
+    tmp_path = f'{path}.tmp{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _sources(source_dir):
+    for root, _, files in os.walk(source_dir):
+        for filename in sorted(files):
+            if os.path.splitext(filename)[1] in ASSET_TYPES:
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, source_dir).replace(os.sep, '/'), path
+
+def build_assets(source_dir=ASSETS_SOURCE, build_dir=ASSETS_BUILD):
+    """Собирает статику и пишет manifest.json, возвращает манифест {имя: собранное имя}"""
+    manifest = {}
+    for name, path in _sources(source_dir):
+        stem, ext = os.path.splitext(name)
+        with open(path, encoding='utf-8') as f:
+            data = MINIFIERS[ext](f.read()).encode('utf-8')
+        built = f'{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}'
+        manifest[name] = built
+
+        target = os.path.join(build_dir, built)
+        if os.path.exists(target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _write(target, data)
+        _write(target + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write(target + '.br', brotli.compress(data))
+
+    os.makedirs(build_dir, exist_ok=True)
+    _write(os.path.join(build_dir, MANIFEST_NAME),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+def _is_stale(source_dir, build_dir):
+    manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return True
+    built_at = os.path.getmtime(manifest_path)
+    return any(os.path.getmtime(path) > built_at for _, path in _sources(source_dir))
+
+def load_manifest(build_dir=ASSETS_BUILD):
+    with open(os.path.join(build_dir, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    _assets['manifest'] = manifest
+    _assets['files'] = frozenset(manifest.values())
+    return manifest
+
+def init_assets(app):
+    """Пересобирает статику, если исходники изменились, и подключает asset_url к шаблонам"""
+    if _is_stale(ASSETS_SOURCE, ASSETS_BUILD):
+        manifest = build_assets()
+        print(f"📦 Собрано статических файлов: {len(manifest)}")
+    load_manifest()
+    app.add_template_global(asset_url)
+
+def asset_url(name):
+    """Адрес собранного файла по исходному имени ('css/search.css')"""
+    return url_for('assets.static_file', filename=_assets['manifest'][name])
+
+@bp.route('/static/<path:filename>')
+def static_file(filename):
+    if filename not in _assets['files']:
+        abort(404)
+
+    suffix = encoding = None
+    for name, extension in ENCODINGS:
+        if name in request.accept_encodings and os.path.exists(os.path.join(ASSETS_BUILD, filename + extension)):
+            encoding, suffix = name, extension
+            break
+
+    response = send_from_directory(ASSETS_BUILD, filename + (suffix or ''),
+                                   mimetype=mimetypes.guess_type(filename)[0],
+                                   max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
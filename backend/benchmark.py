@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный бенчмарк маршрутов.
+
+    python benchmark.py seed --size 100k --db /tmp/bench.db
+    python benchmark.py run --db /tmp/bench.db                       # Flask test client
+    python benchmark.py run --db /tmp/bench.db --server --workers 4  # настоящий сервер (serve.py)
+    python benchmark.py run --db /tmp/bench.db --save-baseline baseline.json
+    python benchmark.py run --db /tmp/bench.db --compare baseline.json
+
+Для каждого сценария выводятся p50/p99 задержки и запросы в секунду.
+С --compare результат сравнивается с сохраненным базовым: если p99 вырос
+или пропускная способность упала больше чем на --tolerance, сценарий
+помечается как регрессия и скрипт завершается с кодом 1.
+"""
+
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.cookiejar import CookieJar
+
+import click
+
+BENCH_PASSWORD = 'bench-password'
+
+CATEGORIES = ['Документы', 'Ключи', 'Телефоны', 'Кошельки', 'Сумки', 'Электроника',
+              'Украшения', 'Одежда', 'Животные', 'Другое']
+CITIES = ['Москва', 'Санкт-Петербург', 'Казань', 'Новосибирск', 'Екатеринбург',
+          'Нижний Новгород', 'Самара', 'Омск', 'Ростов-на-Дону', 'Уфа']
+WORDS = ['черный', 'кожаный', 'телефон', 'ключи', 'паспорт', 'кошелек', 'сумка', 'рюкзак',
+         'часы', 'очки', 'зонт', 'перчатки', 'карта', 'наушники', 'планшет', 'кольцо']
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+SEED_BATCH = 10_000
+
+def _database_url(db_path):
+    return 'sqlite:///' + os.path.abspath(db_path)
+
+def _create_app(db_path):
+    # Настройки БД читаются из окружения при создании приложения
+    os.environ['DATABASE_URL'] = _database_url(db_path)
+    from main import create_app
+    app = create_app()
+    # Все запросы теста идут с одного адреса — без ограничения частоты
+    app.config['RATE_LIMITS'] = ''
+    return app
+
+# ===== ЗАПОЛНЕНИЕ БД =====
+
+def seed_database(db_path, items_count, rng):
+    from main import init_db, hash_password
+    from models import db, User, Item
+    from ids import next_ids
+    from cities import resolve_city
+    from Utilts import update_platform_stats, rebuild_rollups
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    app = _create_app(db_path)
+    init_db(app)
+
+    users_count = max(100, items_count // 10)
+    now = datetime.utcnow()
+    started_at = time.perf_counter()
+
+    with app.app_context():
+        password_hash = hash_password(BENCH_PASSWORD)
+        for offset in range(0, users_count, SEED_BATCH):
+            count = min(SEED_BATCH, users_count - offset)
+            db.session.execute(db.insert(User), [{
+                'uid': uid,
+                'username': f'bench_user_{offset + i}',
+                'full_name': f'Тестовый Пользователь {offset + i}',
+                'password_hash': password_hash,
+                'created_at': now - timedelta(minutes=rng.randrange(525_600))
+            } for i, uid in enumerate(next_ids('user', count))])
+            db.session.commit()
+
+        user_ids = [user_id for (user_id,) in db.session.query(User.id)]
+        city_ids = {name: resolve_city(name)[0] for name in CITIES}
+        for offset in range(0, items_count, SEED_BATCH):
+            count = min(SEED_BATCH, items_count - offset)
+            rows = []
+            for item_id in next_ids('item', count):
+                created_at = now - timedelta(minutes=rng.randrange(525_600))
+                words = rng.sample(WORDS, 3)
+                city = rng.choice(CITIES)
+                rows.append({
+                    'item_id': item_id,
+                    'user_id': rng.choice(user_ids),
+                    'item_type': rng.choice(('lost', 'found')),
+                    'category': rng.choice(CATEGORIES),
+                    'title': ' '.join(words[:2]).capitalize(),
+                    'description': ' '.join(rng.choices(WORDS, k=20)),
+                    'city': city,
+                    'city_id': city_ids[city],
+                    'location': f'ул. {rng.choice(WORDS).capitalize()}, {rng.randrange(1, 200)}',
+                    'date': created_at.date(),
+                    'contact_name': 'Тестовый контакт',
+                    'contact_phone': f'+7900{rng.randrange(10**7):07d}',
+                    'created_at': created_at,
+                    'status': 'active'
+                })
+            db.session.execute(db.insert(Item), rows)
+            db.session.commit()
+            print(f"   ... {offset + count} объявлений", file=sys.stderr)
+
+        update_platform_stats()
+        rebuild_rollups()
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+
+    return users_count, time.perf_counter() - started_at
+
+# ===== КЛИЕНТЫ =====
+
+class TestClientDriver:
+    """Запросы через Flask test client в текущем процессе"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None):
+        return self.client.open(path, method=method, data=data).status_code
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+class HttpDriver:
+    """Запросы к запущенному серверу по HTTP (cookie — свои у каждого клиента)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar()), _NoRedirect)
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+# ===== СЦЕНАРИИ =====
+
+def build_scenarios(sample_item_ids, rng):
+    """Список (название, нужен ли вход, функция запроса)"""
+    def random_item():
+        return f'/item/{rng.choice(sample_item_ids)}'
+
+    def search_form(**filters):
+        form = {'search_query': '', 'item_type': 'all', 'category': 'all', 'city': 'all'}
+        form.update(filters)
+        return form
+
+    return [
+        ('index', False, lambda d: d.request('GET', '/')),
+        ('search GET', False, lambda d: d.request('GET', '/search')),
+        ('search POST text', False,
+         lambda d: d.request('POST', '/search', search_form(search_query=rng.choice(WORDS)))),
+        ('search POST category', False,
+         lambda d: d.request('POST', '/search', search_form(category=rng.choice(CATEGORIES)))),
+        ('search POST city+type', False,
+         lambda d: d.request('POST', '/search', search_form(city=rng.choice(CITIES),
+                                                            item_type=rng.choice(('lost', 'found'))))),
+        ('search POST all filters', False,
+         lambda d: d.request('POST', '/search', search_form(search_query=rng.choice(WORDS),
+                                                            category=rng.choice(CATEGORIES),
+                                                            city=rng.choice(CITIES)))),
+        ('view_item', False, lambda d: d.request('GET', random_item())),
+        ('api items', False,
+         lambda d: d.request('GET', '/api/v1/items?' + urllib.parse.urlencode({'city': rng.choice(CITIES)}))),
+        ('login', False, lambda d: d.request('POST', '/login', {
+            'username': f'bench_user_{rng.randrange(100)}', 'password': BENCH_PASSWORD})),
+        ('profile', True, lambda d: d.request('GET', '/profile')),
+        ('create', True, lambda d: d.request('POST', '/create', {
+            'item_type': rng.choice(('lost', 'found')), 'category': rng.choice(CATEGORIES),
+            'title': ' '.join(rng.sample(WORDS, 2)), 'description': ' '.join(rng.choices(WORDS, k=10)),
+            'city': rng.choice(CITIES), 'date': datetime.utcnow().strftime('%Y-%m-%d')})),
+    ]
+
+def login(driver):
+    status = driver.request('POST', '/login', {'username': 'bench_user_0', 'password': BENCH_PASSWORD})
+    if status != 302:
+        raise RuntimeError(f'Не удалось войти как bench_user_0 (код {status})')
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def run_scenario(make_driver, needs_login, action, requests_count, concurrency, warmup):
+    """Гоняет сценарий из concurrency клиентов, возвращает метрики"""
+    per_client = max(1, requests_count // concurrency)
+
+    def client_loop(_):
+        driver = make_driver()
+        if needs_login:
+            login(driver)
+        for _ in range(warmup):
+            action(driver)
+        latencies, errors = [], 0
+        for _ in range(per_client):
+            started_at = time.perf_counter()
+            status = action(driver)
+            latencies.append(time.perf_counter() - started_at)
+            errors += status >= 400
+        return latencies, errors
+
+    started_at = time.perf_counter()
+    if concurrency == 1:
+        results = [client_loop(0)]
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(client_loop, range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies = sorted(l for result in results for l in result[0])
+    return {
+        'requests': len(latencies),
+        'errors': sum(result[1] for result in results),
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'rps': len(latencies) / elapsed if elapsed else 0.0
+    }
+
+# ===== СЕРВЕР =====
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(db_path, workers, threads):
+    port = _free_port()
+    # Все запросы теста идут с одного адреса — без ограничения частоты (как в _create_app)
+    env = dict(os.environ, DATABASE_URL=_database_url(db_path), HOST='127.0.0.1', PORT=str(port),
+               WEB_WORKERS=str(workers), WEB_THREADS=str(threads), RATE_LIMITS='')
+    process = subprocess.Popen([sys.executable, 'serve.py'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return process, f'http://127.0.0.1:{port}'
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('Сервер не запустился за 30 секунд')
+
+# ===== CLI =====
+
+@click.group()
+def cli():
+    pass
+
+@cli.command()
+@click.option('--size', type=click.Choice(list(SIZES)), default='10k', help='Количество объявлений')
+@click.option('--db', 'db_path', required=True, help='Файл БД для бенчмарка (будет перезаписан)')
+@click.option('--seed', default=42, help='Зерно генератора для воспроизводимости')
+def seed(size, db_path, seed):
+    """Создает БД и заполняет ее синтетическими пользователями и объявлениями"""
+    users_count, elapsed = seed_database(db_path, SIZES[size], random.Random(seed))
+    print(f"✅ {db_path}: {users_count} пользователей, {SIZES[size]} объявлений за {elapsed:.1f} с")
+
+@cli.command()
+@click.option('--db', 'db_path', required=True, help='Файл БД, заполненный командой seed')
+@click.option('--server', is_flag=True, help='Через настоящий сервер (serve.py), а не test client')
+@click.option('--workers', default=os.cpu_count() or 1, help='Процессов сервера (с --server)')
+@click.option('--threads', default=8, help='Потоков в процессе сервера (с --server)')
+@click.option('--concurrency', default=None, type=int, help='Параллельных клиентов')
+@click.option('--requests', 'requests_count', default=200, help='Запросов на сценарий')
+@click.option('--warmup', default=5, help='Разогревочных запросов на клиента')
+@click.option('--only', multiple=True, help='Запустить только указанные сценарии')
+@click.option('--save-baseline', type=click.Path(), help='Сохранить результат как базовый')
+@click.option('--compare', type=click.Path(exists=True), help='Сравнить с базовым результатом')
+@click.option('--tolerance', default=0.2, help='Допустимое ухудшение (доля)')
+@click.option('--seed', default=42, help='Зерно генератора для воспроизводимости')
+def run(db_path, server, workers, threads, concurrency, requests_count, warmup, only,
+        save_baseline, compare, tolerance, seed):
+    """Прогоняет сценарии и печатает p50/p99 и запросы в секунду"""
+    import sqlite3
+    rng = random.Random(seed)
+    with sqlite3.connect(db_path) as connection:
+        sample_item_ids = [row[0] for row in connection.execute(
+            "SELECT item_id FROM items WHERE status = 'active' ORDER BY random() LIMIT 1000")]
+    if not sample_item_ids:
+        raise click.ClickException('В БД нет объявлений — сначала выполните seed')
+
+    process = None
+    if server:
+        process, base_url = start_server(db_path, workers, threads)
+        make_driver = lambda: HttpDriver(base_url)
+        concurrency = concurrency or workers * threads
+        mode = f'server: {workers} процессов × {threads} потоков, {concurrency} клиентов'
+    else:
+        app = _create_app(db_path)
+        make_driver = lambda: TestClientDriver(app)
+        concurrency = concurrency or 1
+        mode = f'test client, {concurrency} клиентов'
+
+    print(f"Режим: {mode}\n")
+    print(f"{'сценарий':<26}{'запросов':>9}{'ошибок':>8}{'p50, мс':>10}{'p99, мс':>10}{'запр/с':>10}")
+    results = {}
+    try:
+        for name, needs_login, action in build_scenarios(sample_item_ids, rng):
+            if only and name not in only:
+                continue
+            result = run_scenario(make_driver, needs_login, action, requests_count, concurrency, warmup)
+            results[name] = result
+            print(f"{name:<26}{result['requests']:>9}{result['errors']:>8}"
+                  f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['rps']:>10.0f}")
+    finally:
+        if process:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=10)
+
+    if save_baseline:
+        with open(save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'mode': mode, 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Базовый результат сохранен: {save_baseline}")
+
+    if compare:
+        with open(compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = 0
+        print(f"\nСравнение с {compare} (допуск {tolerance:.0%}):")
+        for name, result in results.items():
+            base = baseline.get(name)
+            if not base:
+                continue
+            slower = result['p99_ms'] > base['p99_ms'] * (1 + tolerance)
+            weaker = result['rps'] < base['rps'] * (1 - tolerance)
+            regressions += slower or weaker
+            print(f"{'❌' if slower or weaker else '✅'} {name:<26}"
+                  f"p99 {base['p99_ms']:.2f} → {result['p99_ms']:.2f} мс, "
+                  f"{base['rps']:.0f} → {result['rps']:.0f} запр/с")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,319 @@
+import csv
+import json
+import time
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from models import db, User, Item, PlatformStats, StatsRollup
+from facets import FACET_FIELDS
+from validation import validate_item, validate_user, ITEM_STATUSES
+from ids import next_ids, id_number, advance_sequence
+from cities import resolve_city
+
+# Массовый импорт и экспорт пользователей и объявлений (CSV / JSONL).
+# Входной файл читается потоково, строки проверяются теми же правилами,
+# что и формы, и вставляются пачками (executemany) — одна транзакция на пачку.
+# Идентификаторы для пачки резервируются одним обращением к счетчику (ids.py).
+# Колонки экспорта (uid, item_id, status, даты) при импорте сохраняются,
+# поэтому выгрузку можно загрузить в другую БД без потерь (архив объявлений
+# не выгружается). Пароли пачки хэшируются параллельно (hash_passwords).
+# Экспорт читает БД порциями (yield_per), память не растет с размером таблицы.
+
+BATCH_SIZE = 1000
+
+FORMATS = ('csv', 'jsonl')
+
+ITEM_FIELDS = ['item_id', 'user_uid', 'item_type', 'category', 'title', 'description',
+               'city', 'location', 'date', 'contact_name', 'contact_phone', 'contact_email',
+               'status', 'created_at', 'closed_at']
+
+USER_FIELDS = ['uid', 'username', 'full_name', 'password_hash', 'created_at']
+
+# Сколько ошибок валидации показывать в отчете
+MAX_REPORTED_ERRORS = 20
+
+def detect_format(path, fmt=None):
+    """Формат из параметра или по расширению файла"""
+    if fmt:
+        return fmt
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+def read_rows(stream, fmt):
+    """Генератор (номер строки, словарь) из CSV или JSONL"""
+    if fmt == 'csv':
+        for line_no, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_no, row
+    else:
+        for line_no, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as e:
+                yield line_no, {'_error': f'некорректный JSON: {e}'}
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+class ImportReport:
+    """Счетчики импорта и скорость"""
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors = []
+        self.started_at = time.perf_counter()
+
+    def error(self, line_no, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f'строка {line_no}: {message}')
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_second(self):
+        return (self.imported + self.skipped) / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f'импортировано: {self.imported}, пропущено: {self.skipped}, '
+                f'{self.elapsed:.1f} с, {self.rows_per_second:.0f} строк/с')
+
+def parse_datetime(value):
+    """Дата и время из файла (ISO, как пишет экспорт); None, если колонка пустая"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value)
+
+def _read_imported(data, kind, id_field, date_fields):
+    """Идентификатор и даты из строки файла: (номер или None, {поле: значение}).
+    ValueError с текстом ошибки для отчета, если формат неверный."""
+    value = (data.get(id_field) or '').strip()
+    number = id_number(kind, value) if value else None
+    fields = {id_field: value or None}
+    for field in date_fields:
+        try:
+            fields[field] = parse_datetime(data.get(field))
+        except ValueError:
+            raise ValueError(f'некорректная дата {field}')
+    return number, fields
+
+def _assign_ids(kind, id_field, rows, numbers):
+    """Новые идентификаторы для строк без своего; счетчик сдвигается за номера из файла"""
+    if numbers:
+        advance_sequence(kind, max(numbers))
+    missing = [fields for fields in rows if not fields[id_field]]
+    for fields, new_id in zip(missing, next_ids(kind, len(missing))):
+        fields[id_field] = new_id
+
+def _by_hour(rows, field):
+    """Строки пачки по часам поля field (для StatsRollup.add)"""
+    groups = defaultdict(list)
+    for fields in rows:
+        groups[fields[field].replace(minute=0, second=0, microsecond=0)].append(fields)
+    return groups.items()
+
+def import_users(stream, fmt, hash_passwords, batch_size=BATCH_SIZE, progress=None):
+    """Импорт пользователей: username, full_name и password (или готовый password_hash);
+    uid и created_at из файла сохраняются"""
+    report = ImportReport()
+
+    for batch in batched(read_rows(stream, fmt), batch_size):
+        rows = []
+        usernames, uids = set(), set()
+        for line_no, data in batch:
+            if '_error' in data:
+                report.error(line_no, data['_error'])
+                continue
+            # Уже захэшированный пароль (перенос из другой системы) не проверяем на длину
+            if data.get('password_hash'):
+                data = dict(data, password=data['password_hash'])
+            fields, error = validate_user(data)
+            if error:
+                report.error(line_no, error)
+                continue
+            try:
+                number, imported = _read_imported(data, 'user', 'uid', ('created_at',))
+            except ValueError as e:
+                report.error(line_no, str(e))
+                continue
+            if fields['username'] in usernames:
+                report.error(line_no, 'имя пользователя повторяется в файле')
+                continue
+            if imported['uid'] in uids:
+                report.error(line_no, 'uid повторяется в файле')
+                continue
+            usernames.add(fields['username'])
+            if imported['uid']:
+                uids.add(imported['uid'])
+            rows.append((line_no, fields, imported, number, data.get('password_hash')))
+
+        # Проверка уникальности username и uid одним запросом на пачку
+        taken = {name for (name,) in db.session.query(User.username)
+                                               .filter(User.username.in_(usernames))}
+        taken_uids = {uid for (uid,) in db.session.query(User.uid).filter(User.uid.in_(uids))}
+        values, numbers, passwords = [], [], []
+        for line_no, fields, imported, number, password_hash in rows:
+            if fields['username'] in taken:
+                report.error(line_no, 'имя пользователя уже занято')
+                continue
+            if imported['uid'] in taken_uids:
+                report.error(line_no, 'uid уже занят')
+                continue
+            if number is not None:
+                numbers.append(number)
+            if not password_hash:
+                passwords.append(fields['password'])
+            values.append({
+                'uid': imported['uid'],
+                'username': fields['username'],
+                'full_name': fields['full_name'],
+                'password_hash': password_hash,
+                'created_at': imported['created_at'] or datetime.utcnow(),
+            })
+
+        if values:
+            # Пароли пачки хэшируются вместе, параллельно в пуле процессов
+            hashes = iter(hash_passwords(passwords))
+            for fields in values:
+                fields['password_hash'] = fields['password_hash'] or next(hashes)
+            _assign_ids('user', 'uid', values, numbers)
+            db.session.execute(db.insert(User), values)
+            PlatformStats.apply_delta(db.session, total_users=len(values))
+            for hour, group in _by_hour(values, 'created_at'):
+                StatsRollup.add(db.session, 'new_users', [{}] * len(group), hour)
+        db.session.commit()
+        report.imported += len(values)
+        if progress:
+            progress(report)
+
+    return report
+
+def import_items(stream, fmt, owner=None, batch_size=BATCH_SIZE, progress=None):
+    """Импорт объявлений. Автор — колонка user_uid или owner (User) для всего файла;
+    item_id, status, created_at и closed_at из файла сохраняются"""
+    report = ImportReport()
+    authors = {}
+
+    for batch in batched(read_rows(stream, fmt), batch_size):
+        # Авторы пачки одним запросом
+        missing = {data.get('user_uid') for _, data in batch if data.get('user_uid')} - authors.keys()
+        if missing:
+            for user_id, uid, full_name in db.session.query(User.id, User.uid, User.full_name)\
+                                                     .filter(User.uid.in_(missing)):
+                authors[uid] = (user_id, full_name)
+
+        rows = []
+        item_ids = set()
+        for line_no, data in batch:
+            if '_error' in data:
+                report.error(line_no, data['_error'])
+                continue
+            fields, error = validate_item(data)
+            if error:
+                report.error(line_no, error)
+                continue
+            try:
+                number, imported = _read_imported(data, 'item', 'item_id', ('created_at', 'closed_at'))
+            except ValueError as e:
+                report.error(line_no, str(e))
+                continue
+            status = (data.get('status') or 'active').strip()
+            if status not in ITEM_STATUSES:
+                report.error(line_no, f'неизвестный статус: {status}')
+                continue
+            if imported['item_id'] in item_ids:
+                report.error(line_no, 'item_id повторяется в файле')
+                continue
+            if data.get('user_uid'):
+                author = authors.get(data['user_uid'])
+            else:
+                author = (owner.id, owner.full_name) if owner else None
+            if author is None:
+                report.error(line_no, 'неизвестный автор (user_uid)')
+                continue
+            if imported['item_id']:
+                item_ids.add(imported['item_id'])
+            fields.update(imported, status=status, user_id=author[0])
+            fields['created_at'] = fields['created_at'] or datetime.utcnow()
+            if status == 'active':
+                fields['closed_at'] = None
+            else:
+                fields['closed_at'] = fields['closed_at'] or fields['created_at']
+            fields['contact_name'] = fields['contact_name'] or author[1]
+            rows.append((line_no, fields, number))
+
+        # Проверка уникальности item_id одним запросом на пачку
+        taken = {item_id for (item_id,) in db.session.query(Item.item_id)
+                                                     .filter(Item.item_id.in_(item_ids))}
+        values, numbers = [], []
+        for line_no, fields, number in rows:
+            if fields['item_id'] in taken:
+                report.error(line_no, 'item_id уже занят')
+                continue
+            if number is not None:
+                numbers.append(number)
+            fields['city_id'], fields['city'] = resolve_city(fields['city'])
+            values.append(fields)
+
+        if values:
+            _assign_ids('item', 'item_id', values, numbers)
+            db.session.execute(db.insert(Item), values)
+            lost = sum(1 for fields in values if fields['item_type'] == 'lost')
+            returned = [fields for fields in values if fields['status'] == 'returned']
+            PlatformStats.apply_delta(db.session, total_items=len(values),
+                                      active_items=sum(1 for fields in values if fields['status'] == 'active'),
+                                      lost_items=lost, found_items_reported=len(values) - lost,
+                                      found_items=len(returned))
+            for metric, group, field in (('new_items', values, 'created_at'),
+                                         ('found_items', returned, 'closed_at')):
+                for hour, events in _by_hour(group, field):
+                    StatsRollup.add(db.session, metric, [{facet: fields[facet] for facet in FACET_FIELDS}
+                                                         for fields in events], hour)
+        db.session.commit()
+        report.imported += len(values)
+        if progress:
+            progress(report)
+
+    return report
+
+def _write_rows(stream, fmt, fields, rows):
+    count = 0
+    if fmt == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow(['' if value is None else value for value in row])
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False, default=str) + '\n')
+            count += 1
+    return count
+
+def export_items(stream, fmt, batch_size=BATCH_SIZE):
+    """Выгрузка объявлений вместе с UID автора; возвращает (строк, секунд)"""
+    started_at = time.perf_counter()
+    columns = [User.uid if name == 'user_uid' else getattr(Item, name) for name in ITEM_FIELDS]
+    query = db.select(*columns).join(User, User.id == Item.user_id)\
+              .order_by(Item.id)\
+              .execution_options(yield_per=batch_size)
+    count = _write_rows(stream, fmt, ITEM_FIELDS, db.session.execute(query))
+    return count, time.perf_counter() - started_at
+
+def export_users(stream, fmt, batch_size=BATCH_SIZE):
+    """Выгрузка пользователей (с хэшами паролей); возвращает (строк, секунд)"""
+    started_at = time.perf_counter()
+    query = db.select(*[getattr(User, name) for name in USER_FIELDS])\
+              .order_by(User.id)\
+              .execution_options(yield_per=batch_size)
+    count = _write_rows(stream, fmt, USER_FIELDS, db.session.execute(query))
+    return count, time.perf_counter() - started_at
@@ -0,0 +1,226 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import db, City, CityAlias
+
+# Справочник городов.
+#
+# Город объявления хранится как city_id (фильтр поиска — сравнение целых
+# чисел по индексу) и как название из справочника в Item.city для вывода.
+# Написание, которое ввел пользователь, нормализуется ("г. Москва" →
+# "москва") и ищется среди названий и сокращений (city_aliases). При записи
+# (resolve_city) засчитывается только точное совпадение, неизвестное
+# название становится новым городом: похожие названия часто оказываются
+# разными городами (Краснодар и Красноярск). Фильтр поиска (find_city)
+# дополнительно прощает одну опечатку. Индекс для поиска строится в памяти
+# процесса при первом обращении и перечитывается при промахе не чаще раза
+# в CITIES_TTL секунд (новые города из других процессов).
+
+CITIES_TTL = 60
+
+# Нечеткое совпадение: не больше CITY_MAX_TYPOS правок (замена, вставка,
+# удаление, перестановка соседних букв) для названий от CITY_FUZZY_MIN_LENGTH
+# букв, первая буква совпадает (Омск ≠ Томск), и подходит ровно один город
+CITY_MAX_TYPOS = 1
+CITY_FUZZY_MIN_LENGTH = 5
+
+# Начальный справочник: название и распространенные сокращения
+CITY_SEEDS = {
+    'Москва': ['мск'],
+    'Санкт-Петербург': ['спб', 'питер', 'петербург'],
+    'Новосибирск': ['нск'],
+    'Екатеринбург': ['екб'],
+    'Казань': [],
+    'Нижний Новгород': ['нн', 'н новгород'],
+    'Челябинск': [],
+    'Самара': [],
+    'Омск': [],
+    'Ростов-на-Дону': ['ростов'],
+    'Уфа': [],
+    'Красноярск': [],
+    'Пермь': [],
+    'Воронеж': [],
+    'Волгоград': [],
+}
+
+# "г. ", "город ", "пос. " и т.п. перед названием
+CITY_PREFIX_RE = re.compile(r'^(г|гор|город|пгт|п|пос|поселок|с|село|д|дер|деревня)(\.\s*|\s+)', re.IGNORECASE)
+
+_cities = {'index': None, 'names': {}, 'loaded_at': 0.0}
+_cities_lock = threading.Lock()
+
+def _strip_prefix(text):
+    return CITY_PREFIX_RE.sub('', text.strip().replace('ё', 'е').replace('Ё', 'Е'))
+
+def normalize_city(text):
+    """Ключ для сравнения: без "г.", регистра, ё и знаков препинания"""
+    return ' '.join(re.sub(r'[\W_]+', ' ', _strip_prefix(text or '').lower()).split())
+
+def display_name(text):
+    """Название нового города для справочника: как введено, без "г." и с заглавной буквы"""
+    name = ' '.join(_strip_prefix(text).split())
+    return name[:1].upper() + name[1:]
+
+def _trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def build_index(rows):
+    """Индекс поиска по парам (ключ, city_id): точные ключи и триграммы"""
+    index = {'keys': {}, 'grams': {}, 'by_gram': defaultdict(set)}
+    for key, city_id in rows:
+        add_to_index(index, key, city_id)
+    return index
+
+def add_to_index(index, key, city_id):
+    if key in index['keys']:
+        return
+    index['keys'][key] = city_id
+    index['grams'][key] = _trigrams(key)
+    for gram in index['grams'][key]:
+        index['by_gram'][gram].add(key)
+
+def edit_distance(a, b):
+    """Расстояние Дамерау — Левенштейна (перестановка соседних букв — одна правка)"""
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+def match_city(index, key, fuzzy=False):
+    """(city_id, точное ли совпадение) или None; fuzzy — прощать опечатку"""
+    if key in index['keys']:
+        return index['keys'][key], True
+    if not fuzzy or len(key) < CITY_FUZZY_MIN_LENGTH:
+        return None
+
+    # Кандидаты — ключи с общими триграммами
+    candidates = {candidate for gram in _trigrams(key) for candidate in index['by_gram'].get(gram, ())}
+    found = {index['keys'][candidate] for candidate in candidates
+             if candidate[0] == key[0]
+             and abs(len(candidate) - len(key)) <= CITY_MAX_TYPOS
+             and edit_distance(key, candidate) <= CITY_MAX_TYPOS}
+    if len(found) == 1:
+        return found.pop(), False
+    return None
+
+def load_cities():
+    """Перечитывает справочник из БД в память"""
+    names = {}
+    rows = []
+    for city_id, name, key in db.session.query(City.id, City.name, City.key):
+        names[city_id] = name
+        rows.append((key, city_id))
+    rows.extend(db.session.query(CityAlias.key, CityAlias.city_id))
+    index = build_index(rows)
+
+    with _cities_lock:
+        _cities['index'] = index
+        _cities['names'] = names
+        _cities['loaded_at'] = time.monotonic()
+    return index
+
+def _get_index():
+    index = _cities['index']
+    if index is None:
+        index = load_cities()
+    return index
+
+def _find(key, fuzzy=False):
+    found = match_city(_get_index(), key, fuzzy)
+    if found is None and time.monotonic() - _cities['loaded_at'] > CITIES_TTL:
+        found = match_city(load_cities(), key, fuzzy)
+    return found
+
+def city_name(city_id):
+    """Название города по id (None, если такого нет)"""
+    _get_index()
+    name = _cities['names'].get(city_id)
+    if name is None and city_id is not None:
+        load_cities()
+        name = _cities['names'].get(city_id)
+    return name
+
+def find_city(text):
+    """(city_id, название) по названию, сокращению или написанию с опечаткой; None, если не найден"""
+    key = normalize_city(text)
+    if not key:
+        return None
+    found = _find(key, fuzzy=True)
+    if found is None:
+        return None
+    return found[0], city_name(found[0])
+
+def resolve_city(text):
+    """(city_id, название) по точному названию или сокращению; неизвестный
+    город добавляется в справочник. None, если в названии нет букв и цифр.
+
+    Пишет отдельной короткой транзакцией (как ids.reserve_range), поэтому
+    вызывать до изменений в текущей сессии.
+    """
+    key = normalize_city(text)
+    if not key:
+        return None
+
+    found = _find(key)
+    if found is not None:
+        return found[0], city_name(found[0])
+
+    with db.engine.begin() as connection:
+        connection.execute(sqlite_insert(City.__table__)
+                           .values(name=display_name(text), key=key)
+                           .on_conflict_do_nothing())
+        city_id = connection.execute(db.select(City.id).where(City.key == key)).scalar()
+
+    load_cities()
+    return city_id, city_name(city_id)
+
+def ensure_cities():
+    """Добавляет в справочник начальные города и сокращения (CITY_SEEDS)"""
+    with db.engine.begin() as connection:
+        for name, aliases in CITY_SEEDS.items():
+            key = normalize_city(name)
+            connection.execute(sqlite_insert(City.__table__)
+                               .values(name=name, key=key)
+                               .on_conflict_do_nothing())
+            city_id = connection.execute(db.select(City.id).where(City.key == key)).scalar()
+            for alias in aliases:
+                connection.execute(sqlite_insert(CityAlias.__table__)
+                                   .values(key=normalize_city(alias), city_id=city_id)
+                                   .on_conflict_do_nothing())
+    load_cities()
+
+def backfill_city_ids(connection):
+    """Шаг миграции: city_id и название из справочника для существующих объявлений"""
+    names = {}
+    rows = []
+    for city_id, name, key in connection.execute(db.select(City.id, City.name, City.key)):
+        names[city_id] = name
+        rows.append((key, city_id))
+    rows.extend(connection.execute(db.select(CityAlias.key, CityAlias.city_id)))
+    index = build_index(rows)
+
+    for table in ('items', 'items_archive'):
+        texts = [text for (text,) in connection.exec_driver_sql(f"SELECT DISTINCT city FROM {table}")]
+        for text in texts:
+            key = normalize_city(text)
+            if not key:
+                continue
+            found = match_city(index, key)
+            if found is None:
+                city_id = connection.execute(City.__table__.insert()
+                                             .values(name=display_name(text), key=key)).inserted_primary_key[0]
+                names[city_id] = display_name(text)
+                add_to_index(index, key, city_id)
+            else:
+                city_id = found[0]
+            connection.exec_driver_sql(f"UPDATE {table} SET city_id = ?, city = ? WHERE city = ?",
+                                       (city_id, names[city_id], text))
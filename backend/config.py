@@ -0,0 +1,53 @@
+import os
+from datetime import timedelta
+
+CPU_COUNT = os.cpu_count() or 1
+
+# Конфигурация приложения из переменных окружения.
+# Настройки БД — в database.py, настройки запуска сервера — в serve.py.
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-123-change-this')
+
+    # Сессии (см. sessions.py): sqlite — на сервере, в cookie только id;
+    # cookie — стандартная подписанная cookie Flask
+    SESSION_TYPE = os.environ.get('SESSION_TYPE', 'sqlite')
+    PERMANENT_SESSION_LIFETIME = timedelta(days=int(os.environ.get('SESSION_LIFETIME_DAYS', 14)))
+    SESSION_CLEANUP_INTERVAL = int(os.environ.get('SESSION_CLEANUP_INTERVAL', 3600))
+    SESSION_CLEANUP_BATCH_SIZE = int(os.environ.get('SESSION_CLEANUP_BATCH_SIZE', 1000))
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Период фоновой сверки статистики (секунды)
+    STATS_RECONCILE_INTERVAL = int(os.environ.get('STATS_RECONCILE_INTERVAL', 600))
+
+    # Период записи буфера счетчиков статистики (секунды, см. counters.py)
+    COUNTER_FLUSH_INTERVAL = float(os.environ.get('COUNTER_FLUSH_INTERVAL', 1))
+
+    # Жизненный цикл объявлений (см. lifecycle.py): через сколько дней активное
+    # объявление закрывается, закрытое переносится в архив; период и размер пачки
+    ITEM_EXPIRE_DAYS = int(os.environ.get('ITEM_EXPIRE_DAYS', 90))
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 30))
+    ARCHIVE_INTERVAL = int(os.environ.get('ARCHIVE_INTERVAL', 3600))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+
+    # Подбор пар "потеряно — найдено" (см. matching.py): период и размер пачки
+    MATCH_INTERVAL = int(os.environ.get('MATCH_INTERVAL', 10))
+    MATCH_BATCH_SIZE = int(os.environ.get('MATCH_BATCH_SIZE', 200))
+
+    # Ограничение частоты запросов (см. rate_limits.py): "маршрут=запросов/секунд"
+    # через запятую, для пользователя или IP; пустая строка — без ограничений
+    RATE_LIMITS = os.environ.get('RATE_LIMITS', 'login=10/60,register=5/3600,create=20/3600,search=30/60')
+
+    # Метрики: заголовок Server-Timing, токен для /metrics (без него —
+    # только с локального адреса), порог N+1
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', '0') == '1'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))
+
+    # Хэширование паролей (см. passwords.py). Пул и очередь — в каждом
+    # процессе: по умолчанию все ядра (flask CLI, сервер разработки), а serve.py
+    # делит ядра между процессами сервера (split_password_workers)
+    PASSWORD_METHOD = os.environ.get('PASSWORD_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_WORKERS = int(os.environ.get('PASSWORD_WORKERS', CPU_COUNT))
+    PASSWORD_QUEUE_LIMIT = int(os.environ.get('PASSWORD_QUEUE_LIMIT', 4 * max(1, PASSWORD_WORKERS)))
+    PASSWORD_TIMEOUT = float(os.environ.get('PASSWORD_TIMEOUT', 10))
@@ -0,0 +1,118 @@
+import atexit
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from flask import current_app
+from models import db, PlatformStats, StatsRollup
+from page_cache import clear_page_cache
+from Utilts import invalidate_stats_cache
+
+# Отложенная запись счетчиков (write-behind).
+#
+# Регистрация, создание, удаление и отметка "найдено" меняют одни и те же
+# строки: единственную запись platform_stats и текущие строки stats_rollups.
+# Чтобы запросы не ждали друг друга на этих строках, обработчик после своего
+# единственного коммита только добавляет изменения в буфер процесса
+# (count_stats, count_events). Фоновый поток раз в COUNTER_FLUSH_INTERVAL
+# секунд записывает накопленное одной транзакцией: UPDATE ... SET x = x + n
+# (PlatformStats.apply_delta) и upsert сумм по часам (StatsRollup.add_counts).
+#
+# Цена — задержка до COUNTER_FLUSH_INTERVAL: счетчики и версия кэша страниц
+# (PlatformStats.last_updated) в других процессах обновляются после записи
+# буфера; свой кэш страниц процесс сбрасывает сразу. Буфер теряется только
+# при аварийном завершении процесса — сверка статистики (start_stats_reconciler)
+# и flask rebuild-rollups восстанавливают счетчики по данным.
+
+_counters = {'stats': Counter(), 'rollups': defaultdict(Counter), 'pid': None}
+_counters_lock = threading.Lock()
+
+def _hour(when):
+    return when.replace(minute=0, second=0, microsecond=0)
+
+def count_stats(**deltas):
+    """Добавляет изменения счетчиков PlatformStats в буфер (после коммита)"""
+    _ensure_flusher()
+    with _counters_lock:
+        _counters['stats'].update({name: delta for name, delta in deltas.items() if delta})
+    clear_page_cache()
+
+def count_events(metric, events):
+    """Добавляет события для stats_rollups в буфер (после коммита), формат как у StatsRollup.add"""
+    _ensure_flusher()
+    counts = StatsRollup.count_events(events)
+    with _counters_lock:
+        _counters['rollups'][(metric, _hour(datetime.utcnow()))].update(counts)
+
+def pending_stats(name):
+    """Изменение счетчика, еще не записанное из буфера этого процесса"""
+    with _counters_lock:
+        return _counters['stats'][name]
+
+def _take():
+    with _counters_lock:
+        stats, rollups = _counters['stats'], _counters['rollups']
+        _counters['stats'], _counters['rollups'] = Counter(), defaultdict(Counter)
+    return stats, rollups
+
+def _put_back(stats, rollups):
+    with _counters_lock:
+        _counters['stats'].update(stats)
+        for key, counts in rollups.items():
+            _counters['rollups'][key].update(counts)
+
+def flush_counters():
+    """Записывает буфер одной транзакцией, возвращает True, если было что записать"""
+    stats, rollups = _take()
+    stats = {name: delta for name, delta in stats.items() if delta}
+    if not stats and not rollups:
+        return False
+
+    try:
+        PlatformStats.apply_delta(db.session, **stats)
+        for (metric, hour), counts in rollups.items():
+            StatsRollup.add_counts(db.session, metric, counts, hour)
+        db.session.commit()
+    except Exception:
+        # Изменения вернутся в буфер и запишутся следующей попыткой
+        db.session.rollback()
+        _put_back(stats, rollups)
+        raise
+
+    invalidate_stats_cache()
+    clear_page_cache()
+    return True
+
+def _ensure_flusher():
+    # Поток запускается в каждом процессе при первом событии (после fork
+    # потоки родителя не работают, а его буфер не наш)
+    if _counters['pid'] == os.getpid():
+        return
+    with _counters_lock:
+        if _counters['pid'] == os.getpid():
+            return
+        _counters['pid'] = os.getpid()
+        _counters['stats'] = Counter()
+        _counters['rollups'] = defaultdict(Counter)
+    start_counter_flusher(current_app._get_current_object(),
+                          current_app.config['COUNTER_FLUSH_INTERVAL'])
+
+def start_counter_flusher(app, interval):
+    """Фоновая запись буфера счетчиков (по одной в процессе) и запись при выходе"""
+    def flush():
+        try:
+            with app.app_context():
+                flush_counters()
+        except Exception as e:
+            print(f"Ошибка записи счетчиков: {e}")
+
+    def run():
+        while True:
+            time.sleep(interval)
+            flush()
+
+    thread = threading.Thread(target=run, name='counter-flusher', daemon=True)
+    thread.start()
+    atexit.register(flush)
+    return thread
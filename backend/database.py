@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import time
+from functools import partial
+from multiprocessing import Pool
+from sqlalchemy import event
+
+# Настройка подключения к БД из переменных окружения.
+#
+#   DATABASE_URL           — строка подключения (по умолчанию локальный SQLite)
+#   DB_PROFILE             — набор PRAGMA для SQLite: production (по умолчанию) или default
+#   DB_POOL_SIZE           — постоянных соединений в пуле
+#   DB_MAX_OVERFLOW        — дополнительных соединений сверх пула
+#   DB_POOL_TIMEOUT        — сколько ждать свободное соединение (секунды)
+#   SQLITE_BUSY_TIMEOUT_MS — сколько ждать снятия блокировки записи
+#   SQLITE_MMAP_SIZE       — размер memory-mapped I/O (байты)
+
+DEFAULT_DATABASE_URI = 'sqlite:///../instance/lost_and_found.db'
+
+SQLITE_PROFILES = {
+    # Поведение SQLite по умолчанию (rollback journal, synchronous=FULL)
+    'default': {},
+    # WAL: читатели не блокируются писателем, коммит без fsync на каждую транзакцию
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -20000,  # ~20 МБ
+        'temp_store': 'MEMORY',
+    },
+}
+
+def configure_database(app):
+    """Заполняет конфиг приложения настройками БД из окружения"""
+    uri = os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URI)
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+
+    profile = os.environ.get('DB_PROFILE', 'production')
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Неизвестный DB_PROFILE: {profile} (доступны: {', '.join(SQLITE_PROFILES)})")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    if 'SQLITE_BUSY_TIMEOUT_MS' in os.environ:
+        pragmas['busy_timeout'] = int(os.environ['SQLITE_BUSY_TIMEOUT_MS'])
+    if 'SQLITE_MMAP_SIZE' in os.environ:
+        pragmas['mmap_size'] = int(os.environ['SQLITE_MMAP_SIZE'])
+    app.config['SQLITE_PRAGMAS'] = pragmas
+
+    # Для SQLite в памяти используется однопоточный пул без этих параметров
+    if not _is_memory_sqlite(uri):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        }
+
+def init_database(app, db):
+    """Подключает SQLAlchemy к приложению и вешает PRAGMA на каждое новое соединение"""
+    db.init_app(app)
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite' and pragmas:
+            event.listen(db.engine, 'connect', partial(_apply_pragmas, pragmas))
+
+def _is_memory_sqlite(uri):
+    return uri.startswith('sqlite') and (uri in ('sqlite://', 'sqlite:///') or ':memory:' in uri)
+
+def _apply_pragmas(pragmas, dbapi_connection, connection_record=None):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+# ===== НАГРУЗОЧНЫЙ ТЕСТ ЧТЕНИЯ =====
+
+LOADTEST_QUERY = (
+    "SELECT id, item_id, title, city, category, created_at FROM items "
+    "WHERE status = 'active' ORDER BY created_at DESC, id DESC LIMIT 20"
+)
+
+def _loadtest_worker(db_path, pragmas, duration):
+    connection = sqlite3.connect(db_path)
+    _apply_pragmas(pragmas, connection)
+    queries = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        connection.execute(LOADTEST_QUERY).fetchall()
+        queries += 1
+    connection.close()
+    return queries
+
+def run_read_loadtest(db_path, pragmas, worker_counts=(1, 2, 4, 8), duration=3.0):
+    """Гоняет ленту объявлений из N процессов, возвращает [(процессов, запросов/с)]"""
+    results = []
+    for workers in worker_counts:
+        with Pool(workers) as pool:
+            counts = pool.starmap(_loadtest_worker, [(db_path, pragmas, duration)] * workers)
+        results.append((workers, sum(counts) / duration))
+    return results
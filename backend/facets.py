@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import Counter
+from models import db, Item
+from cities import city_name
+
+# Счетчики активных объявлений по категориям, городам и типам в памяти процесса.
+# Загружаются из БД одним проходом и дальше поддерживаются при записи
+# (create/delete/found). Изменения из других процессов подтягиваются
+# перезагрузкой раз в FACETS_TTL секунд.
+
+FACETS_TTL = 300
+
+FACET_FIELDS = ('category', 'city', 'item_type')
+
+_facets = {'counters': None, 'loaded_at': 0.0}
+_facets_lock = threading.Lock()
+
+def load_facets():
+    """Перечитывает счетчики из БД"""
+    counters = {field: Counter() for field in FACET_FIELDS}
+    for field in FACET_FIELDS:
+        # Город группируем по city_id (индекс), название — из справочника
+        column = Item.city_id if field == 'city' else getattr(Item, field)
+        rows = db.session.query(column, db.func.count(Item.id))\
+                         .filter(Item.status == 'active')\
+                         .group_by(column)\
+                         .all()
+        if field == 'city':
+            # Старые объявления без города из справочника (city_id NULL) в фильтр не попадают
+            rows = [(city_name(city_id), count) for city_id, count in rows if city_id is not None]
+            rows = [(name, count) for name, count in rows if name is not None]
+        counters[field].update(dict(rows))
+
+    with _facets_lock:
+        _facets['counters'] = counters
+        _facets['loaded_at'] = time.monotonic()
+    return counters
+
+def _get_counters():
+    counters = _facets['counters']
+    if counters is None or time.monotonic() - _facets['loaded_at'] > FACETS_TTL:
+        counters = load_facets()
+    return counters
+
+def item_facets(item):
+    """Значения фасетов объявления (пустой словарь, если объявление не активно)"""
+    if (item.status or 'active') != 'active':
+        return {}
+    return {field: getattr(item, field) for field in FACET_FIELDS}
+
+def apply_facets(values, sign=1):
+    """Учитывает объявление в счетчиках (sign=1) или убирает его (sign=-1).
+
+    values берутся из item_facets() до коммита: после удаления атрибуты
+    объекта уже недоступны.
+    """
+    if not values or _facets['counters'] is None:
+        return
+    with _facets_lock:
+        counters = _facets['counters']
+        for field, value in values.items():
+            counters[field][value] += sign
+            if counters[field][value] <= 0:
+                del counters[field][value]
+
+def invalidate_facets():
+    """Принудительная перезагрузка при следующем обращении"""
+    _facets['loaded_at'] = 0.0
+
+def facet_options(field):
+    """Значения фасета с количеством, по алфавиту — для выпадающих списков"""
+    counters = _get_counters()
+    with _facets_lock:
+        return sorted(counters[field].items())
+
+def top_facets(field, limit=None):
+    """Самые частые значения фасета с количеством"""
+    counters = _get_counters()
+    with _facets_lock:
+        return counters[field].most_common(limit)
@@ -0,0 +1,109 @@
+import re
+from models import db, IdSequence
+
+# Публичные идентификаторы пользователей и объявлений.
+#
+# Номер берется из общего счетчика в таблице id_sequences и кодируется
+# в Crockford Base32 фиксированной ширины, поэтому идентификаторы уникальны
+# без проверок и повторов. Каждая выдача — отдельная короткая транзакция
+# UPDATE счетчика (пачка импорта — одна на всю пачку). SQLite выполняет
+# записи по очереди, поэтому номера идут в порядке выдачи во всех процессах
+# сразу: идентификатор, выданный позже, всегда больше, и вставки идут
+# в конец индекса.
+#
+# Старые случайные идентификаторы (USR- + 6, ITEM- + 8 символов) короче на
+# один символ, поэтому новые с ними совпасть не могут.
+#
+# Импорт сохраняет идентификаторы из файла (id_number проверяет формат),
+# а advance_sequence сдвигает счетчик за наибольший импортированный номер.
+
+CROCKFORD_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+# Префикс и число символов номера для каждого вида
+ID_FORMATS = {
+    'user': ('USR-', 7),
+    'item': ('ITEM-', 9),
+}
+
+def encode_crockford(value, width):
+    """Число → строка Crockford Base32 фиксированной ширины"""
+    chars = []
+    for _ in range(width):
+        value, remainder = divmod(value, 32)
+        chars.append(CROCKFORD_ALPHABET[remainder])
+    if value:
+        raise OverflowError(f'Номер не помещается в {width} символов')
+    return ''.join(reversed(chars))
+
+def id_number(kind, value):
+    """Номер из идентификатора вида kind; None для идентификатора другого
+    формата (старые случайные, USR-ADMIN), который с новыми не совпадет;
+    ValueError — если это не идентификатор вида kind"""
+    prefix, width = ID_FORMATS[kind]
+    if not re.fullmatch(f'{re.escape(prefix)}[A-Z0-9]+', value):
+        raise ValueError(f'некорректный идентификатор: {value}')
+    if not re.fullmatch(f'{re.escape(prefix)}[{CROCKFORD_ALPHABET}]{{{width}}}', value):
+        return None
+    number = 0
+    for char in value[len(prefix):]:
+        number = number * 32 + CROCKFORD_ALPHABET.index(char)
+    return number
+
+def advance_sequence(kind, number):
+    """Сдвигает счетчик так, чтобы номер number больше не выдавался.
+    Отдельная транзакция, как reserve_range."""
+    sequence = IdSequence.__table__
+    with db.engine.begin() as connection:
+        connection.execute(
+            sequence.update()
+                    .where(sequence.c.name == kind, sequence.c.next_value <= number)
+                    .values(next_value=number + 1)
+        )
+
+def reserve_range(kind, count):
+    """Резервирует count номеров в общем счетчике, возвращает первый.
+
+    Выполняется в отдельной транзакции, чтобы откат запроса не вернул
+    номера, которые процесс уже считает своими. Поэтому вызывать до
+    изменений в текущей сессии: в SQLite ее блокировка записи задержала бы
+    эту транзакцию.
+    """
+    sequence = IdSequence.__table__
+    with db.engine.begin() as connection:
+        updated = connection.execute(
+            sequence.update()
+                    .where(sequence.c.name == kind)
+                    .values(next_value=sequence.c.next_value + count)
+        ).rowcount
+        if not updated:
+            connection.execute(sequence.insert().values(name=kind, next_value=1 + count))
+        end = connection.execute(
+            db.select(sequence.c.next_value).where(sequence.c.name == kind)
+        ).scalar()
+    return end - count
+
+def next_numbers(kind, count=1):
+    """count следующих номеров подряд"""
+    start = reserve_range(kind, count)
+    return range(start, start + count)
+
+def next_ids(kind, count=1):
+    """Список из count новых идентификаторов вида kind ('user' или 'item')"""
+    prefix, width = ID_FORMATS[kind]
+    return [prefix + encode_crockford(number, width) for number in next_numbers(kind, count)]
+
+def ensure_sequences():
+    """Создает строки счетчиков, чтобы первая выдача не конкурировала за INSERT"""
+    existing = {name for (name,) in db.session.query(IdSequence.name)}
+    for kind in ID_FORMATS:
+        if kind not in existing:
+            db.session.add(IdSequence(name=kind, next_value=1))
+    db.session.commit()
+
+# Генерация UID пользователя
+def generate_uid():
+    return next_ids('user')[0]
+
+# Генерация ID для объявления
+def generate_item_id():
+    return next_ids('item')[0]
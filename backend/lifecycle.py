@@ -0,0 +1,111 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from models import db, Item, ArchivedItem, ItemMatch, PlatformStats
+from facets import item_facets, invalidate_facets
+from Utilts import invalidate_stats_cache
+from suggest import invalidate_suggestions
+from counters import count_stats, count_events
+
+# Жизненный цикл объявления: active → returned (вещь нашлась) или
+# closed (снято автором или устарело) → archived (перенесено в items_archive).
+#
+# Строки из items не удаляются при закрытии, поэтому счетчики PlatformStats
+# можно сверить с данными. Фоновая задача раз в ARCHIVE_INTERVAL секунд
+# закрывает активные объявления старше ITEM_EXPIRE_DAYS и пачками по
+# ARCHIVE_BATCH_SIZE переносит закрытые дольше ARCHIVE_AFTER_DAYS дней
+# в архив, чтобы горячая таблица items оставалась небольшой.
+
+CLOSED_STATUSES = ('closed', 'returned')
+
+ARCHIVE_COLUMNS = ['id', 'item_id', 'user_id', 'item_type', 'category', 'title', 'description',
+                   'city', 'city_id', 'location', 'date', 'contact_name', 'contact_phone', 'contact_email',
+                   'created_at', 'status', 'closed_at']
+
+def close_item(item, status):
+    """Закрывает активное объявление в текущей транзакции (коммит — у вызывающего).
+
+    Возвращает фасеты объявления: после коммита их нужно передать
+    в count_closed() и убрать из счетчиков через apply_facets(facets, -1).
+    """
+    facets = item_facets(item)
+    item.status = status
+    item.closed_at = datetime.utcnow()
+    return facets
+
+def count_closed(status, facets):
+    """Счетчики статистики для закрытого объявления (после коммита, через буфер counters.py)"""
+    count_stats(active_items=-1, found_items=1 if status == 'returned' else 0)
+    if status == 'returned':
+        count_events('found_items', [facets])
+
+def expire_items(max_age_days, batch_size):
+    """Закрывает активные объявления старше max_age_days, возвращает их число"""
+    cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+    total = 0
+    while True:
+        ids = [item_id for (item_id,) in db.session.query(Item.id)
+                                                   .filter(Item.status == 'active', Item.created_at < cutoff)
+                                                   .limit(batch_size)]
+        if not ids:
+            break
+        db.session.query(Item).filter(Item.id.in_(ids))\
+                  .update({Item.status: 'closed', Item.closed_at: datetime.utcnow()},
+                          synchronize_session=False)
+        PlatformStats.apply_delta(db.session, active_items=-len(ids))
+        db.session.commit()
+        total += len(ids)
+    return total
+
+def archive_items(after_days, batch_size):
+    """Переносит в items_archive объявления, закрытые больше after_days дней назад"""
+    cutoff = datetime.utcnow() - timedelta(days=after_days)
+    total = 0
+    for status in CLOSED_STATUSES:
+        while True:
+            ids = [item_id for (item_id,) in db.session.query(Item.id)
+                                                       .filter(Item.status == status, Item.closed_at < cutoff)
+                                                       .limit(batch_size)]
+            if not ids:
+                break
+            # Копирование и удаление — одна транзакция на пачку
+            columns = [getattr(Item, name) for name in ARCHIVE_COLUMNS]
+            db.session.execute(
+                db.insert(ArchivedItem).from_select(
+                    ARCHIVE_COLUMNS + ['archived_at'],
+                    db.select(*columns, db.literal(datetime.utcnow())).where(Item.id.in_(ids))
+                )
+            )
+            db.session.query(ItemMatch).filter(db.or_(ItemMatch.item_id.in_(ids), ItemMatch.match_id.in_(ids)))\
+                      .delete(synchronize_session=False)
+            db.session.query(Item).filter(Item.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            total += len(ids)
+    return total
+
+def run_lifecycle(config):
+    """Один проход: закрытие устаревших и архивация закрытых. Возвращает (закрыто, в архиве)"""
+    expired = expire_items(config['ITEM_EXPIRE_DAYS'], config['ARCHIVE_BATCH_SIZE'])
+    archived = archive_items(config['ARCHIVE_AFTER_DAYS'], config['ARCHIVE_BATCH_SIZE'])
+    if expired:
+        invalidate_facets()
+        invalidate_suggestions()
+        invalidate_stats_cache()
+    return expired, archived
+
+def start_archiver(app, interval):
+    """Фоновая периодическая архивация (одна на сервер, как и сверка статистики)"""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                with app.app_context():
+                    expired, archived = run_lifecycle(app.config)
+                    if expired or archived:
+                        print(f"🗄️ Закрыто устаревших: {expired}, перенесено в архив: {archived}")
+            except Exception as e:
+                print(f"Ошибка архивации: {e}")
+
+    thread = threading.Thread(target=run, name='items-archiver', daemon=True)
+    thread.start()
+    return thread
@@ -1,106 +1,93 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
-from models import db, User, Item
+from flask import Flask, Blueprint, render_template, request, redirect, session, flash, current_app, jsonify, abort
+from models import db, User, Item, StatsRollup
 from Utilts import *
-from datetime import datetime
+from search_index import init_search_index, filter_items
+from pagination import paginate, get_page_size
+from migrations import upgrade_database, check_query_plans
+from facets import item_facets, apply_facets, facet_options, top_facets, invalidate_facets
+from suggest import suggest, load_suggestions, item_suggestions, apply_suggestions, SUGGEST_LIMIT
+from database import configure_database, init_database, run_read_loadtest
+from page_cache import cache_page
+from rate_limits import rate_limit
+from api import bp as api_bp
+from assets import bp as assets_bp, init_assets, build_assets
+from metrics import init_metrics
+from user_cache import current_user, invalidate_user
+from sessions import init_sessions, rotate_session, revoke_user_sessions, expire_sessions
+from passwords import hash_password, hash_passwords, verify_password, needs_rehash, PasswordHashingBusy
+from validation import validate_item, validate_user
+from ids import generate_uid, generate_item_id, ensure_sequences
+from lifecycle import close_item, count_closed, run_lifecycle
+from counters import count_stats, count_events, pending_stats
+from cities import resolve_city, ensure_cities
+from matching import run_matching, get_matches
+import bulk
+from config import Config
 import os
-import random
-import string
-import hashlib
-from werkzeug.security import generate_password_hash, check_password_hash
+import sys
+import click
+from contextlib import nullcontext
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///../instance/lost_and_found.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = 'your-secret-key-123-change-this'
-app.config['SESSION_TYPE'] = 'filesystem'
+# Все маршруты и команды CLI приложения
+bp = Blueprint('main', __name__, cli_group=None)
 
-# Указываем путь к шаблонам
-app.template_folder = '../front'
-
-# Инициализируем БД
-db.init_app(app)
-
-# Генерация UID пользователя
-def generate_uid():
-    characters = string.ascii_uppercase + string.digits
-    return 'USR-' + ''.join(random.choices(characters, k=6))
-
-# Генерация ID для объявления
-def generate_item_id():
-    characters = string.ascii_uppercase + string.digits
-    return 'ITEM-' + ''.join(random.choices(characters, k=8))
-
-# Хэширование пароля
-def hash_password(password):
-    return generate_password_hash(password)
-
-# Проверка пароля
-def verify_password(stored_hash, password):
-    return check_password_hash(stored_hash, password)
+def create_app(config_object=Config):
+    """Фабрика приложения: конфиг из окружения, БД, маршруты"""
+    # Указываем путь к шаблонам; статика отдается из assets.py
+    app = Flask(__name__, template_folder='../front', static_folder=None)
+    app.config.from_object(config_object)
+    configure_database(app)
+    init_assets(app)
+    
+    # Инициализируем БД
+    init_database(app, db)
+    init_metrics(app)
+    init_sessions(app)
+    
+    app.register_blueprint(bp)
+    app.register_blueprint(api_bp)
+    app.register_blueprint(assets_bp)
+    return app
 
 # ===== МАРШРУТЫ =====
 
 # Главная страница
-@app.route('/')
+@bp.route('/')
+@cache_page
 def index():
-    # 1. Получаем или создаем запись статистики
-    stats_obj = PlatformStats.get_current_stats()
-    
-    # 2. ОБНОВЛЯЕМ статистику на основе текущих данных в БД
-    stats_obj.total_users = User.query.count()
-    stats_obj.total_items = Item.query.count()
-    stats_obj.active_items = Item.query.filter_by(status='active').count()
-    stats_obj.lost_items = Item.query.filter_by(item_type='lost').count()
-    stats_obj.found_items_reported = Item.query.filter_by(item_type='found').count()
-    stats_obj.last_updated = datetime.utcnow()
-    
-    # 3. Сохраняем обновленную статистику в БД
-    db.session.commit()
+    # 1. Статистика и популярные категории из кэша (главная страница ничего не пишет в БД)
+    stats = get_cached_stats()
+    categories = top_facets('category', 10)
     
-    # 4. Получаем популярные категории
-    categories_data = db.session.query(
-        Item.category, 
-        db.func.count(Item.id)
-    ).group_by(Item.category).order_by(db.func.count(Item.id).desc()).limit(10).all()
-    
-    # 5. Получаем последние объявления
-    recent_items = Item.query.filter_by(status='active').order_by(
+    # 2. Получаем последние объявления
+    recent_items = Item.cards_query(description_length=100).filter_by(status='active').order_by(
         Item.created_at.desc()
     ).limit(6).all()
     
-    # 6. Получаем данные пользователя
-    user = None
-    if 'user_id' in session:
-        user = User.query.get(session['user_id'])
+    # 3. Получаем данные пользователя
+    user = current_user()
     
-    # 7. Передаем stats_obj напрямую в шаблон (это объект PlatformStats)
     return render_template('index.html', 
                          user=user,
-                         stats=stats_obj,  # Передаем объект, а не словарь
-                         categories=categories_data,
+                         stats=stats,
+                         categories=categories,
                          recent_items=recent_items)
 
 # Регистрация
-@app.route('/register', methods=['GET', 'POST'])
+@bp.route('/register', methods=['GET', 'POST'])
+@rate_limit('register')
 def register():
     if request.method == 'POST':
-        username = request.form.get('username', '').strip()
-        full_name = request.form.get('full_name', '').strip()
-        password = request.form.get('password', '')
-        confirm_password = request.form.get('confirm_password', '')
-        
         # Валидация
-        if not username or len(username) < 3:
-            flash('Имя пользователя должно быть не менее 3 символов', 'error')
-            return redirect('/register')
-        
-        if not full_name:
-            flash('Введите ФИО', 'error')
+        fields, error = validate_user(request.form)
+        if error:
+            flash(error, 'error')
             return redirect('/register')
         
-        if not password or len(password) < 4:
-            flash('Пароль должен быть не менее 4 символов', 'error')
-            return redirect('/register')
+        username = fields['username']
+        full_name = fields['full_name']
+        password = fields['password']
+        confirm_password = request.form.get('confirm_password', '')
         
         if password != confirm_password:
             flash('Пароли не совпадают', 'error')
@@ -126,8 +113,11 @@ def register():
         try:
             db.session.add(new_user)
             db.session.commit()
+            count_stats(total_users=1)
+            count_events('new_users', [{}])
             
             # Авторизация
+            rotate_session()
             session['user_id'] = new_user.id
             session['user_uid'] = new_user.uid
             session['username'] = new_user.username
@@ -146,7 +136,8 @@ def register():
     return render_template('register/register.html')
 
 # Вход
-@app.route('/login', methods=['GET', 'POST'])
+@bp.route('/login', methods=['GET', 'POST'])
+@rate_limit('login')
 def login():
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
@@ -155,6 +146,15 @@ def login():
         user = User.query.filter_by(username=username).first()
         
         if user and verify_password(user.password_hash, password):
+            # Пересчитываем хэш, если изменились параметры алгоритма
+            if needs_rehash(user.password_hash):
+                try:
+                    user.password_hash = hash_password(password)
+                    db.session.commit()
+                except PasswordHashingBusy:
+                    pass
+            
+            rotate_session()
             session['user_id'] = user.id
             session['user_uid'] = user.uid
             session['username'] = user.username
@@ -168,77 +168,88 @@ def login():
     
     return render_template('register/login.html')
 
+# Все слоты хэширования паролей заняты
+@bp.app_errorhandler(PasswordHashingBusy)
+def password_hashing_busy(e):
+    flash('Сервер перегружен, попробуйте через минуту', 'error')
+    return redirect(request.path)
+
 # Выход
-@app.route('/logout')
+@bp.route('/logout')
 def logout():
+    if 'user_id' in session:
+        invalidate_user(session['user_id'])
     session.clear()
+    rotate_session()
     flash('Вы вышли из системы', 'info')
     return redirect('/')
 
+# Выход на всех устройствах
+@bp.route('/logout_all')
+def logout_all():
+    if 'user_id' not in session:
+        return redirect('/login')
+    
+    count = revoke_user_sessions(session['user_id'])
+    invalidate_user(session['user_id'])
+    session.clear()
+    rotate_session()
+    flash(f'Вы вышли из системы на всех устройствах (сессий: {count})', 'info')
+    return redirect('/login')
+
 # Профиль
-@app.route('/profile')
+@bp.route('/profile')
 def profile():
     if 'user_id' not in session:
         flash('Для доступа к профилю необходимо войти в систему', 'error')
         return redirect('/login')
     
-    user = User.query.get(session['user_id'])
+    user = current_user()
     if not user:
         session.clear()
         return redirect('/')
     
-    # Получаем объявления пользователя
-    user_items = Item.query.filter_by(user_id=user.id).order_by(Item.created_at.desc()).all()
+    # Получаем объявления пользователя (постранично)
+    user_items, next_cursor = paginate(
+        Item.cards_query().filter_by(user_id=user.id),
+        [(Item.created_at, True), (Item.id, True)],
+        request.args.get('cursor'),
+        get_page_size(request.args.get('page_size'))
+    )
     
-    # Получаем статистику
-    total_user_items = len(user_items)
-    active_user_items = sum(1 for item in user_items if item.status == 'active')
+    # Получаем статистику одним запросом
+    total_user_items, active_user_items = db.session.query(
+        db.func.count(Item.id),
+        db.func.coalesce(db.func.sum(db.case((Item.status == 'active', 1), else_=0)), 0)
+    ).filter(Item.user_id == user.id).one()
     
     return render_template('register/profile.html', 
                          user=user, 
                          items=user_items,
+                         next_cursor=next_cursor,
                          total_items=total_user_items,
                          active_items=active_user_items)
 
 # Создание объявления
-@app.route('/create', methods=['GET', 'POST'])
+@bp.route('/create', methods=['GET', 'POST'])
+@rate_limit('create')
 def create():
     if 'user_id' not in session:
         flash('Для создания объявления необходимо войти в систему', 'error')
         return redirect('/login')
     
     if request.method == 'POST':
-        item_type = request.form.get('item_type')
-        category = request.form.get('category')
-        title = request.form.get('title', '').strip()
-        description = request.form.get('description', '').strip()
-        city = request.form.get('city', '').strip()
-        location = request.form.get('location', '').strip()
-        date_str = request.form.get('date')
-        
-        # Контактная информация
-        contact_name = request.form.get('contact_name', '').strip()
-        contact_phone = request.form.get('contact_phone', '').strip()
-        contact_email = request.form.get('contact_email', '').strip()
-        
         # Валидация
-        if not title:
-            flash('Введите заголовок объявления', 'error')
+        fields, error = validate_item(request.form)
+        if error:
+            flash(error, 'error')
             return redirect('/create')
         
-        if not category:
-            flash('Выберите категорию', 'error')
-            return redirect('/create')
+        # Контактное лицо по умолчанию — автор
+        fields['contact_name'] = fields['contact_name'] or session['full_name']
         
-        if not city:
-            flash('Введите город', 'error')
-            return redirect('/create')
-        
-        # Преобразование даты
-        try:
-            date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        except:
-            date = datetime.now().date()+3
+        # Город из справочника (новый добавляется)
+        fields['city_id'], fields['city'] = resolve_city(fields['city'])
         
         # Создание объявления
         item_id = generate_item_id()
@@ -246,21 +257,16 @@ def create():
         new_item = Item(
             item_id=item_id,
             user_id=session['user_id'],
-            item_type=item_type,
-            category=category,
-            title=title,
-            description=description,
-            city=city,
-            location=location,
-            date=date,
-            contact_name=contact_name or session['full_name'],
-            contact_phone=contact_phone,
-            contact_email=contact_email
+            **fields
         )
         
         try:
             db.session.add(new_item)
             db.session.commit()
+            count_stats(**item_stats_delta(new_item))
+            count_events('new_items', [item_facets(new_item)])
+            apply_facets(item_facets(new_item))
+            apply_suggestions(item_suggestions(new_item))
             
             flash(f'✅ Объявление создано! ID: {item_id}', 'success')
             return redirect('/search')
@@ -274,63 +280,61 @@ def create():
     return render_template('create_ad/create.html')
 
 # Поиск объявлений
-@app.route('/search', methods=['GET', 'POST'])
+@bp.route('/search', methods=['GET', 'POST'])
+@rate_limit('search', param='search_query')
+@cache_page
 def search():
-    items = []
-    search_query = ''
-    category_filter = ''
-    city_filter = ''
+    # Параметры приходят из формы (POST) или из ссылки "Показать еще" (GET)
+    params = request.form if request.method == 'POST' else request.args
     
-    if request.method == 'POST':
-        search_query = request.form.get('search_query', '').strip()
-        category_filter = request.form.get('category', '')
-        city_filter = request.form.get('city', '')
-        item_type_filter = request.form.get('item_type', '')
-        
-        # Построение запроса
-        query = Item.query.filter_by(status='active')
-        
-        if search_query:
-            query = query.filter(
-                db.or_(
-                    Item.title.ilike(f'%{search_query}%'),
-                    Item.description.ilike(f'%{search_query}%'),
-                    Item.category.ilike(f'%{search_query}%')
-                )
-            )
-        
-        if category_filter and category_filter != 'all':
-            query = query.filter_by(category=category_filter)
-        
-        if city_filter and city_filter != 'all':
-            query = query.filter_by(city=city_filter)
-        
-        if item_type_filter and item_type_filter != 'all':
-            query = query.filter_by(item_type=item_type_filter)
-        
-        items = query.order_by(Item.created_at.desc()).all()
-    else:
-        # По умолчанию показываем последние 20 активных объявлений
-        items = Item.query.filter_by(status='active').order_by(Item.created_at.desc()).limit(20).all()
+    search_query = params.get('search_query', '').strip()
+    category_filter = params.get('category', '')
+    city_filter = params.get('city', '')
+    item_type_filter = params.get('item_type', '')
+    cursor = params.get('cursor')
+    page_size = get_page_size(params.get('page_size'))
     
-    # Получаем уникальные категории и города для фильтров
-    categories = db.session.query(Item.category).distinct().order_by(Item.category).all()
-    cities = db.session.query(Item.city).distinct().order_by(Item.city).all()
+    # Запрос по фильтрам (только колонки карточки)
+    query, order = filter_items(Item.cards_query().filter_by(status='active'),
+                                search_query, item_type_filter, category_filter, city_filter)
     
+    # Общее количество считаем в SQL, объекты загружаем только для страницы
+    total_count = query.order_by(None).count()
+    items, next_cursor = paginate(query, order, cursor, page_size)
+    
+    # Категории и города для фильтров (с количеством активных объявлений) — из памяти
     return render_template('search_item/search.html',
                          items=items,
+                         total_count=total_count,
+                         next_cursor=next_cursor,
                          search_query=search_query,
-                         categories=[c[0] for c in categories],
-                         cities=[c[0] for c in cities])
+                         filters={
+                             'item_type': item_type_filter or 'all',
+                             'category': category_filter or 'all',
+                             'city': city_filter or 'all'
+                         },
+                         categories=facet_options('category'),
+                         cities=facet_options('city'))
+
+# Подсказки для строки поиска (из памяти, без запросов к БД)
+@bp.route('/suggest')
+def suggestions():
+    query = request.args.get('q', '')
+    limit = min(get_page_size(request.args.get('limit'), SUGGEST_LIMIT), SUGGEST_LIMIT * 4)
+    return jsonify(query=query, suggestions=suggest(query, limit))
 
 # Просмотр объявления
-@app.route('/item/<string:item_id>')
+@bp.route('/item/<string:item_id>')
+@cache_page
 def view_item(item_id):
     item = Item.query.filter_by(item_id=item_id).first_or_404()
-    return render_template('search_item/contact.html', item=item)
+    # Закрытое объявление (и контакты в нем) видит только автор
+    if item.status != 'active' and item.user_id != session.get('user_id'):
+        abort(404)
+    return render_template('search_item/contact.html', item=item, matches=get_matches(item.id))
 
 # Удаление объявления
-@app.route('/delete_item/<string:item_id>')
+@bp.route('/delete_item/<string:item_id>')
 def delete_item(item_id):
     if 'user_id' not in session:
         flash('Необходимо войти в систему', 'error')
@@ -343,9 +347,18 @@ def delete_item(item_id):
         flash('У вас нет прав на удаление этого объявления', 'error')
         return redirect('/profile')
     
+    if item.status != 'active':
+        flash('Объявление уже закрыто', 'info')
+        return redirect('/profile')
+    
     try:
-        db.session.delete(item)
+        # Строка остается в items со статусом closed и позже уходит в архив
+        terms = item_suggestions(item)
+        facets = close_item(item, 'closed')
         db.session.commit()
+        count_closed('closed', facets)
+        apply_facets(facets, -1)
+        apply_suggestions(terms, -1)
         flash('✅ Объявление удалено', 'success')
     except Exception as e:
         db.session.rollback()
@@ -354,7 +367,7 @@ def delete_item(item_id):
     return redirect('/profile')
 
 # Отметить как найденное
-@app.route('/found_item/<string:item_id>')
+@bp.route('/found_item/<string:item_id>')
 def found_item(item_id):
     if 'user_id' not in session:
         flash('Необходимо войти в систему', 'error')
@@ -367,18 +380,21 @@ def found_item(item_id):
         flash('У вас нет прав на изменение этого объявления', 'error')
         return redirect(f'/item/{item_id}')
     
+    if item.status != 'active':
+        flash('Объявление уже закрыто', 'info')
+        return redirect('/profile')
+    
     try:
-        # 1. Получаем статистику платформы
-        stats = PlatformStats.get_current_stats()
-        
-        # 2. Увеличиваем счетчик найденных вещей через твой метод
-        stats.increment_found_items(db.session)
-        
-        # 3. Удаляем объявление
-        db.session.delete(item)
+        # Один коммит — статус; счетчики пишутся позже из буфера (counters.py)
+        terms = item_suggestions(item)
+        facets = close_item(item, 'returned')
         db.session.commit()
+        count_closed('returned', facets)
+        apply_facets(facets, -1)
+        apply_suggestions(terms, -1)
         
-        flash(f'✅ Объявление отмечено как найденное! Всего найдено вещей: {stats.found_items}', 'success')
+        found_total = (db.session.query(PlatformStats.found_items).scalar() or 0) + pending_stats('found_items')
+        flash(f'✅ Объявление отмечено как найденное! Всего найдено вещей: {found_total}', 'success')
         
     except Exception as e:
         db.session.rollback()
@@ -388,7 +404,7 @@ def found_item(item_id):
     return redirect('/profile')
 # ===== ИНИЦИАЛИЗАЦИЯ =====
 
-def init_db():
+def init_db(app):
     """Создание таблиц в БД"""
     with app.app_context():
         # Создаем все папки для шаблонов
@@ -406,6 +422,18 @@ def init_db():
         db.create_all()
         print("✅ База данных инициализирована")
         
+        # Справочник городов (нужен миграции city_id)
+        ensure_cities()
+        
+        # Обновляем схему существующего файла БД
+        applied = upgrade_database()
+        if applied:
+            print(f"✅ Применены миграции: {', '.join(map(str, applied))}")
+        
+        # Полнотекстовый индекс для поиска
+        if init_search_index():
+            print("✅ Полнотекстовый индекс готов")
+        
         # Создаем тестового пользователя (опционально)
         if User.query.count() == 0:
             test_user = User(
@@ -417,8 +445,141 @@ def init_db():
             db.session.add(test_user)
             db.session.commit()
             print("✅ Создан тестовый пользователь: admin / admin123")
+        
+        # Счетчики публичных идентификаторов
+        ensure_sequences()
+        
+        # Сверяем счетчики статистики с данными
+        update_platform_stats()
+        
+        # Подсказки поиска в памяти (процессы сервера получат копию при fork)
+        load_suggestions()
+        
+        # Временные ряды статистики (первый запуск на существующей БД)
+        if StatsRollup.query.first() is None:
+            rebuild_rollups()
+
+@bp.cli.command('reconcile-stats')
+def reconcile_stats_command():
+    """Пересчет статистики платформы (для запуска по расписанию)"""
+    stats = update_platform_stats()
+    print(f"✅ Статистика пересчитана: {stats}")
+
+@bp.cli.command('rebuild-rollups')
+def rebuild_rollups_command():
+    """Пересчет почасовой/посуточной статистики по данным"""
+    print(f"✅ Строк временных рядов: {rebuild_rollups()}")
+
+@bp.cli.command('match-items')
+def match_items_command():
+    """Подбор пар "потеряно — найдено" для новых объявлений"""
+    processed, found = run_matching(current_app.config['MATCH_BATCH_SIZE'])
+    print(f"✅ Обработано объявлений: {processed}, найдено пар: {found}")
+
+@bp.cli.command('archive-items')
+def archive_items_command():
+    """Закрытие устаревших и перенос закрытых объявлений в архив (для запуска по расписанию)"""
+    expired, archived = run_lifecycle(current_app.config)
+    print(f"✅ Закрыто устаревших: {expired}, перенесено в архив: {archived}")
+
+@bp.cli.command('expire-sessions')
+def expire_sessions_command():
+    """Удаление просроченных сессий (для запуска по расписанию)"""
+    print(f"✅ Удалено сессий: {expire_sessions(current_app.config['SESSION_CLEANUP_BATCH_SIZE'])}")
+
+@bp.cli.command('build-assets')
+def build_assets_command():
+    """Сборка статики: минификация, хэш в имени, сжатые копии, manifest.json"""
+    manifest = build_assets()
+    print(f"✅ Собрано статических файлов: {len(manifest)}")
+
+@bp.cli.command('check-query-plans')
+def check_query_plans_command():
+    """Проверка планов горячих запросов (EXPLAIN QUERY PLAN)"""
+    failed = 0
+    for name, plan, ok in check_query_plans():
+        print(f"{'✅' if ok else '❌'} {name}\n    {plan}")
+        failed += not ok
+    if failed:
+        raise SystemExit(1)
+
+@bp.cli.command('db-loadtest')
+@click.option('--workers', default='1,2,4,8', help='Количество процессов через запятую')
+@click.option('--duration', default=3.0, help='Длительность каждого прогона (секунды)')
+def db_loadtest_command(workers, duration):
+    """Нагрузочный тест чтения: пропускная способность в зависимости от числа процессов"""
+    worker_counts = [int(w) for w in workers.split(',')]
+    results = run_read_loadtest(db.engine.url.database, current_app.config['SQLITE_PRAGMAS'],
+                                worker_counts, duration)
+    for count, rate in results:
+        print(f"{count:>3} процессов: {rate:>10.0f} запросов/с")
+
+def _open_stream(path, mode):
+    if path == '-':
+        return nullcontext(sys.stdin if mode == 'r' else sys.stdout)
+    return open(path, mode, encoding='utf-8', newline='')
+
+def _print_progress(report):
+    print(f"   ... {report}", file=sys.stderr)
+
+def _after_import():
+    # Кэши этого процесса; остальные процессы подхватят изменения по TTL
+    invalidate_stats_cache()
+    invalidate_facets()
+
+@bp.cli.command('import-users')
+@click.argument('path')
+@click.option('--format', 'fmt', type=click.Choice(bulk.FORMATS), help='По умолчанию — по расширению файла')
+@click.option('--batch-size', default=bulk.BATCH_SIZE, help='Строк в одной транзакции')
+def import_users_command(path, fmt, batch_size):
+    """Массовый импорт пользователей из CSV/JSONL (PATH или - для stdin)"""
+    with _open_stream(path, 'r') as stream:
+        report = bulk.import_users(stream, bulk.detect_format(path, fmt), hash_passwords,
+                                   batch_size, _print_progress)
+    _after_import()
+    print(f"✅ Пользователи: {report}")
+    for error in report.errors:
+        print(f"   ⚠️ {error}")
+
+@bp.cli.command('import-items')
+@click.argument('path')
+@click.option('--format', 'fmt', type=click.Choice(bulk.FORMATS), help='По умолчанию — по расширению файла')
+@click.option('--batch-size', default=bulk.BATCH_SIZE, help='Строк в одной транзакции')
+@click.option('--owner', help='Имя пользователя-автора для строк без user_uid')
+def import_items_command(path, fmt, batch_size, owner):
+    """Массовый импорт объявлений из CSV/JSONL (PATH или - для stdin)"""
+    owner_user = None
+    if owner:
+        owner_user = User.query.filter_by(username=owner).first()
+        if not owner_user:
+            raise click.BadParameter(f'пользователь {owner} не найден', param_hint='--owner')
+    with _open_stream(path, 'r') as stream:
+        report = bulk.import_items(stream, bulk.detect_format(path, fmt),
+                                   owner_user, batch_size, _print_progress)
+    _after_import()
+    print(f"✅ Объявления: {report}")
+    for error in report.errors:
+        print(f"   ⚠️ {error}")
+
+@bp.cli.command('export-items')
+@click.argument('path')
+@click.option('--format', 'fmt', type=click.Choice(bulk.FORMATS), help='По умолчанию — по расширению файла')
+def export_items_command(path, fmt):
+    """Выгрузка всех объявлений в CSV/JSONL (PATH или - для stdout)"""
+    with _open_stream(path, 'w') as stream:
+        count, elapsed = bulk.export_items(stream, bulk.detect_format(path, fmt))
+    print(f"✅ Выгружено объявлений: {count}, {count / max(elapsed, 1e-9):.0f} строк/с", file=sys.stderr)
+
+@bp.cli.command('export-users')
+@click.argument('path')
+@click.option('--format', 'fmt', type=click.Choice(bulk.FORMATS), help='По умолчанию — по расширению файла')
+def export_users_command(path, fmt):
+    """Выгрузка всех пользователей в CSV/JSONL (PATH или - для stdout)"""
+    with _open_stream(path, 'w') as stream:
+        count, elapsed = bulk.export_users(stream, bulk.detect_format(path, fmt))
+    print(f"✅ Выгружено пользователей: {count}, {count / max(elapsed, 1e-9):.0f} строк/с", file=sys.stderr)
 
-@app.after_request
+@bp.after_app_request
 def add_header(response):
     # Предотвращаем кэширование для динамических страниц
     if 'Cache-Control' not in response.headers:
@@ -428,8 +589,5 @@ def add_header(response):
     return response
 
 if __name__ == '__main__':
-    init_db()
-    print("\n" + "="*60)
-    print("🚀 Сервер запущен: http://localhost:5000")
-    print("="*60 + "\n")
-    app.run(debug=0, host='0.0.0.0', port=5000)
\ No newline at end of file
+    from serve import main
+    main()
@@ -0,0 +1,196 @@
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import db, Item, ItemMatch, JobCursor, PlatformStats
+from search_index import normalize_text, stem_word
+
+# Подбор пар "потеряно — найдено".
+#
+# Новые объявления обрабатываются пачками по порядку id (номер последнего
+# обработанного хранится в job_cursors под именем 'matching'), поэтому
+# каждое сравнивается один раз, а не при каждом пересчете. Курсор опирается
+# на то, что id только растут (items объявлена с AUTOINCREMENT). Кандидаты —
+# активные объявления противоположного типа той же категории, созданные
+# не раньше MATCH_WINDOW_DAYS дней до него (диапазон по индексу
+# ix_items_status_category), не больше MATCH_CANDIDATES самых свежих.
+# Оценка — сумма с весами MATCH_WEIGHTS:
+#   text — косинусная близость TF-IDF заголовка и описания (IDF по
+#          объявлениям пачки и кандидатам той же категории),
+#   city — тот же город,
+#   date — близость дат потери/находки.
+# Порог MATCH_MIN_SCORE выше суммы весов city и date, поэтому пара без
+# общих слов не проходит и сравниваются только кандидаты с общими словами
+# (обратный индекс по кандидатам). Лучшие MATCH_TOP_K пар сохраняются
+# в item_matches для обоих объявлений.
+
+MATCH_WINDOW_DAYS = 60
+MATCH_CANDIDATES = 500
+MATCH_TOP_K = 10
+MATCH_MIN_SCORE = 0.45
+MATCH_WEIGHTS = {'text': 0.6, 'city': 0.25, 'date': 0.15}
+
+MATCH_CURSOR = 'matching'
+
+OPPOSITE_TYPE = {'lost': 'found', 'found': 'lost'}
+
+MATCH_COLUMNS = (Item.id, Item.user_id, Item.item_type, Item.category, Item.city_id,
+                 Item.date, Item.created_at, Item.title, Item.description)
+
+def _terms(row):
+    words = re.findall(r'\w+', normalize_text(f'{row.title} {row.description or ""}'))
+    return Counter(stem_word(word) for word in words if len(word) >= 3 and not word.isdigit())
+
+def _tfidf(documents):
+    """{id: Counter терминов} → {id: нормированный вектор TF-IDF}"""
+    df = Counter(term for terms in documents.values() for term in terms)
+    total = len(documents)
+    vectors = {}
+    for doc_id, terms in documents.items():
+        vector = {term: (1 + math.log(count)) * (math.log((1 + total) / (1 + df[term])) + 1)
+                  for term, count in terms.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vectors[doc_id] = {term: weight / norm for term, weight in vector.items()}
+    return vectors
+
+def score_pair(item, candidate, similarity):
+    """Оценка пары от 0 до 1"""
+    days = abs((item.date - candidate.date).days) if item.date and candidate.date else MATCH_WINDOW_DAYS
+    return (MATCH_WEIGHTS['text'] * similarity
+            + MATCH_WEIGHTS['city'] * (item.city_id is not None and item.city_id == candidate.city_id)
+            + MATCH_WEIGHTS['date'] * max(0.0, 1 - days / MATCH_WINDOW_DAYS))
+
+def _candidates(category, item_type, since):
+    return db.session.query(*MATCH_COLUMNS)\
+                     .filter(Item.status == 'active',
+                             Item.category == category,
+                             Item.created_at >= since,
+                             Item.item_type == item_type)\
+                     .order_by(Item.created_at.desc())\
+                     .limit(MATCH_CANDIDATES)\
+                     .all()
+
+def find_matches(items):
+    """Пары (id, id кандидата, оценка) для пачки новых объявлений"""
+    groups = defaultdict(list)
+    for item in items:
+        if item.item_type in OPPOSITE_TYPE:
+            groups[(item.category, OPPOSITE_TYPE[item.item_type])].append(item)
+
+    pairs = []
+    for (category, opposite), group in groups.items():
+        since = min(item.created_at for item in group) - timedelta(days=MATCH_WINDOW_DAYS)
+        candidates = _candidates(category, opposite, since)
+        if not candidates:
+            continue
+
+        vectors = _tfidf({row.id: _terms(row) for row in group + candidates})
+
+        # Обратный индекс кандидатов: сравниваем только объявления с общими словами
+        postings = defaultdict(list)
+        for candidate in candidates:
+            for term, weight in vectors[candidate.id].items():
+                postings[term].append((candidate, weight))
+
+        for item in group:
+            similarity = Counter()
+            by_id = {}
+            for term, weight in vectors[item.id].items():
+                for candidate, candidate_weight in postings.get(term, ()):
+                    similarity[candidate.id] += weight * candidate_weight
+                    by_id[candidate.id] = candidate
+            scored = []
+            for candidate_id, value in similarity.items():
+                candidate = by_id[candidate_id]
+                if candidate.user_id == item.user_id:
+                    continue
+                score = score_pair(item, candidate, value)
+                if score >= MATCH_MIN_SCORE:
+                    scored.append((score, candidate_id))
+            scored.sort(reverse=True)
+            pairs.extend((item.id, candidate_id, score) for score, candidate_id in scored[:MATCH_TOP_K])
+    return pairs
+
+def save_matches(pairs):
+    """Сохраняет пары в обе стороны и оставляет каждому объявлению MATCH_TOP_K лучших"""
+    if not pairs:
+        return
+    now = datetime.utcnow()
+    rows = {}
+    for item_id, match_id, score in pairs:
+        rows[(item_id, match_id)] = {'item_id': item_id, 'match_id': match_id, 'score': score, 'created_at': now}
+        rows[(match_id, item_id)] = {'item_id': match_id, 'match_id': item_id, 'score': score, 'created_at': now}
+
+    statement = sqlite_insert(ItemMatch)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[ItemMatch.item_id, ItemMatch.match_id],
+        set_={'score': statement.excluded.score}
+    ), list(rows.values()))
+
+    affected = sorted({item_id for item_id, _ in rows})
+    ranked = db.select(
+        ItemMatch.item_id, ItemMatch.match_id,
+        db.func.row_number().over(partition_by=ItemMatch.item_id,
+                                  order_by=ItemMatch.score.desc()).label('position')
+    ).where(ItemMatch.item_id.in_(affected)).subquery()
+    extra = db.select(ranked.c.item_id, ranked.c.match_id).where(ranked.c.position > MATCH_TOP_K)
+    db.session.execute(db.delete(ItemMatch).where(
+        db.tuple_(ItemMatch.item_id, ItemMatch.match_id).in_(extra)))
+    # Новая версия данных сбрасывает кэш страниц со списком пар во всех процессах
+    db.session.query(PlatformStats).update({PlatformStats.last_updated: now}, synchronize_session=False)
+
+def _get_cursor():
+    return db.session.query(JobCursor.last_id).filter_by(name=MATCH_CURSOR).scalar() or 0
+
+def _set_cursor(value):
+    statement = sqlite_insert(JobCursor).values(name=MATCH_CURSOR, last_id=value)
+    db.session.execute(statement.on_conflict_do_update(index_elements=[JobCursor.name],
+                                                       set_={'last_id': statement.excluded.last_id}))
+
+def run_matching(batch_size=200):
+    """Обрабатывает все новые объявления пачками, возвращает (объявлений, пар)"""
+    processed = found = 0
+    while True:
+        cursor = _get_cursor()
+        items = db.session.query(*MATCH_COLUMNS, Item.status)\
+                          .filter(Item.id > cursor)\
+                          .order_by(Item.id)\
+                          .limit(batch_size)\
+                          .all()
+        if not items:
+            break
+        pairs = find_matches([item for item in items if item.status == 'active'])
+        save_matches(pairs)
+        _set_cursor(items[-1].id)
+        db.session.commit()
+        processed += len(items)
+        found += len(pairs)
+    return processed, found
+
+def get_matches(item_id, limit=MATCH_TOP_K):
+    """Активные объявления-кандидаты для объявления (id строки), лучшие первыми"""
+    return db.session.query(Item.item_id, Item.item_type, Item.title, Item.city, Item.date,
+                            ItemMatch.score)\
+                     .join(ItemMatch, ItemMatch.match_id == Item.id)\
+                     .filter(ItemMatch.item_id == item_id, Item.status == 'active')\
+                     .order_by(ItemMatch.score.desc())\
+                     .limit(limit)\
+                     .all()
+
+def start_matcher(app, interval):
+    """Фоновый подбор пар для новых объявлений (один на сервер)"""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                with app.app_context():
+                    run_matching(app.config['MATCH_BATCH_SIZE'])
+            except Exception as e:
+                print(f"Ошибка подбора пар: {e}")
+
+    thread = threading.Thread(target=run, name='item-matcher', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from flask import g, request, current_app, has_app_context, before_render_template, template_rendered, Response, abort
+from sqlalchemy import event
+from models import db
+
+# Инструментирование запросов: время обработки, число и время SQL-запросов
+# (события SQLAlchemy), время рендера шаблонов, поиск N+1 (один и тот же
+# запрос много раз за обработку). Счетчики копятся в памяти процесса и
+# отдаются в формате Prometheus на /metrics. Счетчики не объединяются между
+# процессами: под serve.py каждый ответ /metrics — это только тот процесс,
+# который принял запрос (метка worker — его pid). Серии одного процесса
+# монотонны, поэтому считайте rate()/increase() по каждой и суммируйте
+# by (worker); значение из одного ответа — лишь доля общего трафика.
+# Заголовок Server-Timing — по настройке SERVER_TIMING.
+#
+# Доступ: с METRICS_TOKEN — по заголовку Authorization: Bearer <токен>,
+# без него — только с локального адреса.
+
+LOCAL_ADDRESSES = {'127.0.0.1', '::1'}
+
+# Границы корзин гистограммы времени ответа (секунды)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_metrics_lock = threading.Lock()
+_requests = Counter()                                  # (endpoint, method, status) → n
+_durations = defaultdict(lambda: [0] * (len(DURATION_BUCKETS) + 1))  # endpoint → корзины
+_duration_sum = Counter()                              # endpoint → секунды
+_sql_count = Counter()                                 # endpoint → запросов
+_sql_time = Counter()                                  # endpoint → секунды
+_template_time = Counter()                             # endpoint → секунды
+_n_plus_one = Counter()                                # endpoint → случаев
+_n_plus_one_reported = set()
+
+def init_metrics(app):
+    """Подключает сбор метрик к приложению и его движку БД"""
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+def _tracking():
+    return has_app_context() and 'metrics_started_at' in g
+
+def _start_request():
+    g.metrics_started_at = time.perf_counter()
+    g.metrics_sql_count = 0
+    g.metrics_sql_time = 0.0
+    g.metrics_statements = Counter()
+    g.metrics_template_time = 0.0
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _tracking():
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not _tracking() or not conn.info.get('metrics_query_start'):
+        return
+    g.metrics_sql_time += time.perf_counter() - conn.info['metrics_query_start'].pop()
+    g.metrics_sql_count += 1
+    g.metrics_statements[statement] += 1
+
+def _before_render(sender, template, context, **extra):
+    if _tracking():
+        g.metrics_template_started_at = time.perf_counter()
+
+def _after_render(sender, template, context, **extra):
+    if _tracking() and 'metrics_template_started_at' in g:
+        g.metrics_template_time += time.perf_counter() - g.pop('metrics_template_started_at')
+
+def _finish_request(response):
+    if not _tracking():
+        return response
+
+    duration = time.perf_counter() - g.metrics_started_at
+    endpoint = request.endpoint or 'unknown'
+    threshold = current_app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+    repeated = [statement for statement, count in g.metrics_statements.items() if count >= threshold]
+
+    with _metrics_lock:
+        _requests[(endpoint, request.method, response.status_code)] += 1
+        buckets = _durations[endpoint]
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                buckets[i] += 1
+                break
+        else:
+            buckets[-1] += 1
+        _duration_sum[endpoint] += duration
+        _sql_count[endpoint] += g.metrics_sql_count
+        _sql_time[endpoint] += g.metrics_sql_time
+        _template_time[endpoint] += g.metrics_template_time
+        if repeated:
+            _n_plus_one[endpoint] += 1
+            new_reports = [(endpoint, s) for s in repeated if (endpoint, s) not in _n_plus_one_reported]
+            _n_plus_one_reported.update(new_reports)
+        else:
+            new_reports = []
+
+    for _, statement in new_reports:
+        print(f"⚠️ Возможный N+1 в {endpoint}: {g.metrics_statements[statement]} раз\n    {statement[:200]}")
+
+    if current_app.config.get('SERVER_TIMING'):
+        response.headers['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={g.metrics_sql_time * 1000:.1f};desc="{g.metrics_sql_count} queries", '
+            f'tpl;dur={g.metrics_template_time * 1000:.1f}'
+        )
+    return response
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+def _sample(name, labels, value):
+    label_text = ','.join(f'{key}="{_label(val)}"' for key, val in [('worker', os.getpid())] + labels)
+    return f'{name}{{{label_text}}} {value}'
+
+def render_metrics():
+    """Текст метрик в формате Prometheus"""
+    lines = [f'# Метрики процесса {os.getpid()} (без других процессов сервера)']
+
+    def header(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    with _metrics_lock:
+        header('http_requests_total', 'counter', 'Обработано запросов')
+        for (endpoint, method, status), count in sorted(_requests.items()):
+            lines.append(_sample('http_requests_total',
+                                 [('endpoint', endpoint), ('method', method), ('status', status)], count))
+
+        header('http_request_duration_seconds', 'histogram', 'Время обработки запроса')
+        for endpoint, buckets in sorted(_durations.items()):
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + ('+Inf',), buckets):
+                cumulative += count
+                lines.append(_sample('http_request_duration_seconds_bucket',
+                                     [('endpoint', endpoint), ('le', bound)], cumulative))
+            lines.append(_sample('http_request_duration_seconds_sum',
+                                 [('endpoint', endpoint)], f'{_duration_sum[endpoint]:.6f}'))
+            lines.append(_sample('http_request_duration_seconds_count',
+                                 [('endpoint', endpoint)], cumulative))
+
+        for name, help_text, values in [
+            ('db_queries_total', 'SQL-запросов', _sql_count),
+            ('db_query_seconds_total', 'Время SQL-запросов', _sql_time),
+            ('template_render_seconds_total', 'Время рендера шаблонов', _template_time),
+            ('n_plus_one_requests_total', 'Запросов с повторяющимся SQL (возможный N+1)', _n_plus_one),
+        ]:
+            header(name, 'counter', help_text)
+            for endpoint, value in sorted(values.items()):
+                lines.append(_sample(name, [('endpoint', endpoint)],
+                                     f'{value:.6f}' if isinstance(value, float) else value))
+
+    return '\n'.join(lines) + '\n'
+
+def metrics_view():
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            abort(403)
+    elif request.remote_addr not in LOCAL_ADDRESSES:
+        abort(403)
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
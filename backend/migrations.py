@@ -0,0 +1,151 @@
+from sqlalchemy.schema import CreateTable
+from models import db, Item
+from cities import backfill_city_ids
+
+# Миграции схемы для уже существующих файлов БД.
+# db.create_all() создает только отсутствующие таблицы и не меняет
+# существующие, поэтому изменения схемы добавляются сюда по порядку.
+# Номер последней примененной миграции хранится в PRAGMA user_version.
+# Каждая миграция — список SQL-команд или функций, принимающих соединение.
+
+def add_column(table, column, ddl):
+    """Шаг миграции: ALTER TABLE ADD COLUMN, если колонки еще нет
+    (в новой БД ее уже создал db.create_all())"""
+    def step(connection):
+        columns = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    return step
+
+def autoincrement_items(connection):
+    """Шаг миграции: пересоздает items с AUTOINCREMENT (без него SQLite отдает
+    новому объявлению id последнего перенесенного в архив) и поднимает
+    счетчик выше всех id в items и items_archive"""
+    sql = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'items'").scalar()
+    if 'AUTOINCREMENT' not in sql.upper():
+        # Индексы и триггеры (FTS) удаляются вместе с таблицей — создаем заново
+        extras = [row[0] for row in connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'items' AND type IN ('index', 'trigger') AND sql IS NOT NULL")]
+        existing = {row[1] for row in connection.exec_driver_sql("PRAGMA table_info(items)")}
+        columns = ', '.join(column.name for column in Item.__table__.columns if column.name in existing)
+
+        create = str(CreateTable(Item.__table__).compile(connection))
+        connection.exec_driver_sql(create.replace('CREATE TABLE items ', 'CREATE TABLE items_new ', 1))
+        connection.exec_driver_sql(f"INSERT INTO items_new ({columns}) SELECT {columns} FROM items")
+        connection.exec_driver_sql("DROP TABLE items")
+        connection.exec_driver_sql("ALTER TABLE items_new RENAME TO items")
+        for statement in extras:
+            connection.exec_driver_sql(statement)
+
+    top = connection.exec_driver_sql(
+        "SELECT MAX(COALESCE((SELECT MAX(id) FROM items), 0), COALESCE((SELECT MAX(id) FROM items_archive), 0))"
+    ).scalar()
+    connection.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = 'items'")
+    connection.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES ('items', ?)", (top,))
+
+MIGRATIONS = [
+    # 1. Индексы для горячих запросов
+    [
+        "CREATE INDEX IF NOT EXISTS ix_users_created_at ON users (created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_items_status_created_at ON items (status, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_items_status_category ON items (status, category, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_items_status_city ON items (status, city, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_items_status_item_type ON items (status, item_type, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_items_user_id_created_at ON items (user_id, created_at)",
+        "ANALYZE",
+    ],
+    # 2. Жизненный цикл объявлений: время закрытия для архивации
+    [
+        add_column('items', 'closed_at', 'DATETIME'),
+        "UPDATE items SET closed_at = created_at WHERE status != 'active' AND closed_at IS NULL",
+        "CREATE INDEX IF NOT EXISTS ix_items_status_closed_at ON items (status, closed_at)",
+    ],
+    # 3. Справочник городов: city_id вместо сравнения строк
+    [
+        add_column('items', 'city_id', 'INTEGER REFERENCES cities (id)'),
+        add_column('items_archive', 'city_id', 'INTEGER'),
+        backfill_city_ids,
+        "DROP INDEX IF EXISTS ix_items_status_city",
+        "CREATE INDEX IF NOT EXISTS ix_items_status_city_id ON items (status, city_id, created_at)",
+        "ANALYZE",
+    ],
+    # 4. Курсор подбора пар — в job_cursors, а не среди счетчиков идентификаторов
+    [
+        "INSERT OR IGNORE INTO job_cursors (name, last_id) "
+        "SELECT name, next_value FROM id_sequences WHERE name = 'matching'",
+        "DELETE FROM id_sequences WHERE name = 'matching'",
+    ],
+    # 5. id объявлений не переиспользуются после архивации
+    [
+        autoincrement_items,
+    ],
+]
+
+# Ожидаемые планы запросов: (описание, запрос, индекс, который должен использоваться)
+QUERY_PLAN_CHECKS = [
+    ('Лента активных объявлений',
+     "SELECT id FROM items WHERE status = 'active' ORDER BY created_at DESC, id DESC LIMIT 20",
+     'ix_items_status_created_at'),
+    ('Поиск по категории',
+     "SELECT id FROM items WHERE status = 'active' AND category = 'x' ORDER BY created_at DESC, id DESC LIMIT 20",
+     'ix_items_status_category'),
+    ('Поиск по городу',
+     "SELECT id FROM items WHERE status = 'active' AND city_id = 1 ORDER BY created_at DESC, id DESC LIMIT 20",
+     'ix_items_status_city_id'),
+    ('Поиск по типу',
+     "SELECT id FROM items WHERE status = 'active' AND item_type = 'lost' ORDER BY created_at DESC, id DESC LIMIT 20",
+     'ix_items_status_item_type'),
+    ('Объявления пользователя',
+     "SELECT id FROM items WHERE user_id = 1 ORDER BY created_at DESC, id DESC LIMIT 20",
+     'ix_items_user_id_created_at'),
+    ('Архивация закрытых объявлений',
+     "SELECT id FROM items WHERE status = 'closed' AND closed_at < '2000-01-01' LIMIT 500",
+     'ix_items_status_closed_at'),
+    ('Статистика по категориям',
+     "SELECT category, COUNT(id) FROM items WHERE status = 'active' GROUP BY category",
+     'ix_items_status_category'),
+    ('Статистика по городам',
+     "SELECT city_id, COUNT(id) FROM items WHERE status = 'active' GROUP BY city_id",
+     'ix_items_status_city_id'),
+]
+
+def get_schema_version(connection):
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+def upgrade_database():
+    """Применяет недостающие миграции, возвращает номера примененных"""
+    if db.engine.dialect.name != 'sqlite':
+        return []
+
+    applied = []
+    with db.engine.connect() as connection:
+        current = get_schema_version(connection)
+
+    for version, steps in enumerate(MIGRATIONS, start=1):
+        if version <= current:
+            continue
+        # Каждая миграция — отдельная транзакция вместе с номером версии
+        with db.engine.begin() as connection:
+            for step in steps:
+                if callable(step):
+                    step(connection)
+                else:
+                    connection.exec_driver_sql(step)
+            connection.exec_driver_sql(f"PRAGMA user_version = {version}")
+        applied.append(version)
+    return applied
+
+def check_query_plans():
+    """Проверяет через EXPLAIN QUERY PLAN, что горячие запросы идут по индексам.
+
+    Возвращает список (описание, план, ok). Запрос считается плохим, если
+    индекс не используется или для сортировки нужен временный B-tree.
+    """
+    results = []
+    with db.engine.connect() as connection:
+        for name, sql, index_name in QUERY_PLAN_CHECKS:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+            plan = '\n'.join(row[-1] for row in rows)
+            ok = index_name in plan and 'TEMP B-TREE' not in plan
+            results.append((name, plan, ok))
+    return results
@@ -1,21 +1,30 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from collections import Counter
 from datetime import datetime
 
 db = SQLAlchemy()
 
+# Периоды агрегации статистики и формат начала периода (bucket в stats_rollups)
+ROLLUP_PERIODS = {'hour': '%Y-%m-%d %H:00', 'day': '%Y-%m-%d'}
+
 class User(db.Model):
     """Модель пользователя"""
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_created_at', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    uid = db.Column(db.String(10), unique=True, nullable=False)
+    uid = db.Column(db.String(20), unique=True, nullable=False)
     username = db.Column(db.String(50), unique=True, nullable=False)
     full_name = db.Column(db.String(100), nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(256), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    # Связь с объявлениями
-    items = db.relationship('Item', backref='author', lazy=True)
+    # Связь с объявлениями (запрос, а не список: объявления пользователя
+    # читаются постранично через Item.cards_query)
+    items = db.relationship('Item', backref='author', lazy='dynamic')
     
     def __repr__(self):
         return f'<User {self.username} ({self.full_name})>'
@@ -23,9 +32,24 @@ class User(db.Model):
 class Item(db.Model):
     """Модель объявления (потерянной/найденной вещи)"""
     __tablename__ = 'items'
+    __table_args__ = (
+        # Лента активных объявлений: WHERE status = ? ORDER BY created_at DESC
+        db.Index('ix_items_status_created_at', 'status', 'created_at'),
+        # Фильтры поиска и группировки по категории/городу/типу среди активных
+        db.Index('ix_items_status_category', 'status', 'category', 'created_at'),
+        db.Index('ix_items_status_city_id', 'status', 'city_id', 'created_at'),
+        db.Index('ix_items_status_item_type', 'status', 'item_type', 'created_at'),
+        # Объявления пользователя в профиле
+        db.Index('ix_items_user_id_created_at', 'user_id', 'created_at'),
+        # Архивация закрытых объявлений: WHERE status = ? AND closed_at < ?
+        db.Index('ix_items_status_closed_at', 'status', 'closed_at'),
+        # id не повторяется после архивации последних строк: он переходит
+        # в items_archive и служит курсором подбора пар
+        {'sqlite_autoincrement': True},
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    item_id = db.Column(db.String(10), unique=True, nullable=False)
+    item_id = db.Column(db.String(20), unique=True, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
     # Основная информация
@@ -35,7 +59,8 @@ class Item(db.Model):
     description = db.Column(db.Text)
     
     # Место и время
-    city = db.Column(db.String(100), nullable=False)
+    city = db.Column(db.String(100), nullable=False)  # название из справочника
+    city_id = db.Column(db.Integer, db.ForeignKey('cities.id'))
     location = db.Column(db.String(200))  # конкретное место
     date = db.Column(db.Date, nullable=False)
     
@@ -47,9 +72,191 @@ class Item(db.Model):
     # Технические поля
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default='active')  # active, closed, returned
+    closed_at = db.Column(db.DateTime)  # когда объявление перестало быть активным
     
     def __repr__(self):
         return f'<Item {self.item_id}: {self.title}>'
+    
+    @classmethod
+    def cards_query(cls, description_length=200):
+        """Запрос легких строк для карточек в списках (главная, поиск, профиль).
+
+        Без контактов и полного описания: description обрезается в SQL до
+        description_length + 1 символов (шаблону хватает, чтобы решить,
+        ставить ли многоточие). Полная строка читается только в view_item.
+        """
+        return db.session.query(
+            cls.id, cls.item_id, cls.user_id, cls.item_type, cls.category, cls.title,
+            db.func.substr(cls.description, 1, description_length + 1).label('description'),
+            cls.city, cls.location, cls.date, cls.created_at, cls.status
+        )
+
+class City(db.Model):
+    """Город из справочника (поиск по написанию — в cities.py)"""
+    __tablename__ = 'cities'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)             # как показывать
+    key = db.Column(db.String(100), unique=True, nullable=False)  # нормализованное название
+    
+    def __repr__(self):
+        return f'<City {self.id}: {self.name}>'
+
+class CityAlias(db.Model):
+    """Другое написание города (сокращение, опечатка), нормализованное"""
+    __tablename__ = 'city_aliases'
+    
+    key = db.Column(db.String(100), primary_key=True)
+    city_id = db.Column(db.Integer, db.ForeignKey('cities.id'), nullable=False)
+    
+    def __repr__(self):
+        return f'<CityAlias {self.key} → {self.city_id}>'
+
+class ItemMatch(db.Model):
+    """Возможная пара "потеряно — найдено" (см. matching.py), хранится в обе стороны"""
+    __tablename__ = 'item_matches'
+    __table_args__ = (
+        db.Index('ix_item_matches_item_id_score', 'item_id', 'score'),
+        db.Index('ix_item_matches_match_id', 'match_id'),
+    )
+    
+    item_id = db.Column(db.Integer, db.ForeignKey('items.id'), primary_key=True)
+    match_id = db.Column(db.Integer, db.ForeignKey('items.id'), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ItemMatch {self.item_id} ↔ {self.match_id}: {self.score:.2f}>'
+
+class ArchivedItem(db.Model):
+    """Закрытые и возвращенные объявления, перенесенные из items (см. lifecycle.py)"""
+    __tablename__ = 'items_archive'
+    __table_args__ = (
+        db.Index('ix_items_archive_closed_at', 'closed_at'),
+        db.Index('ix_items_archive_user_id', 'user_id'),
+    )
+    
+    # id сохраняется из items, поэтому без автоинкремента
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    item_id = db.Column(db.String(20), unique=True, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    item_type = db.Column(db.String(10), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    city = db.Column(db.String(100), nullable=False)
+    city_id = db.Column(db.Integer)
+    location = db.Column(db.String(200))
+    date = db.Column(db.Date, nullable=False)
+    contact_name = db.Column(db.String(100))
+    contact_phone = db.Column(db.String(20))
+    contact_email = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime)
+    status = db.Column(db.String(20), nullable=False)
+    closed_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ArchivedItem {self.item_id}: {self.status}>'
+
+class StatsRollup(db.Model):
+    """Почасовые и посуточные счетчики событий для графиков (запросы — в Utilts.py)"""
+    __tablename__ = 'stats_rollups'
+    
+    metric = db.Column(db.String(20), primary_key=True)     # new_users, new_items, found_items
+    dimension = db.Column(db.String(20), primary_key=True)  # '' (итог), item_type, category, city
+    value = db.Column(db.String(100), primary_key=True)     # значение измерения ('' для итога)
+    period = db.Column(db.String(4), primary_key=True)      # hour, day
+    bucket = db.Column(db.String(16), primary_key=True)     # начало периода по ROLLUP_PERIODS
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<StatsRollup {self.metric} {self.dimension}={self.value} {self.bucket}: {self.count}>'
+    
+    @staticmethod
+    def count_events(events):
+        """Counter {(измерение, значение): число событий}, итог — ('', '')"""
+        counts = Counter()
+        for dimensions in events:
+            counts[('', '')] += 1
+            for dimension, value in dimensions.items():
+                if value:
+                    counts[(dimension, str(value))] += 1
+        return counts
+    
+    @classmethod
+    def add(cls, db_session, metric, events, when=None):
+        """Учитывает события (count = count + n) в текущей транзакции.
+
+        events — список словарей измерений, по одному на событие, например
+        [{'item_type': 'lost', 'category': 'Ключи', 'city': 'Москва'}];
+        для событий без измерений — [{}] * n. Коммит делает вызывающий код.
+        """
+        cls.add_counts(db_session, metric, cls.count_events(events), when)
+    
+    @classmethod
+    def add_counts(cls, db_session, metric, counts, when=None):
+        """Как add(), но с уже подсчитанными событиями (см. count_events)"""
+        when = when or datetime.utcnow()
+        rows = [{'metric': metric, 'dimension': dimension, 'value': value,
+                 'period': period, 'bucket': when.strftime(fmt), 'count': count}
+                for period, fmt in ROLLUP_PERIODS.items()
+                for (dimension, value), count in counts.items()]
+        
+        # Один INSERT ... ON CONFLICT DO UPDATE на все строки
+        statement = sqlite_insert(cls)
+        db_session.execute(statement.on_conflict_do_update(
+            index_elements=[cls.metric, cls.dimension, cls.value, cls.period, cls.bucket],
+            set_={'count': cls.count + statement.excluded.count}
+        ), rows)
+
+class IdSequence(db.Model):
+    """Счетчики для публичных идентификаторов (USR-..., ITEM-...)"""
+    __tablename__ = 'id_sequences'
+    
+    name = db.Column(db.String(20), primary_key=True)
+    next_value = db.Column(db.Integer, nullable=False, default=1)
+    
+    def __repr__(self):
+        return f'<IdSequence {self.name}: {self.next_value}>'
+
+class JobCursor(db.Model):
+    """Докуда фоновая задача обработала строки (id последней), например подбор пар"""
+    __tablename__ = 'job_cursors'
+    
+    name = db.Column(db.String(20), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<JobCursor {self.name}: {self.last_id}>'
+
+class UserSession(db.Model):
+    """Сессии на сервере: в cookie только id (см. sessions.py)"""
+    __tablename__ = 'sessions'
+    
+    id = db.Column(db.String(64), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)  # для выхода на всех устройствах
+    data = db.Column(db.Text, nullable=False)                               # данные сессии (JSON)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<UserSession {self.id[:8]}…: user {self.user_id}>'
+
+class RateLimitBucket(db.Model):
+    """Корзины ограничения частоты запросов (см. rate_limits.py)"""
+    __tablename__ = 'rate_limit_buckets'
+    __table_args__ = (
+        # Удаление давно не использованных корзин
+        db.Index('ix_rate_limit_buckets_updated_at', 'updated_at'),
+    )
+    
+    key = db.Column(db.String(120), primary_key=True)  # маршрут:user:id или маршрут:ip:адрес
+    tokens = db.Column(db.Float, nullable=False)        # жетонов после последнего запроса
+    updated_at = db.Column(db.Float, nullable=False)    # время последнего запроса (Unix)
+    allowed = db.Column(db.Boolean, nullable=False, default=True)  # последний запрос разрешен
+    
+    def __repr__(self):
+        return f'<RateLimitBucket {self.key}: {self.tokens:.2f}>'
 
 class PlatformStats(db.Model):
     """Модель для хранения статистики платформы"""
@@ -75,24 +282,42 @@ class PlatformStats(db.Model):
         return f'<PlatformStats: {self.total_users} users, {self.active_items} active items>'
     
     def update_stats(self, db_session, Item, User):
-        """Обновление статистики на основе текущих данных в БД"""
+        """Сверка статистики с текущими данными в БД (полный пересчет).
+
+        Объявления за все время — это items вместе с архивом items_archive.
+        """
+        def count(**filters):
+            return Item.query.filter_by(**filters).count() + ArchivedItem.query.filter_by(**filters).count()
+        
         self.total_users = User.query.count()
         self.active_items = Item.query.filter_by(status='active').count()
-        self.found_items = Item.query.filter_by(status='returned').count()
-        self.total_items = Item.query.count()
-        self.lost_items = Item.query.filter_by(item_type='lost').count()
-        self.found_items_reported = Item.query.filter_by(item_type='found').count()
+        self.total_items = count()
+        self.lost_items = count(item_type='lost')
+        self.found_items_reported = count(item_type='found')
+        self.found_items = count(status='returned')
         self.last_updated = datetime.utcnow()
         
         db_session.add(self)
         db_session.commit()
     
-    def increment_found_items(self, db_session):
-        """Увеличивает счетчик найденных вещей (при нажатии кнопки)"""
-        self.found_items += 1
-        self.last_updated = datetime.utcnow()
-        db_session.add(self)
-        db_session.commit()
+    @classmethod
+    def apply_delta(cls, db_session, **deltas):
+        """Атомарно изменяет счетчики (UPDATE ... SET x = x + n) в текущей транзакции.
+
+        Коммит делает вызывающий код вместе с основным изменением данных.
+        """
+        values = {getattr(cls, name): getattr(cls, name) + delta
+                  for name, delta in deltas.items() if delta}
+        if not values:
+            return
+        values[cls.last_updated] = datetime.utcnow()
+        
+        if db_session.query(cls).update(values, synchronize_session=False) == 0:
+            # Записи статистики еще нет — создаем и повторяем
+            db_session.add(cls(total_users=0, active_items=0, found_items=0, total_items=0,
+                               lost_items=0, found_items_reported=0))
+            db_session.flush()
+            db_session.query(cls).update(values, synchronize_session=False)
     
     @classmethod
     def get_current_stats(cls):
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, session, make_response
+from models import db, PlatformStats
+
+# Кэш отрендеренных страниц в памяти процесса (LRU с TTL).
+#
+# Ключ — путь с параметрами и зритель (аноним или id пользователя).
+# Версия данных — PlatformStats.last_updated: ее меняет apply_delta() при
+# записи счетчиков после создания/удаления/отметки объявления (из буфера
+# counters.py — в течение COUNTER_FLUSH_INTERVAL; процесс, где была запись,
+# сбрасывает свой кэш сразу), а также save_matches() при записи новых пар,
+# поэтому любая запись сбрасывает кэш во всех процессах. Из этой же версии и тела страницы
+# строятся Last-Modified и ETag для условных GET (ответ 304).
+
+PAGE_CACHE_TTL = 300
+PAGE_CACHE_MAX_ENTRIES = 256
+
+_pages = OrderedDict()
+_pages_lock = threading.Lock()
+
+def content_version():
+    """Момент последнего изменения данных платформы"""
+    return db.session.query(PlatformStats.last_updated).scalar()
+
+def _viewer_key():
+    return session.get('user_id') or 'anon'
+
+def _get_page(key, version):
+    with _pages_lock:
+        entry = _pages.get(key)
+        if entry is None:
+            return None
+        if entry['version'] != version or time.monotonic() > entry['expires_at']:
+            del _pages[key]
+            return None
+        _pages.move_to_end(key)
+        return entry
+
+def _put_page(key, entry):
+    with _pages_lock:
+        _pages[key] = entry
+        _pages.move_to_end(key)
+        while len(_pages) > PAGE_CACHE_MAX_ENTRIES:
+            _pages.popitem(last=False)
+
+def clear_page_cache():
+    with _pages_lock:
+        _pages.clear()
+
+def cache_page(view):
+    """Кэширует GET-страницу и отвечает 304, если у клиента актуальная копия.
+
+    Страницы с непоказанными flash-сообщениями не кэшируются: шаблон
+    должен их вывести (и тем самым удалить из сессии).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != 'GET' or '_flashes' in session:
+            return view(*args, **kwargs)
+
+        viewer = _viewer_key()
+        key = (request.full_path, viewer)
+        version = content_version()
+
+        entry = _get_page(key, version)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            response.add_etag()
+            entry = {
+                'body': response.get_data(),
+                'mimetype': response.mimetype,
+                'etag': response.get_etag()[0],
+                'version': version,
+                'expires_at': time.monotonic() + PAGE_CACHE_TTL
+            }
+            _put_page(key, entry)
+        else:
+            response = make_response(entry['body'])
+            response.mimetype = entry['mimetype']
+            response.set_etag(entry['etag'])
+
+        if version:
+            response.last_modified = version
+        # Браузер и прокси могут хранить копию, но обязаны ее перепроверять
+        response.headers['Cache-Control'] = ('public' if viewer == 'anon' else 'private') + ', no-cache'
+        response.vary.add('Cookie')
+        return response.make_conditional(request)
+
+    return wrapper
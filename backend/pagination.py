@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime
+from models import db
+
+# Курсорная (keyset) пагинация: вместо OFFSET запоминаем ключ сортировки
+# последней строки страницы и продолжаем выборку строго после него.
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def get_page_size(value, default=PAGE_SIZE):
+    """Размер страницы из параметра запроса, ограниченный MAX_PAGE_SIZE"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+def encode_cursor(values):
+    """Кодирует ключ сортировки последней строки в строку для URL/формы"""
+    payload = [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Декодирует курсор; при любой ошибке возвращает None (первая страница)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return [datetime.fromisoformat(v['dt']) if isinstance(v, dict) else v for v in payload]
+    except (ValueError, TypeError, KeyError):
+        return None
+
+def keyset_condition(order, values):
+    """Условие "строка идет после курсора" для составного ключа сортировки.
+
+    order — список пар (колонка, по убыванию), values — значения из курсора.
+    """
+    conditions = []
+    for i, (column, descending) in enumerate(order):
+        previous = [c == v for (c, _), v in zip(order[:i], values[:i])]
+        step = column < values[i] if descending else column > values[i]
+        conditions.append(db.and_(*previous, step))
+    return db.or_(*conditions)
+
+def paginate(query, order, cursor=None, page_size=PAGE_SIZE):
+    """Возвращает (строки страницы, курсор следующей страницы или None).
+
+    Колонки ключа добавляются в выборку, чтобы собрать курсор, не обращаясь
+    к атрибутам объектов; читается на одну строку больше, чтобы узнать,
+    есть ли следующая страница. Запрос может выбирать модель (строки —
+    объекты) или набор колонок (строки — Row с доступом по имени).
+    """
+    values = decode_cursor(cursor)
+    if values is not None and len(values) == len(order):
+        query = query.filter(keyset_condition(order, values))
+
+    width = len(query.column_descriptions)
+    query = query.add_columns(*[column.label(f'cursor_{i}') for i, (column, _) in enumerate(order)])\
+                 .order_by(None)\
+                 .order_by(*[column.desc() if descending else column.asc()
+                             for column, descending in order])
+    rows = query.limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(list(rows[-1][width:]))
+
+    if width == 1:
+        return [row[0] for row in rows], next_cursor
+    return rows, next_cursor
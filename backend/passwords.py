@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import threading
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Хэширование паролей в отдельных процессах.
+#
+# generate/check_password_hash специально медленные (сотни мс CPU). В пуле
+# процессов они не держат GIL потоков сервера, а число одновременных задач
+# ограничено PASSWORD_QUEUE_LIMIT: если слот не освободился за
+# PASSWORD_TIMEOUT секунд, бросается PasswordHashingBusy и маршрут отвечает
+# "попробуйте позже", а не копит очередь. PASSWORD_WORKERS=0 — считать в
+# текущем процессе (разработка, Windows без пула).
+#
+# Пул и лимит очереди свои у каждого процесса сервера (serve.py): всего
+# WEB_WORKERS * PASSWORD_WORKERS процессов хэширования и до
+# WEB_WORKERS * PASSWORD_QUEUE_LIMIT задач. По умолчанию PASSWORD_WORKERS —
+# число ядер, а serve.py делит их между процессами сервера (ядра // WEB_WORKERS,
+# не меньше 1); flask CLI (массовый импорт, hash_passwords) получает все ядра.
+#
+# Параметры алгоритма — PASSWORD_METHOD (формат werkzeug, например
+# scrypt:32768:8:1 или pbkdf2:sha256:600000). Хэши со старыми параметрами
+# пересчитываются при успешном входе (needs_rehash).
+
+class PasswordHashingBusy(Exception):
+    """Все слоты хэширования заняты дольше PASSWORD_TIMEOUT"""
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+def _reset_pool():
+    # Пул родителя после fork недоступен — каждый процесс создает свой
+    global _pool, _slots, _pool_lock
+    _pool = None
+    _slots = None
+    _pool_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool)
+
+def _get_pool(config):
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            # spawn: fork из многопоточного сервера небезопасен
+            _pool = ProcessPoolExecutor(max_workers=config['PASSWORD_WORKERS'],
+                                        mp_context=multiprocessing.get_context('spawn'))
+            _slots = threading.BoundedSemaphore(config['PASSWORD_QUEUE_LIMIT'])
+    return _pool, _slots
+
+def _run(function, *args):
+    config = current_app.config
+    if config['PASSWORD_WORKERS'] <= 0:
+        return function(*args)
+
+    pool, slots = _get_pool(config)
+    if not slots.acquire(timeout=config['PASSWORD_TIMEOUT']):
+        raise PasswordHashingBusy()
+    try:
+        return pool.submit(function, *args).result(timeout=config['PASSWORD_TIMEOUT'])
+    except FutureTimeoutError:
+        raise PasswordHashingBusy()
+    finally:
+        slots.release()
+
+# Хэширование пароля
+def hash_password(password):
+    return _run(generate_password_hash, password, current_app.config['PASSWORD_METHOD'])
+
+def hash_passwords(passwords):
+    """Хэши для списка паролей (массовый импорт): пачка делится между
+    процессами пула через map, без слотов очереди запросов"""
+    config = current_app.config
+    method = config['PASSWORD_METHOD']
+    if config['PASSWORD_WORKERS'] <= 0:
+        return [generate_password_hash(password, method) for password in passwords]
+
+    pool, _ = _get_pool(config)
+    chunksize = max(1, len(passwords) // (4 * config['PASSWORD_WORKERS']))
+    return list(pool.map(generate_password_hash, passwords, repeat(method), chunksize=chunksize))
+
+# Проверка пароля
+def verify_password(stored_hash, password):
+    return _run(check_password_hash, stored_hash, password)
+
+def needs_rehash(stored_hash):
+    """Хэш посчитан с другими параметрами, чем PASSWORD_METHOD"""
+    return stored_hash.split('$', 1)[0] != current_app.config['PASSWORD_METHOD']
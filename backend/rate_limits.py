@@ -0,0 +1,97 @@
+import math
+import time
+from functools import lru_cache, wraps
+from flask import current_app, request, session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from werkzeug.exceptions import TooManyRequests
+from models import db, RateLimitBucket
+
+# Ограничение частоты запросов (token bucket).
+#
+# У каждого ограниченного маршрута бюджет "N запросов за T секунд" из
+# RATE_LIMITS: корзина вмещает N жетонов и пополняется со скоростью N/T
+# в секунду, запрос забирает один жетон; если жетона нет — ответ 429
+# с Retry-After. Корзины ведутся отдельно для пользователя (по id из сессии)
+# или, для анонимов, для IP-адреса. Бюджет поиска общий для страницы /search
+# и API: учитывается любой запрос с непустым search_query (GET и POST).
+#
+# Состояние корзин хранится в таблице rate_limit_buckets, поэтому лимит
+# общий для всех процессов сервера. Проверка — один INSERT ... ON CONFLICT
+# DO UPDATE ... RETURNING в отдельной короткой транзакции (как ids.reserve_range),
+# пополнение и списание считаются в самом UPDATE. Корзины, простоявшие
+# дольше самого длинного периода (снова полные), удаляются не чаще раза
+# в RATE_LIMIT_PURGE_INTERVAL секунд.
+
+RATE_LIMIT_PURGE_INTERVAL = 300
+
+_purge = {'last': 0.0}
+
+@lru_cache(maxsize=8)
+def parse_limits(spec):
+    """'login=10/60,search=30/60' → {'login': (10, 60.0), 'search': (30, 60.0)}"""
+    limits = {}
+    for part in (spec or '').split(','):
+        if not part.strip():
+            continue
+        name, budget = part.split('=')
+        count, period = budget.split('/')
+        limits[name.strip()] = (int(count), float(period))
+    return limits
+
+def client_key(name):
+    user_id = session.get('user_id')
+    if user_id:
+        return f'{name}:user:{user_id}'
+    return f'{name}:ip:{request.remote_addr}'
+
+def take_token(key, capacity, period, now=None):
+    """Забирает жетон из корзины key. Возвращает 0, если запрос разрешен,
+    иначе через сколько секунд появится жетон.
+
+    Вызывать до изменений в текущей сессии (отдельная транзакция)."""
+    now = time.time() if now is None else now
+    rate = capacity / period
+    bucket = RateLimitBucket.__table__
+    refilled = db.func.min(capacity, bucket.c.tokens + (now - bucket.c.updated_at) * rate)
+
+    statement = sqlite_insert(bucket).values(key=key, tokens=capacity - 1, updated_at=now, allowed=True)
+    statement = statement.on_conflict_do_update(
+        index_elements=[bucket.c.key],
+        set_={
+            'tokens': db.case((refilled >= 1, refilled - 1), else_=refilled),
+            'allowed': refilled >= 1,
+            'updated_at': now,
+        }
+    ).returning(bucket.c.tokens, bucket.c.allowed)
+
+    with db.engine.begin() as connection:
+        tokens, allowed = connection.execute(statement).one()
+        if now - _purge['last'] > RATE_LIMIT_PURGE_INTERVAL:
+            _purge['last'] = now
+            idle = max(period for _, period in parse_limits(current_app.config['RATE_LIMITS']).values())
+            connection.execute(bucket.delete().where(bucket.c.updated_at < now - idle))
+
+    if allowed:
+        return 0
+    return max(1, math.ceil((1 - tokens) / rate))
+
+def _is_limited(methods, param):
+    if request.method in methods:
+        return True
+    return bool(param and request.values.get(param, '').strip())
+
+def rate_limit(name, methods=('POST',), param=None):
+    """Декоратор маршрута: бюджет name из RATE_LIMITS для запросов methods,
+    а если задан param — и для любых запросов с непустым параметром param"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            limits = parse_limits(current_app.config['RATE_LIMITS'])
+            if name in limits and _is_limited(methods, param):
+                retry_after = take_token(client_key(name), *limits[name])
+                if retry_after:
+                    raise TooManyRequests(f'Слишком много запросов. Попробуйте через {retry_after} с.',
+                                          retry_after=retry_after)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
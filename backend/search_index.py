@@ -0,0 +1,162 @@
+import re
+from models import db, Item
+from cities import find_city
+
+# Полнотекстовый индекс объявлений на SQLite FTS5.
+# Таблица items_fts хранит только индекс (content='items'), данные берутся
+# из items по rowid, синхронизация — триггерами на INSERT/UPDATE/DELETE.
+
+FTS_TABLE = 'items_fts'
+
+# Веса колонок для bm25: title, description, category
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+# Окончания для упрощенного стемминга русских слов (от длинных к коротким)
+RU_ENDINGS = sorted([
+    'иями', 'ями', 'ами', 'иях', 'ях', 'ах', 'ией', 'ий', 'ый', 'ой', 'ей',
+    'ого', 'его', 'ому', 'ему', 'ыми', 'ими', 'ая', 'яя', 'ое', 'ее', 'ые', 'ие',
+    'ую', 'юю', 'ом', 'ем', 'ам', 'ям', 'ов', 'ев', 'ью', 'ия', 'ии',
+    'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+], key=len, reverse=True)
+
+MIN_STEM_LENGTH = 4
+
+_fts_enabled = None
+
+SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, category,
+        content='items', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, category)
+        VALUES (new.id, new.title, new.description, new.category);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, category)
+        VALUES ('delete', old.id, old.title, old.description, old.category);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF title, description, category ON items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, category)
+        VALUES ('delete', old.id, old.title, old.description, old.category);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, category)
+        VALUES (new.id, new.title, new.description, new.category);
+    END""",
+]
+
+def init_search_index():
+    """Создает FTS5-индекс и триггеры, при первом создании индексирует все объявления"""
+    global _fts_enabled
+    if db.engine.dialect.name != 'sqlite':
+        _fts_enabled = False
+        return False
+
+    try:
+        existed = _fts_table_exists()
+        for statement in SCHEMA:
+            db.session.execute(db.text(statement))
+        if not existed:
+            db.session.execute(db.text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        db.session.commit()
+        _fts_enabled = True
+    except Exception as e:
+        # Сборка SQLite без FTS5 — работаем через LIKE
+        db.session.rollback()
+        print(f"⚠️ FTS5 недоступен, поиск будет работать через LIKE: {e}")
+        _fts_enabled = False
+    return _fts_enabled
+
+def fts_enabled():
+    """Проверяет (один раз на процесс), есть ли в БД полнотекстовый индекс"""
+    global _fts_enabled
+    if _fts_enabled is None:
+        _fts_enabled = db.engine.dialect.name == 'sqlite' and _fts_table_exists()
+    return _fts_enabled
+
+def _fts_table_exists():
+    return db.session.execute(
+        db.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': FTS_TABLE}
+    ).first() is not None
+
+def normalize_text(text):
+    """Нормализация как в токенизаторе: нижний регистр, ё → е"""
+    return text.lower().replace('ё', 'е')
+
+def stem_word(word):
+    """Отрезает типичное русское окончание, чтобы искать по основе слова"""
+    for ending in RU_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[:-len(ending)]
+    return word
+
+def build_match_query(search_query):
+    """Превращает пользовательский ввод в безопасное выражение MATCH.
+
+    Каждое слово ищется по префиксу основы: "телефона" → "телефон"*,
+    слова объединяются через AND (поведение FTS5 по умолчанию).
+    """
+    words = re.findall(r'\w+', normalize_text(search_query))
+    terms = [f'"{stem_word(word)}"*' for word in words]
+    return ' '.join(terms)
+
+def apply_fulltext_filter(query, search_query):
+    """Фильтрует запрос по полнотекстовому индексу.
+
+    Возвращает пару (запрос, колонка bm25 для сортировки по релевантности)
+    или None, если FTS недоступен или запрос пустой после разбора —
+    тогда вызывающий код использует LIKE.
+    """
+    if not fts_enabled():
+        return None
+
+    match_query = build_match_query(search_query)
+    if not match_query:
+        return None
+
+    weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+    fts = db.text(
+        f"SELECT rowid AS rowid, bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match_query"
+    ).bindparams(match_query=match_query)\
+     .columns(db.column('rowid', db.Integer), db.column('rank', db.Float))\
+     .subquery('fts')
+
+    return query.join(fts, fts.c.rowid == Item.id), fts.c.rank
+
+def filter_items(query, search_query='', item_type='', category='', city=''):
+    """Применяет фильтры поиска (значение 'all' или пустое — без фильтра).
+
+    Возвращает пару (запрос, порядок для paginate): по релевантности при
+    полнотекстовом поиске, иначе сначала новые.
+    """
+    if category and category != 'all':
+        query = query.filter(Item.category == category)
+
+    if city and city != 'all':
+        # Город — из справочника по любому написанию
+        found = find_city(city)
+        query = query.filter(Item.city_id == found[0]) if found else query.filter(db.false())
+
+    if item_type and item_type != 'all':
+        query = query.filter(Item.item_type == item_type)
+
+    # Полнотекстовый поиск (FTS5, сортировка по релевантности)
+    fulltext = apply_fulltext_filter(query, search_query) if search_query else None
+
+    if fulltext is not None:
+        query, rank = fulltext
+        return query, [(rank, False), (Item.id, True)]
+
+    if search_query:
+        # Запасной вариант без FTS5
+        query = query.filter(
+            db.or_(
+                Item.title.ilike(f'%{search_query}%'),
+                Item.description.ilike(f'%{search_query}%'),
+                Item.category.ilike(f'%{search_query}%')
+            )
+        )
+    return query, [(Item.created_at, True), (Item.id, True)]
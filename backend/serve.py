@@ -0,0 +1,170 @@
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving import BaseWSGIServer
+from models import db
+from config import CPU_COUNT
+from main import create_app, init_db
+from Utilts import start_stats_reconciler
+from lifecycle import start_archiver
+from matching import start_matcher
+from counters import flush_counters
+from sessions import start_session_cleaner
+
+# Production-запуск. Главный процесс открывает сокет, инициализирует БД и
+# запускает WEB_WORKERS дочерних процессов (fork), каждый обслуживает запросы
+# пулом из WEB_THREADS потоков. Упавший процесс перезапускается.
+#
+#   HOST         — адрес (по умолчанию 0.0.0.0)
+#   PORT         — порт (по умолчанию 5000)
+#   WEB_WORKERS  — число процессов (по умолчанию число ядер)
+#   WEB_THREADS  — потоков на процесс (по умолчанию 8)
+#   WEB_BACKLOG  — очередь входящих соединений сокета
+#
+# Если PASSWORD_WORKERS не задан, ядра для хэширования паролей делятся
+# между процессами (split_password_workers).
+
+class PooledWSGIServer(BaseWSGIServer):
+    """WSGI-сервер с ограниченным пулом потоков.
+
+    Пока все потоки заняты, процесс не принимает новые соединения — они ждут
+    в очереди сокета и достаются свободным процессам.
+    """
+    multithread = True
+
+    def __init__(self, host, port, app, threads, fd=None):
+        super().__init__(host, port, app, fd=fd)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+        self.slots = threading.BoundedSemaphore(threads)
+
+    def process_request(self, request, client_address):
+        self.slots.acquire()
+        self.executor.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+def get_settings():
+    return {
+        'host': os.environ.get('HOST', '0.0.0.0'),
+        'port': int(os.environ.get('PORT', 5000)),
+        'workers': int(os.environ.get('WEB_WORKERS', CPU_COUNT)),
+        'threads': int(os.environ.get('WEB_THREADS', 8)),
+        'backlog': int(os.environ.get('WEB_BACKLOG', 2048)),
+    }
+
+def split_password_workers(app, workers):
+    """Делит ядра для хэширования паролей между процессами сервера: у каждого
+    свой пул, и cpu_count в каждом дал бы cpu_count * workers процессов.
+    Значения, заданные в окружении явно, не меняются."""
+    if 'PASSWORD_WORKERS' not in os.environ:
+        app.config['PASSWORD_WORKERS'] = max(1, CPU_COUNT // workers)
+    if 'PASSWORD_QUEUE_LIMIT' not in os.environ:
+        app.config['PASSWORD_QUEUE_LIMIT'] = 4 * max(1, app.config['PASSWORD_WORKERS'])
+
+def init_worker(app):
+    """Вызывается в дочернем процессе сразу после fork.
+
+    Соединения из пула родителя нельзя использовать в двух процессах —
+    отбрасываем их (не закрывая), новый процесс откроет свои.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+def run_worker(app, sock, settings):
+    # SIGTERM прерывает serve_forever, как Ctrl+C, чтобы успеть записать счетчики
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    init_worker(app)
+    server = PooledWSGIServer(settings['host'], settings['port'], app,
+                              settings['threads'], fd=sock.fileno())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            with app.app_context():
+                flush_counters()
+        finally:
+            os._exit(0)
+
+def main():
+    settings = get_settings()
+    app = create_app()
+    init_db(app)
+    split_password_workers(app, settings['workers'])
+
+    # Родитель не должен передавать детям открытые соединения
+    with app.app_context():
+        db.engine.dispose()
+
+    print("\n" + "="*60)
+    print(f"🚀 Сервер запущен: http://localhost:{settings['port']}")
+    print(f"   процессов: {settings['workers']}, потоков в процессе: {settings['threads']}")
+    print("="*60 + "\n")
+
+    # Без fork (Windows) или с одним процессом — обслуживаем в текущем
+    if not hasattr(os, 'fork') or settings['workers'] <= 1:
+        start_stats_reconciler(app, app.config['STATS_RECONCILE_INTERVAL'])
+        start_archiver(app, app.config['ARCHIVE_INTERVAL'])
+        start_matcher(app, app.config['MATCH_INTERVAL'])
+        start_session_cleaner(app, app.config['SESSION_CLEANUP_INTERVAL'])
+        server = PooledWSGIServer(settings['host'], settings['port'], app, settings['threads'])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    sock = socket.create_server((settings['host'], settings['port']), backlog=settings['backlog'])
+    children = set()
+    running = True
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            run_worker(app, sock, settings)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal running
+        running = False
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(settings['workers']):
+        spawn()
+
+    # Сверка статистики, архивация, подбор пар и удаление сессий — одни на весь
+    # сервер, в главном процессе
+    start_stats_reconciler(app, app.config['STATS_RECONCILE_INTERVAL'])
+    start_archiver(app, app.config['ARCHIVE_INTERVAL'])
+    start_matcher(app, app.config['MATCH_INTERVAL'])
+    start_session_cleaner(app, app.config['SESSION_CLEANUP_INTERVAL'])
+
+    while children:
+        pid, status = os.wait()
+        children.discard(pid)
+        if running:
+            print(f"⚠️ Процесс {pid} завершился (код {status}), перезапускаем")
+            spawn()
+
+    sock.close()
+
+if __name__ == '__main__':
+    main()
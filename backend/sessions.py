@@ -0,0 +1,194 @@
+import secrets
+import threading
+import time
+from datetime import datetime
+from flask import session
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from werkzeug.datastructures import CallbackDict
+from werkzeug.exceptions import HTTPException
+from models import db, UserSession
+
+# Сессии на сервере (SESSION_TYPE = 'sqlite').
+#
+# В cookie — только случайный идентификатор; данные сессии (user_id, имя,
+# flash-сообщения) хранятся в таблице sessions. Запись в БД — только когда
+# сессия изменилась или прошла половина срока жизни (срок продлевается
+# при активности, PERMANENT_SESSION_LIFETIME); анонимная сессия без данных
+# не создает ни записи, ни cookie. Чтение и запись идут отдельными
+# короткими транзакциями, не затрагивая сессию SQLAlchemy запроса.
+#
+# У записи есть user_id, поэтому "выйти на всех устройствах" — удаление
+# записей пользователя (revoke_user_sessions). Просроченные записи удаляет
+# пачками фоновая задача (start_session_cleaner) или flask expire-sessions.
+# SESSION_TYPE = 'cookie' оставляет стандартную подписанную cookie Flask.
+#
+# Статика и подсказки поиска сессию не читают, поэтому для них запись из БД
+# не загружается (SESSIONLESS_ENDPOINTS): такие запросы получают пустую
+# сессию, а cookie остается как есть. Flask открывает сессию до сопоставления
+# адреса с маршрутом, поэтому маршрут определяется здесь же.
+
+SESSION_ID_BYTES = 32
+
+SESSIONLESS_ENDPOINTS = {'assets.static_file', 'main.suggestions'}
+
+_serializer = TaggedJSONSerializer()
+
+class ServerSession(CallbackDict, SessionMixin):
+    # Как в SecureCookieSession: accessed — для Vary: Cookie, modified — для записи
+    accessed = False
+
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.rotated_from = None
+        self.modified = False
+
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+    @property
+    def new(self):
+        return self.expires_at is None
+
+    def rotate(self):
+        """Новый идентификатор для тех же данных (после входа — против фиксации сессии)"""
+        if self.sid and self.rotated_from is None:
+            self.rotated_from = self.sid
+        self.sid = None
+        self.expires_at = None
+        self.modified = True
+
+def _endpoint(app, request):
+    try:
+        return app.create_url_adapter(request).match()[0]
+    except HTTPException:
+        return None
+
+class SqliteSessionInterface(SessionInterface):
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if not sid or _endpoint(app, request) in SESSIONLESS_ENDPOINTS:
+            return ServerSession()
+
+        with db.engine.connect() as connection:
+            row = connection.execute(
+                db.select(UserSession.data, UserSession.expires_at)
+                  .where(UserSession.id == sid, UserSession.expires_at > datetime.utcnow())
+            ).first()
+        if row is None:
+            return ServerSession()
+        return ServerSession(_serializer.loads(row.data), sid, row.expires_at)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        table = UserSession.__table__
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        # Сессия опустела (выход) — удаляем запись и cookie
+        if not session:
+            stale = [sid for sid in (session.sid, session.rotated_from) if sid]
+            if stale:
+                with db.engine.begin() as connection:
+                    connection.execute(table.delete().where(table.c.id.in_(stale)))
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app),
+                                       httponly=self.get_cookie_httponly(app))
+            return
+
+        now = datetime.utcnow()
+        lifetime = app.permanent_session_lifetime
+        refresh = session.expires_at is not None and session.expires_at - now < lifetime / 2
+        if not (session.modified or refresh):
+            return
+
+        set_cookie = session.sid is None
+        if set_cookie:
+            session.sid = secrets.token_urlsafe(SESSION_ID_BYTES)
+        values = {'id': session.sid, 'user_id': session.get('user_id'),
+                  'data': _serializer.dumps(dict(session)), 'expires_at': now + lifetime}
+
+        with db.engine.begin() as connection:
+            if session.rotated_from:
+                connection.execute(table.delete().where(table.c.id == session.rotated_from))
+            statement = sqlite_insert(table).values(**values)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={key: statement.excluded[key] for key in ('user_id', 'data', 'expires_at')}
+            ))
+
+        if set_cookie:
+            response.set_cookie(name, session.sid,
+                                expires=self.get_expiration_time(app, session),
+                                httponly=self.get_cookie_httponly(app),
+                                domain=domain, path=path,
+                                secure=self.get_cookie_secure(app),
+                                samesite=self.get_cookie_samesite(app))
+
+def init_sessions(app):
+    """Подключает хранилище сессий по SESSION_TYPE"""
+    if app.config['SESSION_TYPE'] == 'sqlite':
+        app.session_interface = SqliteSessionInterface()
+    elif app.config['SESSION_TYPE'] != 'cookie':
+        raise ValueError(f"Неизвестный SESSION_TYPE: {app.config['SESSION_TYPE']} (доступны: sqlite, cookie)")
+
+def rotate_session():
+    """Выдает сессии новый идентификатор (вызывать при входе пользователя)"""
+    if isinstance(session._get_current_object(), ServerSession):
+        session.rotate()
+
+def revoke_user_sessions(user_id):
+    """Завершает все сессии пользователя, возвращает их число"""
+    with db.engine.begin() as connection:
+        return connection.execute(
+            UserSession.__table__.delete().where(UserSession.user_id == user_id)
+        ).rowcount
+
+def expire_sessions(batch_size):
+    """Удаляет просроченные сессии пачками по batch_size, возвращает их число"""
+    table = UserSession.__table__
+    total = 0
+    while True:
+        with db.engine.begin() as connection:
+            expired = db.select(table.c.id)\
+                        .where(table.c.expires_at < datetime.utcnow())\
+                        .limit(batch_size)\
+                        .scalar_subquery()
+            deleted = connection.execute(table.delete().where(table.c.id.in_(expired))).rowcount
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+def start_session_cleaner(app, interval):
+    """Фоновое удаление просроченных сессий (одно на сервер)"""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                with app.app_context():
+                    expire_sessions(app.config['SESSION_CLEANUP_BATCH_SIZE'])
+            except Exception as e:
+                print(f"Ошибка удаления сессий: {e}")
+
+    thread = threading.Thread(target=run, name='session-cleaner', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,155 @@
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from flask import current_app
+from models import db, Item
+
+# Подсказки для поля поиска из памяти процесса.
+#
+# Отсортированный список ключей (нормализованный текст, вид) и счетчики
+# активных объявлений для слов заголовков, категорий и городов. Префикс
+# ищется двоичным поиском, поэтому запрос подсказок не обращается к БД.
+# Список строится при запуске (init_db, до fork — процессы получают копию)
+# и поддерживается при create/delete/found; изменения из других процессов
+# подтягиваются перестроением в фоновом потоке раз в SUGGEST_TTL секунд,
+# пока запросы обслуживаются по старому списку.
+
+SUGGEST_TTL = 300
+SUGGEST_LIMIT = 8
+
+# Сколько ключей с нужным префиксом просматривать для выбора самых частых
+SUGGEST_SCAN_LIMIT = 200
+
+MIN_TERM_LENGTH = 3
+
+SUGGEST_KINDS = ('title', 'category', 'city')
+
+_WORD_RE = re.compile(r'\w+')
+
+_suggest = {'keys': None, 'counts': {}, 'labels': {}, 'loaded_at': 0.0, 'reloading': False}
+_suggest_lock = threading.Lock()
+
+def normalize_term(text):
+    return ' '.join((text or '').lower().replace('ё', 'е').split())
+
+def _item_terms(values):
+    """Ключи (текст, вид) и подписи для значений объявления"""
+    terms = {}
+    for word in _WORD_RE.findall(values.get('title') or ''):
+        if len(word) >= MIN_TERM_LENGTH and not word.isdigit():
+            terms[(normalize_term(word), 'title')] = word.lower()
+    for kind in ('category', 'city'):
+        if values.get(kind):
+            terms[(normalize_term(values[kind]), kind)] = values[kind]
+    return terms
+
+def load_suggestions():
+    """Перестраивает список по активным объявлениям"""
+    counts = {}
+    labels = {}
+    rows = db.session.query(Item.title, Item.category, Item.city)\
+                     .filter(Item.status == 'active')\
+                     .yield_per(1000)
+    for title, category, city in rows:
+        for key, label in _item_terms({'title': title, 'category': category, 'city': city}).items():
+            counts[key] = counts.get(key, 0) + 1
+            labels.setdefault(key, label)
+
+    with _suggest_lock:
+        _suggest['keys'] = sorted(counts)
+        _suggest['counts'] = counts
+        _suggest['labels'] = labels
+        _suggest['loaded_at'] = time.monotonic()
+        _suggest['reloading'] = False
+
+def _reload_in_background():
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                load_suggestions()
+        except Exception as e:
+            _suggest['reloading'] = False
+            print(f"Ошибка перестроения подсказок: {e}")
+
+    threading.Thread(target=run, name='suggest-reload', daemon=True).start()
+
+def _ensure_loaded():
+    if _suggest['keys'] is None:
+        load_suggestions()
+        return
+    with _suggest_lock:
+        stale = time.monotonic() - _suggest['loaded_at'] > SUGGEST_TTL and not _suggest['reloading']
+        if stale:
+            _suggest['reloading'] = True
+    if stale:
+        _reload_in_background()
+
+def invalidate_suggestions():
+    """Перестроить список в фоне при следующем запросе подсказок"""
+    _suggest['loaded_at'] = 0.0
+
+def item_suggestions(item):
+    """Значения объявления для подсказок (пустой словарь, если объявление не активно)"""
+    if (item.status or 'active') != 'active':
+        return {}
+    return {kind: getattr(item, kind) for kind in SUGGEST_KINDS}
+
+def apply_suggestions(values, sign=1):
+    """Учитывает объявление (sign=1) или убирает его (sign=-1).
+
+    values берутся из item_suggestions() до коммита, как и для фасетов.
+    """
+    if not values or _suggest['keys'] is None:
+        return
+    with _suggest_lock:
+        keys = _suggest['keys']
+        counts = _suggest['counts']
+        for key, label in _item_terms(values).items():
+            count = counts.get(key, 0) + sign
+            if count > 0:
+                if key not in counts:
+                    insort(keys, key)
+                    _suggest['labels'][key] = label
+                counts[key] = count
+            elif key in counts:
+                del counts[key]
+                _suggest['labels'].pop(key, None)
+                keys.pop(bisect_left(keys, key))
+
+def _match(prefix, kinds=SUGGEST_KINDS):
+    keys = _suggest['keys']
+    start = bisect_left(keys, (prefix,))
+    matches = []
+    for key in keys[start:start + SUGGEST_SCAN_LIMIT]:
+        if not key[0].startswith(prefix):
+            break
+        if key[1] in kinds:
+            matches.append((key, _suggest['counts'][key], _suggest['labels'][key]))
+    return matches
+
+def suggest(query, limit=SUGGEST_LIMIT):
+    """Подсказки для введенного текста: [{'text', 'kind', 'count'}], самые частые первыми.
+
+    Весь текст дополняется до категории, города или слова заголовка; если
+    слов несколько, последнее слово дополняется словами заголовков.
+    """
+    prefix = normalize_term(query)
+    if not prefix:
+        return []
+    _ensure_loaded()
+
+    results = {}
+    with _suggest_lock:
+        for (_, kind), count, label in _match(prefix):
+            results[(label, kind)] = count
+        if ' ' in prefix:
+            head, last = prefix.rsplit(' ', 1)
+            if last:
+                for _, count, label in _match(last, ('title',)):
+                    results.setdefault((f'{head} {label}', 'title'), count)
+
+    best = sorted(results.items(), key=lambda entry: -entry[1])[:limit]
+    return [{'text': text, 'kind': kind, 'count': count} for (text, kind), count in best]
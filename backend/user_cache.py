@@ -0,0 +1,55 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import g, session
+from models import db, User
+
+# Данные вошедшего пользователя для шаблонов без запроса к users на каждой
+# странице. Загрузка — один раз за запрос (g) из LRU-кэша процесса с TTL;
+# при промахе читаются только нужные колонки. Записи сбрасываются при
+# выходе и изменении аккаунта (invalidate_user), в других процессах — по TTL.
+
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 300
+
+CachedUser = namedtuple('CachedUser', ['id', 'uid', 'username', 'full_name', 'created_at'])
+
+_users = OrderedDict()
+_users_lock = threading.Lock()
+
+def _load_user(user_id):
+    row = db.session.query(User.id, User.uid, User.username, User.full_name, User.created_at)\
+                    .filter(User.id == user_id)\
+                    .first()
+    return CachedUser(*row) if row else None
+
+def get_user(user_id):
+    """Пользователь по id из кэша или БД (None, если такого нет)"""
+    now = time.monotonic()
+    with _users_lock:
+        entry = _users.get(user_id)
+        if entry is not None and entry[1] > now:
+            _users.move_to_end(user_id)
+            return entry[0]
+
+    user = _load_user(user_id)
+    if user is not None:
+        with _users_lock:
+            _users[user_id] = (user, now + USER_CACHE_TTL)
+            _users.move_to_end(user_id)
+            while len(_users) > USER_CACHE_SIZE:
+                _users.popitem(last=False)
+    return user
+
+def current_user():
+    """Пользователь текущей сессии (один раз за запрос) или None"""
+    if 'current_user' not in g:
+        user_id = session.get('user_id')
+        g.current_user = get_user(user_id) if user_id else None
+    return g.current_user
+
+def invalidate_user(user_id):
+    """Сбрасывает запись пользователя (выход, изменение аккаунта)"""
+    with _users_lock:
+        _users.pop(user_id, None)
+    g.pop('current_user', None)
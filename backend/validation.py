@@ -0,0 +1,67 @@
+from datetime import datetime
+from cities import normalize_city
+
+# Проверка данных объявлений и пользователей.
+# Используется формами (create, register) и массовым импортом (bulk.py),
+# чтобы правила были одинаковыми. Функции возвращают пару
+# (очищенные данные, текст ошибки или None).
+
+ITEM_TYPES = ('lost', 'found')
+ITEM_STATUSES = ('active', 'closed', 'returned')
+
+def _clean(data, field):
+    return (data.get(field) or '').strip()
+
+def validate_item(data):
+    """Проверка полей объявления (без контактного лица по умолчанию и владельца)"""
+    item = {
+        'item_type': _clean(data, 'item_type'),
+        'category': _clean(data, 'category'),
+        'title': _clean(data, 'title'),
+        'description': _clean(data, 'description'),
+        'city': _clean(data, 'city'),
+        'location': _clean(data, 'location'),
+        'contact_name': _clean(data, 'contact_name'),
+        'contact_phone': _clean(data, 'contact_phone'),
+        'contact_email': _clean(data, 'contact_email'),
+    }
+
+    if not item['title']:
+        return item, 'Введите заголовок объявления'
+
+    if not item['category']:
+        return item, 'Выберите категорию'
+
+    # Город без букв и цифр ("г.", "-") не найти и не добавить в справочник
+    if not normalize_city(item['city']):
+        return item, 'Введите город'
+
+    if item['item_type'] not in ITEM_TYPES:
+        return item, 'Выберите тип объявления'
+
+    # Преобразование даты (при ошибке — сегодняшняя)
+    try:
+        item['date'] = datetime.strptime(_clean(data, 'date'), '%Y-%m-%d').date()
+    except ValueError:
+        item['date'] = datetime.now().date()
+
+    return item, None
+
+def validate_user(data):
+    """Проверка полей пользователя (без подтверждения пароля и уникальности)"""
+    user = {
+        'username': _clean(data, 'username'),
+        'full_name': _clean(data, 'full_name'),
+        'password': data.get('password') or '',
+    }
+
+    if not user['username'] or len(user['username']) < 3:
+        return user, 'Имя пользователя должно быть не менее 3 символов'
+
+    if not user['full_name']:
+        return user, 'Введите ФИО'
+
+    if not user['password'] or len(user['password']) < 4:
+        return user, 'Пароль должен быть не менее 4 символов'
+
+    return user, None
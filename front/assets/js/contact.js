@@ -0,0 +1,114 @@
+// Mark item as closed
+function markAsClosed() {
+    if (confirm('Отметить объявление как закрытое (найденное/возвращённое)?')) {
+        // Here you would make an AJAX request to update the status
+        // For now, we'll just show a message
+        alert('Функция отметки как закрытого будет реализована в следующем обновлении.');
+    }
+}
+
+// Send message to owner
+function sendMessage() {
+    alert('Система сообщений будет реализована в следующем обновлении.\n\n' +
+          'А пока вы можете связаться с владельцем по указанным контактам.');
+}
+
+// Copy contact info to clipboard
+function copyToClipboard(text, type) {
+    navigator.clipboard.writeText(text).then(() => {
+        alert(`${type} скопировано в буфер обмена: ${text}`);
+    }).catch(err => {
+        console.error('Ошибка копирования: ', err);
+    });
+}
+
+// Initialize copy buttons
+document.addEventListener('DOMContentLoaded', function() {
+    // Add copy buttons to contact info
+    const contactItems = document.querySelectorAll('.contact-item');
+    contactItems.forEach(item => {
+        const valueElement = item.querySelector('.contact-value');
+        if (valueElement) {
+            const text = valueElement.textContent.trim();
+            const copyBtn = document.createElement('button');
+            copyBtn.innerHTML = '📋';
+            copyBtn.style.cssText = `
+                background: none;
+                border: none;
+                cursor: pointer;
+                font-size: 16px;
+                margin-left: 10px;
+                opacity: 0.7;
+                transition: opacity 0.3s;
+            `;
+            copyBtn.onmouseenter = () => copyBtn.style.opacity = '1';
+            copyBtn.onmouseleave = () => copyBtn.style.opacity = '0.7';
+            copyBtn.onclick = (e) => {
+                e.preventDefault();
+                copyToClipboard(text, 'Контакт');
+            };
+            valueElement.appendChild(copyBtn);
+        }
+    });
+
+    // Add share functionality
+    const shareBtn = document.createElement('a');
+    shareBtn.href = '#';
+    shareBtn.className = 'action-btn btn-secondary';
+    shareBtn.innerHTML = '🔗 Поделиться';
+    shareBtn.style.marginTop = '20px';
+    shareBtn.onclick = function(e) {
+        e.preventDefault();
+        if (navigator.share) {
+            navigator.share({
+                title: document.querySelector('.actions-section').dataset.title,
+                text: 'Посмотрите это объявление на НайдиВерни',
+                url: window.location.href
+            });
+        } else {
+            copyToClipboard(window.location.href, 'Ссылка');
+        }
+    };
+
+    const actionsSection = document.querySelector('.actions-section');
+    if (actionsSection) {
+        actionsSection.appendChild(shareBtn);
+    }
+
+    // Print functionality
+    const printBtn = document.createElement('a');
+    printBtn.href = '#';
+    printBtn.className = 'action-btn btn-secondary';
+    printBtn.innerHTML = '🖨️ Распечатать';
+    printBtn.style.marginTop = '20px';
+    printBtn.onclick = function(e) {
+        e.preventDefault();
+        window.print();
+    };
+
+    if (actionsSection) {
+        actionsSection.appendChild(printBtn);
+    }
+});
+
+// Report functionality
+function reportItem() {
+    const reason = prompt('Укажите причину жалобы:\n1. Мошенничество\n2. Некорректная информация\n3. Другое');
+    if (reason) {
+        alert('Жалоба отправлена администратору. Спасибо за бдительность!');
+        // Here you would send the report to the server
+    }
+}
+
+// Add report button for non-owners
+document.addEventListener('DOMContentLoaded', function() {
+    const actionsSection = document.querySelector('.actions-section');
+    if (!actionsSection || actionsSection.dataset.canReport !== '1') return;
+
+    const reportBtn = document.createElement('button');
+    reportBtn.className = 'action-btn btn-danger';
+    reportBtn.innerHTML = '🚨 Пожаловаться';
+    reportBtn.style.marginTop = '20px';
+    reportBtn.onclick = reportItem;
+    actionsSection.appendChild(reportBtn);
+});
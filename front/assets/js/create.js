@@ -0,0 +1,106 @@
+// Type selection
+function selectType(type) {
+    document.getElementById('itemType').value = type;
+
+    // Update card styles
+    const lostCard = document.getElementById('lostCard');
+    const foundCard = document.getElementById('foundCard');
+
+    if (type === 'lost') {
+        lostCard.classList.add('selected');
+        foundCard.classList.remove('selected');
+
+        // Update placeholders based on type
+        document.querySelector('input[name="title"]').placeholder = 
+            "Например: 'Потерял ключи от квартиры на улице Ленина'";
+        document.querySelector('textarea[name="description"]').placeholder = 
+            "Опишите что потеряли: цвет, размер, особые приметы...\nПример: 'Ключи на кольце, 3 ключа, один автомобильный, два дверных...'";
+    } else {
+        foundCard.classList.add('selected');
+        lostCard.classList.remove('selected');
+
+        // Update placeholders based on type
+        document.querySelector('input[name="title"]').placeholder = 
+            "Например: 'Найден паспорт в торговом центре'";
+        document.querySelector('textarea[name="description"]').placeholder = 
+            "Опишите что нашли: цвет, размер, особые приметы...\nПример: 'Коричневый кожаный кошелёк, внутри водительские права на имя Петров П.П., несколько карт...'";
+    }
+}
+
+// Set today's date as default
+document.addEventListener('DOMContentLoaded', function() {
+    const today = new Date().toISOString().split('T')[0];
+    document.querySelector('input[name="date"]').value = today;
+
+    // Default selection
+    selectType('lost');
+
+    // Auto-focus on title
+    document.querySelector('input[name="title"]').focus();
+});
+
+// Form validation
+const form = document.querySelector('form');
+form.addEventListener('submit', function(e) {
+    const title = document.querySelector('input[name="title"]').value.trim();
+    const category = document.querySelector('select[name="category"]').value;
+    const city = document.querySelector('input[name="city"]').value.trim();
+    const date = document.querySelector('input[name="date"]').value;
+
+    let isValid = true;
+    let errorMessage = '';
+
+    if (!title) {
+        isValid = false;
+        errorMessage = 'Введите заголовок объявления';
+    } else if (!category) {
+        isValid = false;
+        errorMessage = 'Выберите категорию';
+    } else if (!city) {
+        isValid = false;
+        errorMessage = 'Введите город';
+    } else if (!date) {
+        isValid = false;
+        errorMessage = 'Выберите дату';
+    }
+
+    if (!isValid) {
+        e.preventDefault();
+        alert('Ошибка: ' + errorMessage);
+        return false;
+    }
+
+    // Show loading state
+    const submitBtn = document.querySelector('.submit-btn');
+    const originalText = submitBtn.textContent;
+    submitBtn.textContent = 'Публикация...';
+    submitBtn.disabled = true;
+
+    // Reset button after 5 seconds (in case submission fails)
+    setTimeout(() => {
+        submitBtn.textContent = originalText;
+        submitBtn.disabled = false;
+    }, 5000);
+});
+
+// Character counter for description
+const textarea = document.querySelector('textarea[name="description"]');
+if (textarea) {
+    textarea.addEventListener('input', function() {
+        const length = this.value.length;
+        const maxLength = this.getAttribute('maxlength');
+        const hint = this.nextElementSibling;
+
+        if (hint && hint.classList.contains('input-hint')) {
+            hint.textContent = `Осталось ${maxLength - length} символов (${length}/${maxLength})`;
+
+            if (length > maxLength * 0.9) {
+                hint.style.color = '#dc2626';
+            } else if (length > maxLength * 0.7) {
+                hint.style.color = '#f59e0b';
+            } else {
+                hint.style.color = 'var(--medium-gray)';
+            }
+        }
+    });
+}
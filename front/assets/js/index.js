@@ -0,0 +1,26 @@
+// Анимация статистики при загрузке
+document.addEventListener('DOMContentLoaded', function() {
+    // Плавное появление карточек статистики
+    const statCards = document.querySelectorAll('.stat-card');
+    statCards.forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(20px)';
+
+        setTimeout(() => {
+            card.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+
+    // Обновление статистики каждые 5 минут (опционально)
+    setInterval(() => {
+        fetch('/admin/update_stats')
+            .then(response => response.json())
+            .then(data => {
+                // Обновляем значения на странице
+                document.querySelector('.stat-value').innerHTML = data.total_users;
+            })
+            .catch(error => console.error('Error updating stats:', error));
+    }, 5 * 60 * 1000);
+});
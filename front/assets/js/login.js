@@ -0,0 +1,40 @@
+// Переключение видимости пароля
+const togglePassword = document.getElementById('togglePassword');
+const passwordInput = document.getElementById('password');
+
+togglePassword.addEventListener('click', function() {
+    const type = passwordInput.getAttribute('type') === 'password' ? 'text' : 'password';
+    passwordInput.setAttribute('type', type);
+    this.textContent = type === 'password' ? '👁' : '👁‍🗨';
+});
+
+// Фокус на поле username при загрузке
+document.addEventListener('DOMContentLoaded', function() {
+    const usernameInput = document.querySelector('input[name="username"]');
+    if (usernameInput) {
+        usernameInput.focus();
+    }
+});
+
+// Простая валидация формы
+const form = document.querySelector('form');
+form.addEventListener('submit', function(e) {
+    const username = document.querySelector('input[name="username"]').value.trim();
+    const password = passwordInput.value.trim();
+
+    if (!username || !password) {
+        e.preventDefault();
+        return false;
+    }
+
+    // Показываем загрузку
+    const submitBtn = document.querySelector('.submit-btn');
+    const originalText = submitBtn.textContent;
+    submitBtn.textContent = 'Вход...';
+    submitBtn.disabled = true;
+
+    setTimeout(() => {
+        submitBtn.textContent = originalText;
+        submitBtn.disabled = false;
+    }, 2000);
+});
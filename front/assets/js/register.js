@@ -0,0 +1,175 @@
+// Элементы формы
+const form = document.getElementById('registerForm');
+const usernameInput = document.getElementById('username');
+const passwordInput = document.getElementById('password');
+const confirmPasswordInput = document.getElementById('confirm_password');
+const termsCheckbox = document.getElementById('terms');
+const submitBtn = document.getElementById('submitBtn');
+
+// Элементы для проверки пароля
+const strengthBar = document.getElementById('strengthBar');
+const strengthText = document.getElementById('strengthText');
+const passwordMatchHint = document.getElementById('passwordMatchHint');
+
+// Проверка силы пароля
+function checkPasswordStrength(password) {
+    let strength = 0;
+
+    // Длина пароля
+    if (password.length >= 8) strength += 1;
+
+    // Содержит буквы в разных регистрах
+    if (/[a-z]/.test(password) && /[A-Z]/.test(password)) strength += 1;
+
+    // Содержит цифры
+    if (/\d/.test(password)) strength += 1;
+
+    // Содержит специальные символы
+    if (/[^A-Za-z0-9]/.test(password)) strength += 1;
+
+    return strength;
+}
+
+function updatePasswordStrength() {
+    const password = passwordInput.value;
+    const strength = checkPasswordStrength(password);
+
+    // Очищаем классы
+    strengthBar.className = 'strength-bar';
+    passwordInput.classList.remove('error', 'success');
+
+    if (password.length === 0) {
+        strengthText.textContent = 'Введите пароль';
+        strengthBar.style.width = '0%';
+        return;
+    }
+
+    if (password.length < 4) {
+        strengthText.textContent = 'Слишком короткий (мин. 4 символа)';
+        strengthBar.classList.add('strength-weak');
+        passwordInput.classList.add('error');
+    } else if (strength < 2) {
+        strengthText.textContent = 'Слабый пароль';
+        strengthBar.classList.add('strength-weak');
+        passwordInput.classList.add('error');
+    } else if (strength < 4) {
+        strengthText.textContent = 'Средний пароль';
+        strengthBar.classList.add('strength-medium');
+        passwordInput.classList.add('success');
+    } else {
+        strengthText.textContent = 'Надежный пароль';
+        strengthBar.classList.add('strength-strong');
+        passwordInput.classList.add('success');
+    }
+}
+
+// Проверка совпадения паролей
+function checkPasswordMatch() {
+    const password = passwordInput.value;
+    const confirmPassword = confirmPasswordInput.value;
+
+    confirmPasswordInput.classList.remove('error', 'success');
+    passwordMatchHint.textContent = '';
+
+    if (confirmPassword.length === 0) return;
+
+    if (password !== confirmPassword) {
+        confirmPasswordInput.classList.add('error');
+        passwordMatchHint.textContent = 'Пароли не совпадают';
+        passwordMatchHint.style.color = 'var(--error-red)';
+        return false;
+    } else {
+        confirmPasswordInput.classList.add('success');
+        passwordMatchHint.textContent = 'Пароли совпадают ✓';
+        passwordMatchHint.style.color = 'var(--success-green)';
+        return true;
+    }
+}
+
+// Проверка всей формы
+function validateForm() {
+    const isUsernameValid = usernameInput.value.length >= 3;
+    const isFullNameValid = document.getElementById('full_name').value.length >= 2;
+    const isPasswordValid = passwordInput.value.length >= 4;
+    const isPasswordMatch = checkPasswordMatch();
+    const isTermsAccepted = termsCheckbox.checked;
+
+    // Обновляем стили для username
+    usernameInput.classList.remove('error', 'success');
+    if (usernameInput.value.length > 0) {
+        if (isUsernameValid) {
+            usernameInput.classList.add('success');
+        } else {
+            usernameInput.classList.add('error');
+        }
+    }
+
+    // Обновляем стили для full_name
+    const fullNameInput = document.getElementById('full_name');
+    fullNameInput.classList.remove('error', 'success');
+    if (fullNameInput.value.length > 0) {
+        if (isFullNameValid) {
+            fullNameInput.classList.add('success');
+        } else {
+            fullNameInput.classList.add('error');
+        }
+    }
+
+    // Включаем/выключаем кнопку отправки
+    submitBtn.disabled = !(isUsernameValid && isFullNameValid && isPasswordValid && isPasswordMatch && isTermsAccepted);
+
+    return submitBtn.disabled === false;
+}
+
+// Обработчики событий
+passwordInput.addEventListener('input', function() {
+    updatePasswordStrength();
+    checkPasswordMatch();
+    validateForm();
+});
+
+confirmPasswordInput.addEventListener('input', function() {
+    checkPasswordMatch();
+    validateForm();
+});
+
+usernameInput.addEventListener('input', validateForm);
+document.getElementById('full_name').addEventListener('input', validateForm);
+termsCheckbox.addEventListener('change', validateForm);
+
+// Проверка доступности имени пользователя (асинхронно)
+let usernameCheckTimeout;
+usernameInput.addEventListener('input', function() {
+    clearTimeout(usernameCheckTimeout);
+    const username = this.value.trim();
+
+    if (username.length >= 3) {
+        usernameCheckTimeout = setTimeout(() => {
+            // Здесь можно добавить AJAX проверку на сервере
+            // если имя пользователя уже занято
+        }, 500);
+    }
+});
+
+// Анимация успешной отправки
+form.addEventListener('submit', function(e) {
+    if (!validateForm()) {
+        e.preventDefault();
+        return;
+    }
+
+    // Добавляем анимацию кнопки
+    submitBtn.style.animation = 'successPulse 0.5s ease-in-out';
+    setTimeout(() => {
+        submitBtn.style.animation = '';
+    }, 500);
+
+    // Показываем сообщение о загрузке
+    submitBtn.innerHTML = 'Создание аккаунта...';
+    submitBtn.disabled = true;
+});
+
+// Инициализация при загрузке
+document.addEventListener('DOMContentLoaded', function() {
+    validateForm();
+});
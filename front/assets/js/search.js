@@ -0,0 +1,282 @@
+// Подсказки при вводе (/suggest)
+const suggestInput = document.getElementById('searchQuery');
+const suggestList = document.getElementById('searchSuggestions');
+let suggestTimer = null;
+suggestInput.addEventListener('input', function() {
+    clearTimeout(suggestTimer);
+    const query = this.value.trim();
+    if (query.length < 2 || !window.fetch) return;
+    suggestTimer = setTimeout(async () => {
+        try {
+            const response = await fetch(suggestInput.dataset.suggest + '?q=' + encodeURIComponent(query));
+            const data = await response.json();
+            if (data.query.trim() !== suggestInput.value.trim()) return;
+            suggestList.innerHTML = data.suggestions
+                .map(s => `<option value="${escapeHtml(s.text)}">${s.count}</option>`)
+                .join('');
+        } catch (error) {
+            // Без подсказок поиск работает как обычно
+        }
+    }, 150);
+});
+
+// "Показать еще": следующая страница из JSON API без перезагрузки
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text == null ? '' : text;
+    return div.innerHTML;
+}
+
+function truncate(text, length) {
+    return text.length > length ? text.slice(0, length) + '...' : text;
+}
+
+function formatDate(isoDate) {
+    return isoDate.slice(0, 10).split('-').reverse().join('.');
+}
+
+function renderItemCard(item) {
+    const location = item.location ? `
+                        <div class="detail-item">
+                            <span class="detail-label">🗺️ Место</span>
+                            <span class="detail-value">${escapeHtml(truncate(item.location, 30))}</span>
+                        </div>` : '';
+    return `
+            <div class="item-card">
+                <div class="item-header">
+                    <span class="item-type type-${escapeHtml(item.item_type)}">
+                        ${item.item_type === 'lost' ? 'ПОТЕРЯНО' : 'НАЙДЕНО'}
+                    </span>
+                    <span class="item-date">${formatDate(item.date)}</span>
+                </div>
+                <div class="item-body">
+                    <h3 class="item-title">${escapeHtml(item.title)}</h3>
+                    <div class="item-category">
+                        <span>📁</span>
+                        <span>${escapeHtml(item.category)}</span>
+                    </div>
+                    <p class="item-description">
+                        ${item.description ? escapeHtml(truncate(item.description, 200)) : 'Описание отсутствует'}
+                    </p>
+                    <div class="item-details">
+                        <div class="detail-item">
+                            <span class="detail-label">📍 Город</span>
+                            <span class="detail-value">${escapeHtml(item.city)}</span>
+                        </div>
+                        <div class="detail-item">
+                            <span class="detail-label">🏷️ Категория</span>
+                            <span class="detail-value">${escapeHtml(item.category)}</span>
+                        </div>${location}
+                        <div class="detail-item">
+                            <span class="detail-label">📅 Дата</span>
+                            <span class="detail-value">${formatDate(item.date)}</span>
+                        </div>
+                    </div>
+                </div>
+                <div class="item-footer">
+                    <span class="item-id">ID: ${escapeHtml(item.item_id)}</span>
+                    <a href="${escapeHtml(item.url)}" class="view-btn">Подробнее →</a>
+                </div>
+            </div>`;
+}
+
+const loadMore = document.getElementById('loadMore');
+if (loadMore && window.fetch) {
+    loadMore.addEventListener('click', async function(e) {
+        e.preventDefault();
+        const originalText = this.innerHTML;
+        this.innerHTML = 'Загрузка...';
+        try {
+            const separator = this.dataset.api.includes('?') ? '&' : '?';
+            const response = await fetch(this.dataset.api + separator + 'cursor=' + encodeURIComponent(this.dataset.cursor));
+            if (!response.ok) throw new Error(response.status);
+            const page = await response.json();
+            document.querySelector('.items-grid')
+                    .insertAdjacentHTML('beforeend', page.items.map(renderItemCard).join(''));
+            if (page.next_cursor) {
+                this.dataset.cursor = page.next_cursor;
+                this.innerHTML = originalText;
+            } else {
+                this.parentElement.remove();
+            }
+            highlightSearchTerms();
+        } catch (error) {
+            // Без API — обычный переход на следующую страницу
+            window.location.href = this.href;
+        }
+    });
+}
+
+// Form submission
+document.getElementById('searchForm').addEventListener('submit', function(e) {
+    // Show loading state
+    const submitBtn = this.querySelector('.search-btn');
+    const originalText = submitBtn.innerHTML;
+    submitBtn.innerHTML = '🔍 Поиск...';
+    submitBtn.disabled = true;
+
+    // Reset after 3 seconds (in case of error)
+    setTimeout(() => {
+        submitBtn.innerHTML = originalText;
+        submitBtn.disabled = false;
+    }, 3000);
+});
+
+// Clear specific filter
+function clearFilter(filterName) {
+    const form = document.getElementById('searchForm');
+
+    switch(filterName) {
+        case 'search_query':
+            document.getElementById('searchQuery').value = '';
+            break;
+        case 'item_type':
+            document.getElementById('itemType').value = 'all';
+            break;
+        case 'category':
+            document.getElementById('category').value = 'all';
+            break;
+        case 'city':
+            document.getElementById('city').value = 'all';
+            break;
+    }
+
+    form.submit();
+}
+
+// Clear all filters
+function clearAllFilters() {
+    document.getElementById('searchQuery').value = '';
+    document.getElementById('itemType').value = 'all';
+    document.getElementById('category').value = 'all';
+    document.getElementById('city').value = 'all';
+    document.getElementById('searchForm').submit();
+}
+
+// Auto-submit when filters change (optional)
+const selectElements = document.querySelectorAll('.search-select');
+selectElements.forEach(select => {
+    select.addEventListener('change', function() {
+        // Auto-submit only if there's no text in search field
+        const searchQuery = document.getElementById('searchQuery').value;
+        if (!searchQuery.trim()) {
+            document.getElementById('searchForm').submit();
+        }
+    });
+});
+
+// Keyboard shortcuts
+document.addEventListener('keydown', function(e) {
+    // Ctrl/Cmd + F focuses search input
+    if ((e.ctrlKey || e.metaKey) && e.key === 'f') {
+        e.preventDefault();
+        document.getElementById('searchQuery').focus();
+    }
+
+    // Enter submits form when search input is focused
+    if (e.key === 'Enter' && document.activeElement.id === 'searchQuery') {
+        document.getElementById('searchForm').submit();
+    }
+});
+
+// Highlight search terms in results (client-side)
+function highlightSearchTerms() {
+    const searchQuery = document.getElementById('searchQuery').dataset.query || '';
+    if (!searchQuery.trim()) return;
+
+    const searchTerms = searchQuery.toLowerCase().split(' ').filter(term => term.length > 2);
+    if (searchTerms.length === 0) return;
+
+    const itemCards = document.querySelectorAll('.item-card');
+    itemCards.forEach(card => {
+        const title = card.querySelector('.item-title');
+        const description = card.querySelector('.item-description');
+
+        if (title) {
+            let titleText = title.textContent;
+            searchTerms.forEach(term => {
+                const regex = new RegExp(`(${term})`, 'gi');
+                titleText = titleText.replace(regex, '<mark>$1</mark>');
+            });
+            title.innerHTML = titleText;
+        }
+
+        if (description) {
+            let descText = description.textContent;
+            searchTerms.forEach(term => {
+                const regex = new RegExp(`(${term})`, 'gi');
+                descText = descText.replace(regex, '<mark>$1</mark>');
+            });
+            description.innerHTML = descText;
+        }
+    });
+}
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    // Focus search input if it's empty
+    const searchInput = document.getElementById('searchQuery');
+    if (!searchInput.value.trim()) {
+        searchInput.focus();
+    }
+
+    // Highlight search terms
+    highlightSearchTerms();
+
+    // Add animation to cards
+    const cards = document.querySelectorAll('.item-card');
+    cards.forEach((card, index) => {
+        card.style.animationDelay = `${index * 0.05}s`;
+        card.style.opacity = '0';
+        card.style.animation = `fadeIn 0.5s ease forwards`;
+    });
+
+    // Add CSS for fadeIn animation
+    const style = document.createElement('style');
+    style.textContent = `
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(10px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
+    `;
+    document.head.appendChild(style);
+});
+
+// Save search preferences to localStorage
+function saveSearchPreferences() {
+    const preferences = {
+        search_query: document.getElementById('searchQuery').value,
+        item_type: document.getElementById('itemType').value,
+        category: document.getElementById('category').value,
+        city: document.getElementById('city').value,
+        timestamp: new Date().getTime()
+    };
+    localStorage.setItem('search_preferences', JSON.stringify(preferences));
+}
+
+// Load saved preferences
+function loadSearchPreferences() {
+    const saved = localStorage.getItem('search_preferences');
+    if (saved) {
+        const preferences = JSON.parse(saved);
+
+        // Only load if saved less than 1 hour ago
+        const oneHour = 60 * 60 * 1000;
+        if (new Date().getTime() - preferences.timestamp < oneHour) {
+            document.getElementById('searchQuery').value = preferences.search_query || '';
+            document.getElementById('itemType').value = preferences.item_type || 'all';
+            document.getElementById('category').value = preferences.category || 'all';
+            document.getElementById('city').value = preferences.city || 'all';
+        }
+    }
+}
+
+// Save on input changes
+const formInputs = document.querySelectorAll('#searchForm input, #searchForm select');
+formInputs.forEach(input => {
+    input.addEventListener('change', saveSearchPreferences);
+    input.addEventListener('input', saveSearchPreferences);
+});
+
+// Load preferences on page load
+window.addEventListener('load', loadSearchPreferences);
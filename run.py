@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Файл для запуска приложения
+
+    python run.py        — production-сервер (несколько процессов, см. backend/serve.py)
+    python run.py dev    — сервер разработки с отладчиком и перезагрузкой
 """
 
 import sys
@@ -9,15 +12,37 @@ import os
 #backend в путь
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
-from backend.main import app, init_db
+from main import create_app, init_db
+from Utilts import start_stats_reconciler
+from lifecycle import start_archiver
+from matching import start_matcher
+from sessions import start_session_cleaner
+import serve
 
 if __name__ == '__main__':
-    #БД
-    init_db()
-    
-    print("\n" + "="*60)
-    print("🚀 Сервер запущен: http://localhost:5000")
-    print("="*60 + "\n")
-    
-    #Запуск
-    app.run(debug=1, host='0.0.0.0', port=5000)
+    if len(sys.argv) > 1 and sys.argv[1] == 'dev':
+        app = create_app()
+        
+        #БД
+        init_db(app)
+        
+        #Периодическая сверка статистики
+        start_stats_reconciler(app, app.config['STATS_RECONCILE_INTERVAL'])
+        
+        #Закрытие устаревших объявлений и архивация
+        start_archiver(app, app.config['ARCHIVE_INTERVAL'])
+        
+        #Подбор пар "потеряно — найдено"
+        start_matcher(app, app.config['MATCH_INTERVAL'])
+        
+        #Удаление просроченных сессий
+        start_session_cleaner(app, app.config['SESSION_CLEANUP_INTERVAL'])
+        
+        print("\n" + "="*60)
+        print("🚀 Сервер запущен: http://localhost:5000")
+        print("="*60 + "\n")
+        
+        #Запуск
+        app.run(debug=1, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
+    else:
+        serve.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+# Модули backend импортируются по имени (как при запуске из backend/)
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+# Config читает окружение при импорте: быстрые хэши в текущем процессе,
+# без ограничения частоты (тесты включают его сами), буфер счетчиков
+# пишется только явным flush_counters()
+os.environ['PASSWORD_WORKERS'] = '0'
+os.environ['PASSWORD_METHOD'] = 'pbkdf2:sha256:1000'
+os.environ['RATE_LIMITS'] = ''
+os.environ['COUNTER_FLUSH_INTERVAL'] = '3600'
+
+def reset_process_state():
+    """Сбрасывает кэши процесса, оставшиеся от приложения предыдущего теста"""
+    import cities, facets, page_cache, rate_limits, search_index, user_cache, Utilts, counters
+    cities._cities.update(index=None, names={}, loaded_at=0.0)
+    page_cache.clear_page_cache()
+    user_cache._users.clear()
+    Utilts.invalidate_stats_cache()
+    facets._facets['counters'] = None
+    rate_limits._purge['last'] = 0.0
+    search_index._fts_enabled = None
+    counters._take()
+
+def make_app(db_path):
+    """Приложение на файле БД db_path (init_db — как при запуске сервера)"""
+    os.environ['DATABASE_URL'] = 'sqlite:///' + str(db_path)
+    reset_process_state()
+    from main import create_app, init_db
+    app = create_app()
+    app.config['TESTING'] = True
+    init_db(app)
+    return app
+
+@pytest.fixture(autouse=True)
+def backend_cwd(monkeypatch):
+    # init_db создает папки шаблонов относительно текущего каталога
+    monkeypatch.chdir(BACKEND_DIR)
+
+@pytest.fixture
+def app(tmp_path):
+    return make_app(tmp_path / 'test.db')
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def register(client, username='alice', full_name='Alice Smith', password='secret12'):
+    return client.post('/register', data={'username': username, 'full_name': full_name,
+                                          'password': password, 'confirm_password': password})
+
+def create_item(client, **fields):
+    data = {'item_type': 'lost', 'category': 'Ключи', 'title': 'Ключи от машины',
+            'description': '', 'city': 'Москва', 'date': '2026-10-10'}
+    data.update(fields)
+    return client.post('/create', data=data)
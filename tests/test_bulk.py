@@ -0,0 +1,57 @@
+import io
+
+from tests.conftest import register, create_item, make_app
+
+def _export(app):
+    from bulk import export_users, export_items
+    users, items = io.StringIO(), io.StringIO()
+    with app.app_context():
+        export_users(users, 'jsonl')
+        export_items(items, 'jsonl')
+    return users.getvalue(), items.getvalue()
+
+def test_export_import_round_trip(app, client, tmp_path):
+    from models import Item
+    from passwords import hash_passwords
+    from bulk import import_users, import_items
+
+    register(client)
+    create_item(client)
+    create_item(client, title='Паспорт', item_type='found')
+    with app.app_context():
+        item_id = Item.query.filter_by(title='Паспорт').one().item_id
+    client.get(f'/found_item/{item_id}')
+    users, items = _export(app)
+
+    copy = make_app(tmp_path / 'copy.db')
+    with copy.app_context():
+        # Тестовый администратор есть в обеих БД
+        report = import_users(io.StringIO(users), 'jsonl', hash_passwords)
+        assert report.imported == 1 and report.errors == ['строка 1: имя пользователя уже занято']
+        report = import_items(io.StringIO(items), 'jsonl')
+        assert report.imported == 2, report.errors
+    assert _export(copy)[1] == items
+    assert [line for line in _export(copy)[0].splitlines() if 'alice' in line] == \
+           [line for line in users.splitlines() if 'alice' in line]
+
+    with copy.app_context():
+        # Новые идентификаторы не совпадают с импортированными
+        from ids import generate_item_id
+        assert generate_item_id() > max(item.item_id for item in Item.query)
+
+def test_import_hashes_passwords_and_reports_bad_rows(app):
+    from models import User
+    from bulk import import_users, import_items
+
+    rows = ('{"username": "bob", "full_name": "Bob", "password": "secret12"}\n'
+            '{"username": "eve", "full_name": "Eve", "password": "secret12", "uid": "USR-?"}\n'
+            '{"username": "joe", "full_name": "Joe", "password": "secret12", "created_at": "вчера"}\n')
+    items = '{"item_type": "lost", "category": "Ключи", "title": "Ключи", "city": "Москва", "status": "lost"}\n'
+    with app.app_context():
+        report = import_users(io.StringIO(rows), 'jsonl', lambda passwords: [f'plain${p}' for p in passwords])
+        assert report.imported == 1
+        assert report.errors == ['строка 2: некорректный идентификатор: USR-?',
+                                 'строка 3: некорректная дата created_at']
+        assert User.query.filter_by(username='bob').one().password_hash == 'plain$secret12'
+        report = import_items(io.StringIO(items), 'jsonl', owner=User.query.filter_by(username='bob').one())
+        assert report.errors == ['строка 1: неизвестный статус: lost']
@@ -0,0 +1,86 @@
+import pytest
+
+from tests.conftest import register, create_item
+
+# Похожие по написанию, но разные города
+DIFFERENT_CITIES = ['Краснодар', 'Красногорск', 'Самарканд', 'Ростов Великий', 'Томск']
+
+@pytest.mark.parametrize('name', DIFFERENT_CITIES)
+def test_similar_name_is_not_another_city(app, name):
+    from cities import find_city
+    with app.app_context():
+        assert find_city(name) is None
+
+@pytest.mark.parametrize('name', DIFFERENT_CITIES)
+def test_resolve_creates_city_without_alias(app, name):
+    from models import db, City, CityAlias
+    from cities import normalize_city, resolve_city
+    with app.app_context():
+        aliases = db.session.query(CityAlias).count()
+        city_id, city = resolve_city(name)
+        assert city == name
+        assert db.session.get(City, city_id).key == normalize_city(name)
+        assert db.session.query(CityAlias).count() == aliases
+
+def test_exact_names_and_aliases(app):
+    from cities import find_city, resolve_city
+    with app.app_context():
+        assert resolve_city('г. Москва')[1] == 'Москва'
+        assert resolve_city('СПб')[1] == 'Санкт-Петербург'
+        assert resolve_city('ростов')[1] == 'Ростов-на-Дону'
+        assert resolve_city('  ') is None
+        # Опечатка прощается только при поиске
+        assert find_city('Масква')[1] == 'Москва'
+        assert find_city('Новосибрск')[1] == 'Новосибирск'
+
+def test_search_filter_keeps_cities_apart(app, client):
+    from models import Item
+    from search_index import filter_items
+
+    register(client)
+    create_item(client, city='Красноярск', title='Ключи в Красноярске')
+    create_item(client, city='Краснодар', title='Ключи в Краснодаре')
+    with app.app_context():
+        query, _ = filter_items(Item.query, city='Краснодар')
+        assert [item.title for item in query] == ['Ключи в Краснодаре']
+        query, _ = filter_items(Item.query, city='Красноярск')
+        assert [item.title for item in query] == ['Ключи в Красноярске']
+
+@pytest.mark.parametrize('city', ['г.', '...', '-'])
+def test_city_without_letters_is_a_form_error(app, client, city):
+    from models import Item
+    register(client)
+    response = create_item(client, city=city)
+    assert response.status_code == 302
+    with client.session_transaction() as session:
+        assert ('error', 'Введите город') in session['_flashes']
+    with app.app_context():
+        assert Item.query.count() == 0
+
+def test_import_reports_city_without_letters(app, client):
+    import io
+    from bulk import import_items
+    from models import User
+
+    register(client)
+    rows = ('{"item_type": "lost", "category": "Ключи", "title": "Ключи", "city": "г."}\n'
+            '{"item_type": "lost", "category": "Ключи", "title": "Ключи", "city": "Москва"}\n')
+    with app.app_context():
+        report = import_items(io.StringIO(rows), 'jsonl', owner=User.query.filter_by(username='alice').one())
+        assert report.imported == 1
+        assert len(report.errors) == 1 and 'Введите город' in report.errors[0]
+
+def test_legacy_item_without_city_id_keeps_search_working(app, client):
+    from models import db, Item
+    from facets import facet_options, invalidate_facets
+
+    register(client)
+    create_item(client)
+    with app.app_context():
+        # Как после миграции 3: город "-" не попал в справочник
+        db.session.query(Item).update({Item.city: '-', Item.city_id: None})
+        db.session.commit()
+        invalidate_facets()
+        assert facet_options('city') == []
+    assert client.get('/search').status_code == 200
+    assert client.get('/').status_code == 200
@@ -0,0 +1,59 @@
+from tests.conftest import register, create_item
+
+def _stats(app):
+    from models import db, PlatformStats
+    with app.app_context():
+        db.session.expire_all()
+        stats = PlatformStats.query.first()
+        return stats.total_users, stats.total_items, stats.active_items, stats.found_items
+
+def test_counters_are_written_on_flush(app, client):
+    from counters import flush_counters, pending_stats
+    from models import StatsRollup
+
+    before = _stats(app)
+    register(client)
+    create_item(client)
+    create_item(client, title='Паспорт')
+    # До записи буфера строка статистики не менялась
+    assert _stats(app) == before
+    with app.app_context():
+        assert pending_stats('total_items') == 2
+        assert flush_counters()
+        assert not flush_counters()
+        total = StatsRollup.query.filter_by(metric='new_items', dimension='', period='day').one()
+        assert total.count == 2
+
+    users, items, active, found = before
+    assert _stats(app) == (users + 1, items + 2, active + 2, found)
+
+def test_found_commits_once_and_matches_reconcile(app, client):
+    from sqlalchemy import event
+    from counters import flush_counters
+    from models import db, Item
+    from Utilts import update_platform_stats
+
+    register(client)
+    create_item(client)
+    with app.app_context():
+        item_id = Item.query.filter_by(title='Ключи от машины').one().item_id
+        flush_counters()
+
+        commits = []
+        listener = lambda connection: commits.append(1)
+        event.listen(db.engine, 'commit', listener)
+    try:
+        response = client.get(f'/found_item/{item_id}')
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'commit', listener)
+    assert response.status_code == 302
+    # Коммит данных объявления и запись сессии (flash) — счетчики ждут буфер
+    assert len(commits) == 2
+
+    with app.app_context():
+        flush_counters()
+    buffered = _stats(app)
+    with app.app_context():
+        update_platform_stats()
+    assert _stats(app) == buffered
@@ -0,0 +1,26 @@
+from tests.conftest import make_app
+
+def test_ids_follow_issue_order_across_apps(app, tmp_path):
+    from ids import generate_item_id, next_ids, id_number
+
+    # Второе приложение на той же БД — как другой процесс сервера
+    other = make_app(tmp_path / 'test.db')
+    issued = []
+    for _ in range(3):
+        with app.app_context():
+            issued.append(generate_item_id())
+        with other.app_context():
+            issued.extend(next_ids('item', 2))
+    assert issued == sorted(issued)
+    assert len(set(issued)) == len(issued)
+    assert [id_number('item', value) for value in issued] == list(range(1, 10))
+
+def test_no_numbers_are_held_in_reserve(app):
+    from models import db, IdSequence
+    from ids import generate_uid
+    with app.app_context():
+        start = db.session.get(IdSequence, 'user').next_value
+        generate_uid()
+        db.session.expire_all()
+        # Процесс не держит блок номеров, который другой процесс обошел бы
+        assert db.session.get(IdSequence, 'user').next_value == start + 1
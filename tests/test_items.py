@@ -0,0 +1,95 @@
+from tests.conftest import register, create_item
+
+def _close(app, client, action):
+    from models import Item
+    register(client)
+    create_item(client, contact_phone='+7 900 000-00-00')
+    with app.app_context():
+        item_id = Item.query.filter_by(title='Ключи от машины').one().item_id
+    assert client.get(f'/{action}/{item_id}').status_code == 302
+    return item_id
+
+def test_closed_item_is_hidden_from_others(app, client):
+    item_id = _close(app, client, 'delete_item')
+    other = app.test_client()
+    assert other.get(f'/item/{item_id}').status_code == 404
+    assert other.get(f'/api/v1/items/{item_id}').status_code == 404
+    assert other.get(f'/api/v1/items/{item_id}/matches').status_code == 404
+
+    # Автор по-прежнему видит свое объявление, но без кнопок управления
+    page = client.get(f'/item/{item_id}').get_data(as_text=True)
+    assert 'Закрыто' in page
+    assert f'/delete_item/{item_id}' not in page
+
+def test_profile_shows_returned_status(app, client):
+    item_id = _close(app, client, 'found_item')
+    page = client.get('/profile').get_data(as_text=True)
+    assert 'Возвращено' in page
+    assert 'returned' not in page.replace('status-returned', '')
+    assert f'/delete_item/{item_id}' not in page
+
+def test_archived_ids_are_not_reused(app, client):
+    from models import db, Item, ArchivedItem
+    from lifecycle import archive_items
+
+    def close_newest():
+        with app.app_context():
+            item_id = Item.query.order_by(Item.id.desc()).first().item_id
+        client.get(f'/delete_item/{item_id}')
+
+    register(client)
+    create_item(client)
+    close_newest()
+    with app.app_context():
+        assert archive_items(-1, 100) == 1
+        archived_id = db.session.query(db.func.max(ArchivedItem.id)).scalar()
+
+    create_item(client, title='Паспорт')
+    with app.app_context():
+        assert Item.query.filter_by(title='Паспорт').one().id > archived_id
+    close_newest()
+    with app.app_context():
+        assert archive_items(-1, 100) == 1
+        assert ArchivedItem.query.count() == 2
+
+def test_matcher_sees_items_created_after_archiving(app, client):
+    from models import Item
+    from lifecycle import archive_items
+    from matching import run_matching, get_matches
+
+    register(client)
+    create_item(client)
+    with app.app_context():
+        assert run_matching()[0] == 1
+        item_id = Item.query.one().item_id
+    client.get(f'/delete_item/{item_id}')
+    with app.app_context():
+        archive_items(-1, 100)
+
+    create_item(client, title='Ключи от квартиры')
+    other = app.test_client()
+    register(other, username='bob', full_name='Bob')
+    create_item(other, title='Ключи от квартиры', item_type='found')
+    with app.app_context():
+        assert run_matching()[0] == 2
+        new_item = Item.query.filter_by(title='Ключи от квартиры', item_type='lost').one()
+        assert [match.title for match in get_matches(new_item.id)] == ['Ключи от квартиры']
+
+def test_cached_item_page_shows_new_matches(app, client):
+    from models import Item
+    from matching import run_matching
+
+    register(client)
+    create_item(client, title='Ключи от квартиры')
+    other = app.test_client()
+    register(other, username='bob', full_name='Bob')
+    create_item(other, title='Ключи от квартиры', item_type='found')
+    with app.app_context():
+        lost = Item.query.filter_by(item_type='lost').one().item_id
+        found = Item.query.filter_by(item_type='found').one().item_id
+    # Аноним: у автора в сессии висят flash-сообщения, его страницы не кэшируются
+    guest = app.test_client()
+    assert found not in guest.get(f'/item/{lost}').get_data(as_text=True)
+    with app.app_context():
+        run_matching()
+    assert found in guest.get(f'/item/{lost}').get_data(as_text=True)
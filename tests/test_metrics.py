@@ -0,0 +1,13 @@
+def test_metrics_without_token_only_from_localhost(app, client):
+    client.get('/')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert 'http_requests_total{worker=' in response.get_data(as_text=True)
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.5'}).status_code == 403
+
+def test_metrics_with_token_require_it_everywhere(app, client):
+    app.config['METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics').status_code == 403
+    headers = {'Authorization': 'Bearer secret'}
+    assert client.get('/metrics', headers=headers,
+                      environ_base={'REMOTE_ADDR': '10.0.0.5'}).status_code == 200
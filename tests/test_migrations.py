@@ -0,0 +1,67 @@
+import shutil
+import sqlite3
+
+import pytest
+
+from tests.conftest import make_app, BACKEND_DIR
+
+# Файлы БД из исходного состояния репозитория (до миграций)
+BASELINE_DATABASES = ['../instance/lost_and_found.db', 'instance/lost_and_found.db']
+
+def _count(path, table):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        connection.close()
+
+@pytest.mark.parametrize('baseline', BASELINE_DATABASES)
+def test_upgrade_baseline_database(tmp_path, baseline):
+    from migrations import MIGRATIONS, get_schema_version, upgrade_database, check_query_plans
+    from models import db, Item
+
+    path = tmp_path / 'baseline.db'
+    shutil.copy(f'{BACKEND_DIR}/{baseline}', path)
+    items_before = _count(path, 'items')
+
+    app = make_app(path)
+    with app.app_context():
+        with db.engine.connect() as connection:
+            assert get_schema_version(connection) == len(MIGRATIONS)
+        assert Item.query.count() == items_before
+        # У всех объявлений с городом есть city_id из справочника
+        assert Item.query.filter(Item.city != '', Item.city_id.is_(None)).count() == 0
+        # id объявлений не переиспользуются (AUTOINCREMENT), индексы и FTS на месте
+        with db.engine.connect() as connection:
+            schema = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'items'").scalar()
+            triggers = connection.exec_driver_sql(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'items'").scalar()
+        assert 'AUTOINCREMENT' in schema and triggers == 3
+        # Повторный запуск ничего не применяет
+        assert upgrade_database() == []
+
+        failed = [(name, plan) for name, plan, ok in check_query_plans() if not ok]
+        assert failed == []
+
+def test_query_plans_on_new_database(app):
+    from migrations import check_query_plans
+    with app.app_context():
+        assert all(ok for _, _, ok in check_query_plans())
+
+def test_matching_cursor_moves_out_of_id_sequences(app):
+    from models import db, IdSequence, JobCursor
+    from migrations import upgrade_database
+    from matching import run_matching
+    with app.app_context():
+        # Состояние до миграции 4: курсор среди счетчиков идентификаторов
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO id_sequences (name, next_value) VALUES ('matching', 0)")
+            connection.exec_driver_sql("PRAGMA user_version = 3")
+        assert upgrade_database() == [4, 5]
+        assert db.session.get(IdSequence, 'matching') is None
+        assert db.session.get(JobCursor, 'matching').last_id == 0
+
+        processed, _ = run_matching()
+        assert run_matching() == (0, 0)
+        db.session.expire_all()
+        assert db.session.get(JobCursor, 'matching').last_id >= processed
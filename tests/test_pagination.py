@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from tests.conftest import register, create_item
+
+def test_keyset_pages_cover_all_rows_with_ties(app, client):
+    from models import db, Item
+    from pagination import paginate, decode_cursor
+
+    register(client)
+    for i in range(7):
+        create_item(client, title=f'Ключи {i}')
+    with app.app_context():
+        # Одинаковое время создания: порядок решает id
+        db.session.query(Item).update({Item.created_at: datetime(2026, 1, 1)})
+        db.session.commit()
+
+        order = [(Item.created_at, True), (Item.id, True)]
+        expected = [item.id for item in Item.query.order_by(Item.created_at.desc(), Item.id.desc())]
+
+        seen, cursor = [], None
+        while True:
+            rows, cursor = paginate(Item.query, order, cursor, page_size=3)
+            seen.extend(item.id for item in rows)
+            if cursor is None:
+                break
+            assert decode_cursor(cursor) is not None
+        assert seen == expected
+
+def test_column_query_returns_rows(app, client):
+    from models import Item
+    from pagination import paginate
+
+    register(client)
+    create_item(client)
+    with app.app_context():
+        rows, cursor = paginate(Item.cards_query(), [(Item.created_at, True), (Item.id, True)])
+        assert cursor is None
+        assert rows[0].title == 'Ключи от машины'
+
+def test_broken_cursor_means_first_page():
+    from pagination import decode_cursor, get_page_size
+    assert decode_cursor('not-a-cursor!') is None
+    assert decode_cursor('') is None
+    assert get_page_size('1000') == 100
+    assert get_page_size('abc') == 20
@@ -0,0 +1,39 @@
+import pytest
+
+from tests.conftest import register
+
+@pytest.fixture
+def limited(app):
+    app.config['RATE_LIMITS'] = 'search=2/60'
+    return app
+
+@pytest.mark.parametrize('url', ['/search?search_query=ключи',
+                                 '/api/v1/items?search_query=ключи',
+                                 '/api/v1/items.ndjson?search_query=ключи'])
+def test_search_query_is_limited_for_get(limited, client, url):
+    assert client.get(url).status_code == 200
+    assert client.get(url).status_code == 200
+    response = client.get(url)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+
+def test_page_and_api_share_search_budget(limited, client):
+    assert client.post('/search', data={'search_query': 'ключи'}).status_code == 200
+    assert client.get('/api/v1/items?search_query=паспорт').status_code == 200
+    response = client.get('/api/v1/items.ndjson?search_query=кошелек')
+    assert response.status_code == 429
+    assert response.get_json()['error'] == 'too_many_requests'
+
+def test_listing_without_query_is_not_limited(limited, client):
+    for _ in range(4):
+        assert client.get('/api/v1/items').status_code == 200
+        assert client.get('/search?category=Ключи').status_code == 200
+
+def test_budget_is_per_user(limited, client):
+    register(client)
+    assert client.get('/search?search_query=ключи').status_code == 200
+    assert client.get('/search?search_query=ключи').status_code == 200
+    assert client.get('/search?search_query=ключи').status_code == 429
+    # Анонимный клиент с того же адреса — своя корзина
+    other = limited.test_client()
+    assert other.get('/search?search_query=ключи').status_code == 200
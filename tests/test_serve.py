@@ -0,0 +1,16 @@
+def test_password_workers_are_split_between_server_processes(app, monkeypatch):
+    from config import CPU_COUNT
+    from serve import split_password_workers
+
+    monkeypatch.delenv('PASSWORD_WORKERS')
+    split_password_workers(app, 4)
+    assert app.config['PASSWORD_WORKERS'] == max(1, CPU_COUNT // 4)
+    assert app.config['PASSWORD_QUEUE_LIMIT'] == 4 * app.config['PASSWORD_WORKERS']
+
+def test_explicit_password_workers_are_kept(app, monkeypatch):
+    from serve import split_password_workers
+
+    monkeypatch.setenv('PASSWORD_WORKERS', '3')
+    app.config['PASSWORD_WORKERS'] = 3
+    split_password_workers(app, 4)
+    assert app.config['PASSWORD_WORKERS'] == 3
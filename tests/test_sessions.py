@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from tests.conftest import register
+
+def test_cookie_holds_only_session_id(app, client):
+    from models import db, UserSession
+    from sessions import _serializer
+    register(client, full_name='Алиса Иванова')
+    cookie = client.get_cookie('session').value
+    assert len(cookie) < 64 and '.' not in cookie
+    with app.app_context():
+        stored = db.session.get(UserSession, cookie)
+        assert stored.user_id is not None
+        assert _serializer.loads(stored.data)['full_name'] == 'Алиса Иванова'
+
+def test_anonymous_visit_creates_no_session(app, client):
+    from models import UserSession
+    client.get('/')
+    assert client.get_cookie('session') is None
+    with app.app_context():
+        assert UserSession.query.count() == 0
+
+def test_login_rotates_session_id(app, client):
+    register(client)
+    client.get('/logout')
+    before = client.get_cookie('session').value
+    client.post('/login', data={'username': 'alice', 'password': 'secret12'})
+    assert client.get_cookie('session').value != before
+
+def test_logout_everywhere(app):
+    first, second = app.test_client(), app.test_client()
+    register(first)
+    second.post('/login', data={'username': 'alice', 'password': 'secret12'})
+    assert second.get('/profile').status_code == 200
+
+    assert first.get('/logout_all').status_code == 302
+    response = second.get('/profile')
+    assert response.status_code == 302 and response.headers['Location'].endswith('/login')
+
+def test_expire_sessions_in_batches(app):
+    from models import db, UserSession
+    from sessions import expire_sessions
+    for i in range(3):
+        app.test_client().post('/login', data={'username': 'admin', 'password': 'admin123'})
+    with app.app_context():
+        db.session.query(UserSession).update({UserSession.expires_at: datetime.utcnow() - timedelta(days=1)})
+        db.session.commit()
+        assert expire_sessions(2) == 3
+        assert UserSession.query.count() == 0
+
+def test_static_and_suggest_skip_session_lookup(app, client):
+    from sqlalchemy import event
+    from models import db
+    from assets import asset_url
+
+    register(client)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        with app.test_request_context():
+            url = asset_url('css/profile.css')
+    try:
+        assert client.get(url).status_code == 200
+        assert client.get('/suggest?q=кл').status_code == 200
+        assert not [s for s in statements if 'sessions' in s]
+        assert client.get('/profile').status_code == 200
+        assert [s for s in statements if 'sessions' in s]
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    # Cookie не тронута — сессия жива
+    assert client.get('/profile').status_code == 200